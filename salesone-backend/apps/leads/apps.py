@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class LeadsConfig(AppConfig):
+    name = 'apps.leads'
+    verbose_name = 'Leads'
+
+    def ready(self):
+        # Register the rollup and snapshot rebuilds on salesone_leads_synced
+        import apps.leads.columnar
+        import apps.leads.rollups
+        import apps.leads.signals
@@ -0,0 +1,243 @@
+import numpy as np
+
+# Row positions are split into 2^16-row containers by their high bits
+CONTAINER_BITS = 16
+CONTAINER_ROWS = 1 << CONTAINER_BITS
+LOW_MASK = CONTAINER_ROWS - 1
+# Containers with more rows than this are stored as 8 KiB bitmaps
+ARRAY_MAX = 4096
+
+ARRAY, BITMAP = 0, 1
+
+POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+def popcount(bits):
+    return int(POPCOUNT[bits].sum(dtype=np.int64))
+
+
+def to_bits(values):
+    bits = np.zeros(CONTAINER_ROWS, dtype=bool)
+    bits[values] = True
+    return np.packbits(bits, bitorder='little')
+
+
+def from_bits(bits):
+    return np.flatnonzero(np.unpackbits(bits, bitorder='little')).astype(np.uint16)
+
+
+def contains(bits, values):
+    """Return which uint16 values are set in a packed bitmap container."""
+    return (bits[values >> 3] >> (values & 7).astype(np.uint8)) & 1 == 1
+
+
+def optimize(container):
+    """Store a container in its smaller form; None if it is empty."""
+    if container.dtype == np.uint8:
+        cardinality = popcount(container)
+        if cardinality > ARRAY_MAX:
+            return container
+        container = from_bits(container)
+    if not len(container):
+        return None
+    if len(container) > ARRAY_MAX:
+        return to_bits(container)
+    return container
+
+
+class RowBitmap:
+    """
+    Compressed set of snapshot row positions in the style of Roaring bitmaps.
+
+    Positions are grouped by their high 16 bits. Each group is a sorted
+    ``uint16`` array while it holds at most ``ARRAY_MAX`` rows and a packed
+    8 KiB bitmap above that, so sparse values (one district) and dense
+    values (one province, a contact flag) both stay small, and set
+    operations run container by container.
+    """
+
+    def __init__(self, containers=None):
+        # high bits -> uint16 array or uint8 packed bitmap
+        self.containers = containers or {}
+
+    @classmethod
+    def from_positions(cls, positions):
+        """Build a bitmap from sorted, unique row positions."""
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return cls()
+        highs = positions >> CONTAINER_BITS
+        keys, starts = np.unique(highs, return_index=True)
+        ends = np.append(starts[1:], len(positions))
+        containers = {}
+        for key, start, end in zip(keys.tolist(), starts, ends):
+            low = (positions[start:end] & LOW_MASK).astype(np.uint16)
+            containers[key] = to_bits(low) if len(low) > ARRAY_MAX else low
+        return cls(containers)
+
+    @classmethod
+    def from_mask(cls, mask):
+        return cls.from_positions(np.flatnonzero(mask))
+
+    def __len__(self):
+        return self.cardinality()
+
+    def cardinality(self):
+        """Number of rows in the set, without materializing them."""
+        return sum(
+            popcount(container) if container.dtype == np.uint8 else len(container)
+            for container in self.containers.values()
+        )
+
+    def to_positions(self):
+        """Return the row positions in ascending order."""
+        parts = []
+        for key in sorted(self.containers):
+            container = self.containers[key]
+            low = from_bits(container) if container.dtype == np.uint8 else container
+            parts.append((key << CONTAINER_BITS) + low.astype(np.int64))
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def to_mask(self, rows):
+        mask = np.zeros(rows, dtype=bool)
+        mask[self.to_positions()] = True
+        return mask
+
+    def __and__(self, other):
+        containers = {}
+        for key in self.containers.keys() & other.containers.keys():
+            left, right = self.containers[key], other.containers[key]
+            if left.dtype == np.uint8 and right.dtype == np.uint8:
+                container = left & right
+            elif left.dtype == np.uint8:
+                container = right[contains(left, right)]
+            elif right.dtype == np.uint8:
+                container = left[contains(right, left)]
+            else:
+                container = np.intersect1d(left, right, assume_unique=True)
+            container = optimize(container)
+            if container is not None:
+                containers[key] = container
+        return RowBitmap(containers)
+
+    def __sub__(self, other):
+        containers = {}
+        for key, left in self.containers.items():
+            right = other.containers.get(key)
+            if right is None:
+                containers[key] = left
+                continue
+            if left.dtype == np.uint8:
+                bits = right if right.dtype == np.uint8 else to_bits(right)
+                container = left & ~bits
+            elif right.dtype == np.uint8:
+                container = left[~contains(right, left)]
+            else:
+                container = np.setdiff1d(left, right, assume_unique=True)
+            container = optimize(container)
+            if container is not None:
+                containers[key] = container
+        return RowBitmap(containers)
+
+    def __or__(self, other):
+        return RowBitmap.union([self, other])
+
+    @classmethod
+    def union(cls, bitmaps):
+        """Union many bitmaps, merging each container key once."""
+        grouped = {}
+        for bitmap in bitmaps:
+            for key, container in bitmap.containers.items():
+                grouped.setdefault(key, []).append(container)
+
+        containers = {}
+        for key, group in grouped.items():
+            arrays = [container for container in group if container.dtype == np.uint16]
+            bits = [container for container in group if container.dtype == np.uint8]
+            if not bits and sum(len(array) for array in arrays) <= ARRAY_MAX:
+                container = np.unique(np.concatenate(arrays))
+            else:
+                if arrays:
+                    bits.append(to_bits(np.concatenate(arrays)))
+                container = optimize(np.bitwise_or.reduce(bits))
+            containers[key] = container
+        return cls(containers)
+
+    @classmethod
+    def intersection(cls, bitmaps):
+        bitmaps = sorted(bitmaps, key=lambda bitmap: len(bitmap.containers))
+        if not bitmaps:
+            raise ValueError('intersection() needs at least one bitmap')
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result = result & bitmap
+        return result
+
+
+class BitmapIndex:
+    """
+    Posting lists of one dictionary-coded snapshot column, as RowBitmaps.
+
+    Stored as two arrays so a snapshot can memory-map them: a container
+    table of (code, high bits, kind, offset, length) rows sorted by code,
+    and one byte buffer holding every container. Bitmaps returned by
+    ``get()`` are views into the buffer.
+    """
+
+    def __init__(self, table, data):
+        self.table = table
+        self.data = data
+        codes = np.asarray(table[:, 0])
+        values, starts = np.unique(codes, return_index=True)
+        ends = np.append(starts[1:], len(codes))
+        self.ranges = {
+            int(code): (int(start), int(end)) for code, start, end in zip(values, starts, ends)
+        }
+
+    @staticmethod
+    def build(codes):
+        """
+        Build the container table and buffer for an array of row codes.
+
+        Rows with a negative code (NULL) get no posting list.
+
+        Returns:
+            tuple: (int64 table, uint8 data)
+        """
+        codes = np.asarray(codes)
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        values, starts = np.unique(sorted_codes, return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        table, chunks, offset = [], [], 0
+        for code, start, end in zip(values.tolist(), starts, ends):
+            if code < 0:
+                continue
+            bitmap = RowBitmap.from_positions(order[start:end])
+            for key in sorted(bitmap.containers):
+                container = bitmap.containers[key]
+                chunk = container.astype('<u2').view(np.uint8) if container.dtype == np.uint16 else container
+                kind = BITMAP if container.dtype == np.uint8 else ARRAY
+                table.append((code, key, kind, offset, len(chunk)))
+                chunks.append(chunk)
+                offset += len(chunk)
+
+        table = np.array(table, dtype=np.int64).reshape(-1, 5)
+        data = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8)
+        return table, data
+
+    def get(self, code):
+        """Return the RowBitmap of one code (empty if no row has it)."""
+        if code not in self.ranges:
+            return RowBitmap()
+        start, end = self.ranges[code]
+        containers = {}
+        for _, key, kind, offset, length in np.asarray(self.table[start:end]).tolist():
+            chunk = self.data[offset:offset + length]
+            containers[key] = chunk if kind == BITMAP else chunk.view('<u2')
+        return RowBitmap(containers)
+
+    def get_any(self, codes):
+        """Return the union of the RowBitmaps of several codes."""
+        return RowBitmap.union(self.get(code) for code in codes)
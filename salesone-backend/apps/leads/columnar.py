@@ -0,0 +1,467 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, ExpressionWrapper, F
+from django.dispatch import receiver
+from .models import SALESONE_HAS_EMAIL, SALESONE_HAS_PHONE, SALESONE_HAS_HOMEPAGE, SalesOneLead
+from .bitmaps import BitmapIndex, RowBitmap
+from .pagination import SalesOneLeadOrdering
+from .search import (
+    SALESONE_CONTACT_FILTERS, SALESONE_EXCLUDE_FILTERS, SALESONE_FILTERS, SALESONE_FLAG_FILTERS,
+    get_list_param
+)
+from .signals import salesone_leads_synced
+
+logger = logging.getLogger(__name__)
+
+# File in the snapshot directory naming the current snapshot
+CURRENT_FILE = 'CURRENT'
+# How often a process checks CURRENT for a newer snapshot, in seconds
+SNAPSHOT_CHECK_INTERVAL = 5
+
+EPOCH = date(1970, 1, 1)
+NULL_DAYS = np.iinfo(np.int32).min
+
+# Dictionary-encoded columns, named after their search parameter:
+# snapshot column -> exported column
+CATEGORY_COLUMNS = {
+    'si_nm': 'si_nm',
+    'sgg_nm': 'sgg_nm',
+    'industry': 'industry_code',
+}
+
+# Boolean columns filtered with '<flag>=true'
+FLAG_COLUMNS = (*SALESONE_CONTACT_FILTERS, *SALESONE_FLAG_FILTERS)
+
+# Columns with a posting list (RowBitmap) per value
+BITMAP_COLUMNS = (*CATEGORY_COLUMNS, *FLAG_COLUMNS)
+
+# SalesOneLead field -> snapshot column, for range filters and ordering;
+# each has a precomputed sort order
+RANGE_COLUMNS = {
+    'employee': 'employee',
+    'finance_revenue': 'revenue',
+    'established_date': 'established_days',
+}
+RANGE_COMPARISONS = {'gte': np.greater_equal, 'lte': np.less_equal}
+
+# search_salesone parameters the index cannot evaluate
+UNSUPPORTED_PARAMS = ('company_name', 'query', 'search')
+
+
+class UnsupportedSearch(Exception):
+    """The search must run in Postgres."""
+
+
+def snapshot_directory():
+    return settings.SALESONE_COLUMNAR_DIR
+
+
+def build_salesone_snapshot(directory=None, using='default'):
+    """
+    Write a columnar snapshot of SalesOneLead and make it current.
+
+    Rows are exported with one ``COPY ... TO STDOUT`` and stored in id order
+    as one ``.npy`` file per column: numbers, dates as days since the epoch,
+    dictionary codes for regions and industries, the contact-info flags, and
+    a sort permutation per sortable column. ``CURRENT`` is replaced
+    atomically, so readers switch over on their next check.
+
+    Returns:
+        str: Path of the new snapshot
+    """
+    directory = directory or snapshot_directory()
+    os.makedirs(directory, exist_ok=True)
+    start_time = time.time()
+
+    queryset = SalesOneLead.objects.using(using).order_by('id').annotate(
+        has_email=ExpressionWrapper(SALESONE_HAS_EMAIL, output_field=BooleanField()),
+        has_phone=ExpressionWrapper(SALESONE_HAS_PHONE, output_field=BooleanField()),
+        has_homepage=ExpressionWrapper(SALESONE_HAS_HOMEPAGE, output_field=BooleanField()),
+        industry_code=F('industry__code'),
+    ).values(
+        'id', 'employee', 'finance_revenue', 'established_date', 'si_nm', 'sgg_nm',
+        'industry_code', *FLAG_COLUMNS,
+    )
+    sql, params = queryset.query.sql_with_params()
+
+    with tempfile.TemporaryFile(mode='w+', encoding='utf-8') as export:
+        with connections[using].cursor() as cursor:
+            query = cursor.mogrify(sql, params)
+            if isinstance(query, bytes):
+                query = query.decode('utf-8')
+            cursor.copy_expert(f'COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)', export)
+        export.seek(0)
+        rows = pd.read_csv(
+            export,
+            dtype={source: str for source in CATEGORY_COLUMNS.values()},
+            keep_default_na=False,
+            na_values={'finance_revenue': [''], 'established_date': ['']},
+        )
+
+    columns = {
+        'id': rows['id'].to_numpy(np.int64),
+        'employee': rows['employee'].to_numpy(np.int32),
+        'revenue_null': rows['finance_revenue'].isna().to_numpy(),
+        'revenue': rows['finance_revenue'].fillna(0).to_numpy(np.int64),
+    }
+    established = pd.to_datetime(rows['established_date'], format='%Y-%m-%d')
+    days = (established - pd.Timestamp(EPOCH)).dt.days
+    columns['established_days'] = days.fillna(NULL_DAYS).to_numpy(np.int32)
+
+    dictionaries = {}
+    for column, source in CATEGORY_COLUMNS.items():
+        values = rows[source].where(rows[source] != '')
+        codes, uniques = pd.factorize(values, sort=True)
+        columns[column] = codes.astype(np.int32)
+        dictionaries[column] = list(uniques)
+
+    for column in BITMAP_COLUMNS:
+        codes = columns[column] if column in CATEGORY_COLUMNS else rows[column].eq('t').to_numpy(np.int32)
+        columns[f'bitmap_{column}_table'], columns[f'bitmap_{column}_data'] = BitmapIndex.build(codes)
+
+    null_counts = {}
+    for field, column in RANGE_COLUMNS.items():
+        values = columns[column]
+        nulls = columns['revenue_null'] if column == 'revenue' else (
+            values == NULL_DAYS if column == 'established_days' else np.zeros(len(values), bool)
+        )
+        # Ascending (value, id) with NULLs last; rows are already in id order
+        columns[f'order_{column}'] = np.lexsort((values, nulls)).astype(np.int32)
+        null_counts[column] = int(nulls.sum())
+
+    version = f'{time.strftime("%Y%m%d%H%M%S")}-{uuid.uuid4().hex[:8]}'
+    path = os.path.join(directory, version)
+    os.makedirs(path)
+    for name, values in columns.items():
+        np.save(os.path.join(path, f'{name}.npy'), values)
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as meta:
+        json.dump({
+            'version': version,
+            'rows': len(rows),
+            'dictionaries': dictionaries,
+            'null_counts': null_counts,
+        }, meta, ensure_ascii=False)
+
+    previous = read_current(directory)
+    pointer = os.path.join(directory, f'{CURRENT_FILE}.tmp')
+    with open(pointer, 'w') as current:
+        current.write(version)
+    os.replace(pointer, os.path.join(directory, CURRENT_FILE))
+
+    # Keep the previous snapshot for processes that have not switched yet
+    for name in os.listdir(directory):
+        stale = os.path.join(directory, name)
+        if name not in (version, previous) and os.path.isdir(stale):
+            shutil.rmtree(stale, ignore_errors=True)
+
+    logger.info('Built SalesOne snapshot %s (%d rows) in %.1fs', version, len(rows), time.time() - start_time)
+    return path
+
+
+def read_current(directory):
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as current:
+            return current.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class ColumnarSnapshot:
+    """One snapshot's columns, memory-mapped read-only."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as meta:
+            meta = json.load(meta)
+        self.version = meta['version']
+        self.rows = meta['rows']
+        self.null_counts = meta['null_counts']
+        self.codes = {
+            column: {value: code for code, value in enumerate(values)}
+            for column, values in meta['dictionaries'].items()
+        }
+        self.columns = {
+            name[:-len('.npy')]: np.load(os.path.join(path, name), mmap_mode='r')
+            for name in os.listdir(path) if name.endswith('.npy')
+        }
+        self.bitmaps = {
+            column: BitmapIndex(
+                self.columns.pop(f'bitmap_{column}_table'),
+                self.columns.pop(f'bitmap_{column}_data')
+            )
+            for column in BITMAP_COLUMNS
+        }
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+
+class SalesOneColumnarIndex:
+    """
+    In-process filter engine over a SalesOneLead snapshot.
+
+    Region, industry and flag filters, including multi-select ``__in``
+    filters, are combined from per-value RowBitmap posting lists; numeric
+    and date filters are evaluated as vectorized boolean masks over the
+    snapshot columns. Matches are ordered with the precomputed sort
+    permutations. Only the ids of the requested page are
+    hydrated from Postgres. The snapshot files are memory-mapped, so every
+    worker process on a host shares one copy through the page cache.
+
+    Searches the snapshot cannot answer (text search, name ordering) return
+    None and run in Postgres as before. Between a sync and the snapshot
+    rebuild, results reflect the previous load; hydration skips ids that no
+    longer exist.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.checked_at = None
+
+    def get_snapshot(self):
+        """Return the current snapshot, or None if there is none."""
+        directory = self.directory or snapshot_directory()
+        if not directory:
+            return None
+
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < SNAPSHOT_CHECK_INTERVAL:
+            return self.snapshot
+
+        with self.lock:
+            self.checked_at = now
+            version = read_current(directory)
+            if version is None:
+                self.snapshot = None
+            elif self.snapshot is None or self.snapshot.version != version:
+                try:
+                    self.snapshot = ColumnarSnapshot(os.path.join(directory, version))
+                except (OSError, ValueError):
+                    logger.exception('Could not load SalesOne snapshot %s', version)
+                    self.snapshot = None
+        return self.snapshot
+
+    def search(self, params, queryset=None):
+        """
+        Evaluate search_salesone filters and ordering against the snapshot.
+
+        Args:
+            params: QueryDict or dict of search parameters
+            queryset: SalesOneLead queryset used to hydrate result pages
+
+        Returns:
+            ColumnarResult or None if the search must run in Postgres
+        """
+        ordering = SalesOneLeadOrdering(SalesOneLead, params)
+        if ordering.field != 'id' and ordering.field not in RANGE_COLUMNS:
+            return None
+        snapshot = self.get_snapshot()
+        if snapshot is None:
+            return None
+
+        try:
+            bitmap, mask = self.evaluate(snapshot, params)
+        except UnsupportedSearch:
+            return None
+
+        if mask is None and ordering.field == 'id':
+            # Categorical filters only: the bitmap is already in id order
+            positions = bitmap.to_positions() if bitmap is not None else np.arange(snapshot.rows)
+            if ordering.descending:
+                positions = positions[::-1]
+        else:
+            if mask is None:
+                mask = np.ones(snapshot.rows, dtype=bool)
+            if bitmap is not None:
+                mask &= bitmap.to_mask(snapshot.rows)
+            positions = self.ordered_positions(snapshot, mask, ordering)
+
+        return ColumnarResult(
+            snapshot['id'][positions],
+            queryset if queryset is not None else SalesOneLead.objects.all()
+        )
+
+    def count(self, params):
+        """
+        Count the rows matching search_salesone filters.
+
+        Categorical filters are counted from bitmap cardinality without
+        materializing the rows.
+
+        Returns:
+            int or None if the search must run in Postgres
+        """
+        snapshot = self.get_snapshot()
+        if snapshot is None:
+            return None
+        try:
+            bitmap, mask = self.evaluate(snapshot, params)
+        except UnsupportedSearch:
+            return None
+
+        if mask is None:
+            return bitmap.cardinality() if bitmap is not None else snapshot.rows
+        if bitmap is not None:
+            mask &= bitmap.to_mask(snapshot.rows)
+        return int(mask.sum())
+
+    def evaluate(self, snapshot, params):
+        """
+        Return the (RowBitmap, boolean mask) of the categorical and range
+        filters; either is None when no such filter is set.
+        """
+        if any(params.get(param) for param in UNSUPPORTED_PARAMS):
+            raise UnsupportedSearch()
+        bitmap = self.category_bitmap(snapshot, params)
+        mask = self.range_mask(snapshot, params)
+
+        excluded = [
+            snapshot.bitmaps[column].get_any(
+                snapshot.codes[column].get(value, -1) for value in get_list_param(params, param)
+            )
+            for param, column in SALESONE_EXCLUDE_FILTERS.items() if get_list_param(params, param)
+        ]
+        if excluded:
+            excluded = RowBitmap.union(excluded)
+            if bitmap is not None:
+                bitmap = bitmap - excluded
+            else:
+                kept = ~excluded.to_mask(snapshot.rows)
+                mask = kept if mask is None else mask & kept
+        return bitmap, mask
+
+    def category_bitmap(self, snapshot, params):
+        """Intersect the posting lists of the region, industry and flag filters."""
+        bitmaps = []
+        for column in CATEGORY_COLUMNS:
+            index = snapshot.bitmaps[column]
+            codes = snapshot.codes[column]
+            value = params.get(column)
+            if value:
+                bitmaps.append(index.get(codes.get(value, -1)))
+            values = get_list_param(params, f'{column}__in')
+            if values:
+                # Multi-select: rows with any of the values
+                bitmaps.append(index.get_any(codes.get(item, -1) for item in values))
+
+        for column in FLAG_COLUMNS:
+            if params.get(column) == 'true':
+                bitmaps.append(snapshot.bitmaps[column].get(1))
+
+        return RowBitmap.intersection(bitmaps) if bitmaps else None
+
+    def range_mask(self, snapshot, params):
+        """Return the boolean mask of the numeric and date filters."""
+        mask = None
+
+        def apply(condition):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        for param, (lookup, type_cast) in SALESONE_FILTERS.items():
+            field, _, comparison = lookup.rpartition('__')
+            value = params.get(param)
+            if field not in RANGE_COLUMNS or not value:
+                continue
+            column = RANGE_COLUMNS[field]
+            if column == 'established_days':
+                try:
+                    value = (date.fromisoformat(value) - EPOCH).days
+                except ValueError:
+                    # Postgres rejects it; keep that behavior
+                    raise UnsupportedSearch()
+            else:
+                try:
+                    value = type_cast(value)
+                except (ValueError, TypeError):
+                    continue
+            apply(self.not_null(snapshot, column) & RANGE_COMPARISONS[comparison](snapshot[column], value))
+
+        revenue_range = params.get('revenue_range')
+        if revenue_range:
+            try:
+                min_rev, max_rev = map(int, revenue_range.split(','))
+            except (ValueError, AttributeError):
+                min_rev = max_rev = 0
+            if min_rev > 0:
+                apply(~snapshot['revenue_null'] & (snapshot['revenue'] >= min_rev))
+            if max_rev > 0:
+                apply(~snapshot['revenue_null'] & (snapshot['revenue'] <= max_rev))
+
+        return mask
+
+    def not_null(self, snapshot, column):
+        if column == 'revenue':
+            return ~snapshot['revenue_null']
+        if column == 'established_days':
+            return snapshot[column] != NULL_DAYS
+        return np.ones(snapshot.rows, dtype=bool)
+
+    def ordered_positions(self, snapshot, mask, ordering):
+        """Return matching row positions in display order, NULLs last."""
+        if ordering.field == 'id':
+            positions = np.flatnonzero(mask)
+            return positions[::-1] if ordering.descending else positions
+
+        column = RANGE_COLUMNS[ordering.field]
+        order = snapshot[f'order_{column}']
+        positions = order[mask[order]]
+        if not ordering.descending:
+            return positions
+
+        # Reverse the non-NULL run and the NULL run separately
+        null_count = snapshot.null_counts[column]
+        non_null = len(positions) - int(mask[order[len(order) - null_count:]].sum())
+        return np.concatenate((positions[:non_null][::-1], positions[non_null:][::-1]))
+
+
+class ColumnarResult:
+    """
+    Ordered search result ids that hydrate SalesOneLead rows on slicing.
+
+    Supports count(), len() and slicing, so it can be handed to the page
+    number paginator in place of a queryset. Rows are model instances or
+    dicts, following the hydrating queryset.
+    """
+
+    def __init__(self, ids, queryset):
+        self.ids = ids
+        self.queryset = queryset
+
+    def count(self):
+        return len(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        ids = [int(lead_id) for lead_id in self.ids[index]]
+        leads = {
+            (lead['id'] if isinstance(lead, dict) else lead.pk): lead
+            for lead in self.queryset.filter(id__in=ids)
+        }
+        return [leads[lead_id] for lead_id in ids if lead_id in leads]
+
+
+salesone_columnar_index = SalesOneColumnarIndex()
+
+
+@receiver(salesone_leads_synced)
+def rebuild_snapshot_on_sync(sender, manifest, **kwargs):
+    """Rebuild the snapshot when a SalesOne sync changed any rows."""
+    if snapshot_directory() and any(manifest.values()):
+        build_salesone_snapshot()
@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.db import connection, transaction
+from .models import Lead, LeadDuplicate
+
+# Mail providers shared by unrelated companies; their domains are not keys
+FREE_EMAIL_DOMAINS = (
+    'naver.com', 'hanmail.net', 'daum.net', 'nate.com', 'kakao.com', 'korea.com',
+    'hotmail.com', 'outlook.com', 'live.com', 'gmail.com', 'yahoo.com', 'yahoo.co.kr',
+    'icloud.com', 'me.com',
+)
+
+# Legal-form markers and punctuation dropped before names are compared, so
+# "(주)에이비씨" and "에이비씨 주식회사" score as the same name. English forms
+# need word boundaries, which are slow inside one large alternation, so they
+# are a separate pass.
+COMPANY_NAME_SUFFIXES = r'\m(co\M\.?,?\s*)?ltd\M|\minc\M|\mcorp(oration)?\M|\mcompany\M'
+COMPANY_NAME_NOISE = (
+    r'\(주\)|㈜|주식회사|\(유\)|유한회사|\(합\)|합자회사|\(사\)|사단법인|\(재\)|재단법인'
+    r'|[^[:alnum:]]+'
+)
+
+
+def duplicate_proposals_sql(user_id):
+    """
+    Return (sql, params) inserting the merge proposals of a user's leads.
+
+    Leads are blocked by their normalized business number (10 digits),
+    phone (digits with one leading 0, which stands in for +82 and is
+    restored where Excel dropped it) and email domain (free mail
+    providers excluded). Only leads sharing a key are compared, so the
+    work grows with the block sizes rather than with every pair of leads,
+    and keys shared by more than ``LEAD_DEDUP_MAX_BLOCK_SIZE`` leads are
+    skipped. A pair sharing a business number is always proposed; others
+    need a pg_trgm name similarity of ``LEAD_DEDUP_NAME_SIMILARITY``.
+    """
+    lead_table = Lead._meta.db_table
+    duplicate_table = LeadDuplicate._meta.db_table
+    sql = f"""
+        WITH normalized AS (
+            SELECT
+                id, created_at,
+                regexp_replace(regexp_replace(lower(name), %s, '', 'g'), %s, '', 'g') AS name,
+                regexp_replace(coalesce(business_number, ''), '[^0-9]', '', 'g') AS business_number,
+                regexp_replace(regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g'), '^(82|0)?', '0') AS phone,
+                lower(split_part(coalesce(email, ''), '@', 2)) AS email_domain
+            FROM {lead_table}
+            WHERE user_id = %s
+        ), keys AS (
+            SELECT id, created_at, name, 'business_number' AS kind, business_number AS key
+            FROM normalized WHERE length(business_number) = 10
+            UNION ALL
+            SELECT id, created_at, name, 'phone', phone
+            FROM normalized WHERE length(phone) >= 9
+            UNION ALL
+            SELECT id, created_at, name, 'email_domain', email_domain
+            FROM normalized WHERE email_domain LIKE '%%_._%%' AND NOT email_domain = ANY(%s)
+        ), blocks AS (
+            SELECT * FROM (
+                SELECT *, count(*) OVER (PARTITION BY kind, key) AS size FROM keys
+            ) sized
+            WHERE size BETWEEN 2 AND %s
+        ), pairs AS (
+            -- lead is the older of the two
+            SELECT
+                a.id AS lead_id, b.id AS duplicate_id,
+                similarity(a.name, b.name) AS score,
+                array_agg(a.kind ORDER BY a.kind) AS matched_on
+            FROM blocks a
+            JOIN blocks b ON b.kind = a.kind AND b.key = a.key
+                AND (b.created_at, b.id) > (a.created_at, a.id)
+            GROUP BY a.id, a.name, b.id, b.name
+        )
+        INSERT INTO {duplicate_table} (
+            id, created_at, updated_at, user_id, lead_id, duplicate_id, score, matched_on, status
+        )
+        SELECT gen_random_uuid(), now(), now(), %s, lead_id, duplicate_id, score, matched_on, 'pending'
+        FROM pairs
+        WHERE 'business_number' = ANY(matched_on) OR score >= %s
+        ON CONFLICT (lead_id, duplicate_id) DO NOTHING
+    """
+    params = [
+        COMPANY_NAME_SUFFIXES, COMPANY_NAME_NOISE, user_id, list(FREE_EMAIL_DOMAINS),
+        settings.LEAD_DEDUP_MAX_BLOCK_SIZE, user_id, settings.LEAD_DEDUP_NAME_SIMILARITY,
+    ]
+    return sql, params
+
+
+def find_duplicate_leads(user_id):
+    """
+    Replace a user's pending merge proposals with a fresh scan.
+
+    Dismissed proposals are kept, and the same pair is not proposed again.
+
+    Returns:
+        int: Number of pending proposals written
+    """
+    sql, params = duplicate_proposals_sql(user_id)
+    with transaction.atomic():
+        LeadDuplicate.objects.filter(user_id=user_id, status='pending').delete()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
@@ -0,0 +1,143 @@
+import csv
+import io
+import tempfile
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from openpyxl import Workbook
+from .importers import SALESONE_LEAD_FIELDS
+from .models import SalesOneLead
+from .search import filter_salesone_leads, order_salesone_leads
+
+# Export headers are Lead field names, the columns LeadFileImporter reads,
+# so an exported file can be imported again
+LEAD_EXPORT_FIELDS = (
+    'corporation_number', 'business_number', 'name', 'owner', 'email', 'phone',
+    'homepage', 'employee', 'revenue', 'address', 'si_nm', 'sgg_nm', 'established_date',
+)
+INDUSTRY_EXPORT_COLUMNS = {
+    'industry_code': 'industry__code',
+    'industry_name': 'industry__name',
+}
+
+# header -> field path, per model
+LEAD_EXPORT_COLUMNS = {
+    **{field: field for field in LEAD_EXPORT_FIELDS},
+    **INDUSTRY_EXPORT_COLUMNS,
+}
+SALESONE_EXPORT_COLUMNS = {
+    **{field: SALESONE_LEAD_FIELDS[field] for field in LEAD_EXPORT_FIELDS},
+    **INDUSTRY_EXPORT_COLUMNS,
+}
+
+EXPORT_FILE_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Bytes of CSV buffered before a chunk is sent
+CSV_BUFFER_SIZE = 64 * 1024
+
+
+def format_value(value):
+    """Flatten JSON list columns (homepage) into one cell."""
+    if isinstance(value, list):
+        return ', '.join(str(item) for item in value)
+    return value
+
+
+def lead_list_queryset(lead_list):
+    return lead_list.leads.order_by('name', 'id')
+
+
+def salesone_search_queryset(params):
+    """Matching SalesOne leads in search_salesone order, capped at the export limit."""
+    queryset = filter_salesone_leads(SalesOneLead.objects.all(), params)
+    return order_salesone_leads(queryset, params)[:settings.SALESONE_EXPORT_MAX_ROWS]
+
+
+class LeadExport:
+    """
+    Writes a Lead or SalesOneLead queryset as CSV or xlsx in constant memory.
+
+    Rows are read from a server-side cursor with ``values_list().iterator()``
+    in chunks of ``LEAD_EXPORT_CHUNK_SIZE``. CSV is encoded incrementally
+    (with a BOM so Excel reads Korean text); xlsx goes through openpyxl's
+    write-only mode, which keeps rows in temporary files rather than in
+    memory.
+    """
+
+    def __init__(self, queryset, file_type='csv'):
+        if file_type not in EXPORT_FILE_TYPES:
+            raise ValueError(f"Unsupported export file type: {file_type}")
+        self.queryset = queryset
+        self.file_type = file_type
+        self.columns = SALESONE_EXPORT_COLUMNS if queryset.model is SalesOneLead else LEAD_EXPORT_COLUMNS
+        self.row_count = 0
+
+    @property
+    def content_type(self):
+        return EXPORT_FILE_TYPES[self.file_type]
+
+    def rows(self):
+        self.row_count = 0
+        rows = self.queryset.values_list(*self.columns.values()).iterator(
+            chunk_size=settings.LEAD_EXPORT_CHUNK_SIZE
+        )
+        for row in rows:
+            self.row_count += 1
+            yield [format_value(value) for value in row]
+
+    def iter_csv(self):
+        """Yield the CSV file as UTF-8 byte chunks."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        buffer.write('\ufeff')
+        writer.writerow(self.columns)
+        for row in self.rows():
+            writer.writerow(row)
+            if buffer.tell() >= CSV_BUFFER_SIZE:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode('utf-8')
+
+    def write(self, file):
+        """
+        Write the whole export to a binary file object.
+
+        Returns:
+            int: Number of rows written
+        """
+        if self.file_type == 'csv':
+            for chunk in self.iter_csv():
+                file.write(chunk)
+        else:
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet()
+            sheet.append(list(self.columns))
+            for row in self.rows():
+                sheet.append(row)
+            workbook.save(file)
+        return self.row_count
+
+    def response(self, file_name):
+        """
+        Return a download response for the export.
+
+        CSV is streamed while it is read from the database. An xlsx file is
+        a zip archive that is only complete once written, so it is built in
+        a temporary file first and then streamed from there.
+        """
+        file_name = f'{file_name}.{self.file_type}'
+        if self.file_type == 'csv':
+            response = StreamingHttpResponse(self.iter_csv(), content_type=self.content_type)
+            response['Content-Disposition'] = content_disposition_header(True, file_name)
+            return response
+
+        file = tempfile.TemporaryFile()
+        self.write(file)
+        file.seek(0)
+        return FileResponse(
+            file, as_attachment=True, filename=file_name, content_type=self.content_type
+        )
@@ -0,0 +1,242 @@
+import hashlib
+import json
+from django.core.cache import cache
+from django.db.models import CharField, Count, F, Q, Sum, Value
+from .models import SalesOneFacetRollup, SalesOneLead
+from .pagination import COUNT_CACHE_TIMEOUT
+from .rollups import (
+    EMPLOYEE_BUCKETS, REVENUE_BUCKETS, ROLLUPS_CACHE_TIMEOUT, bucket_case, get_rollups_version
+)
+from .search import (
+    SALESONE_FILTER_PARAMS, SALESONE_LIST_PARAMS, filter_salesone_leads, get_list_param,
+    salesone_list_filter
+)
+
+# Industries returned, by descending count
+FACET_INDUSTRY_LIMIT = 50
+
+# filter -> query parameters it reads
+FACET_FILTER_PARAMS = {
+    'si_nm': ('si_nm', 'si_nm__in', 'exclude_si_nm'),
+    'sgg_nm': ('sgg_nm', 'sgg_nm__in', 'exclude_sgg_nm'),
+    'industry': ('industry', 'industry__in', 'exclude_industry'),
+    'employee': ('employee_min', 'employee_max', 'min_employee', 'max_employee'),
+    'revenue': ('revenue_range', 'min_revenue', 'max_revenue'),
+}
+
+# Query parameters SalesOneFacetRollup can answer
+ROLLUP_PARAMS = (
+    'si_nm', 'sgg_nm', 'industry', *SALESONE_LIST_PARAMS,
+    'employee_min', 'employee_max', 'revenue_range',
+)
+
+# facet -> filters ignored when counting it, so a selected value does not
+# hide the alternatives
+FACET_EXCLUDES = {
+    'si_nm': ('si_nm', 'sgg_nm'),
+    'sgg_nm': ('sgg_nm',),
+    'industry': ('industry',),
+    'employee': ('employee',),
+    'revenue': ('revenue',),
+}
+
+# facet -> (SalesOneLead column, buckets)
+RANGE_FACETS = {
+    'employee': ('employee', EMPLOYEE_BUCKETS),
+    'revenue': ('finance_revenue', REVENUE_BUCKETS),
+}
+
+
+def parse_int(value):
+    try:
+        return int(value) if value else None
+    except (ValueError, TypeError):
+        return None
+
+
+def range_bounds(params):
+    """
+    Return facet -> inclusive (min, max) as filter_salesone_leads applies
+    the employee and revenue filters; None is unbounded.
+    """
+    revenue = (None, None)
+    revenue_range = params.get('revenue_range')
+    if revenue_range:
+        try:
+            low, high = map(int, revenue_range.split(','))
+            revenue = (low if low > 0 else None, high if high > 0 else None)
+        except (ValueError, AttributeError):
+            pass
+    return {
+        'employee': (parse_int(params.get('employee_min')), parse_int(params.get('employee_max'))),
+        'revenue': revenue,
+    }
+
+
+def bucket_keys(buckets, low, high):
+    """
+    Return the keys of the buckets an inclusive range selects, or None if
+    the range splits a bucket.
+    """
+    end = high + 1 if high is not None else None
+    keys = []
+    for key, lower, upper in buckets:
+        inside = (
+            (low is None or (lower is not None and lower >= low)) and
+            (end is None or (upper is not None and upper <= end))
+        )
+        outside = (
+            (low is not None and upper is not None and upper <= low) or
+            (end is not None and lower is not None and lower >= end)
+        )
+        if inside:
+            keys.append(key)
+        elif not outside:
+            return None
+    return keys
+
+
+class SalesOneFacets:
+    """
+    Facet counts for a SalesOne search: totals per si_nm, sgg_nm, industry,
+    employee bucket and revenue bucket.
+
+    Every facet is counted with the other filters applied but not its own,
+    and all facets are fetched with a single ``UNION ALL`` of grouped
+    queries. Searches that only filter on region, industry and bucket-aligned
+    employee/revenue ranges are counted from SalesOneFacetRollup; anything
+    else is grouped live over SalesOneLead's indexed columns. Unfiltered
+    rollup counts and live counts are cached per rollup version; filtered
+    rollup counts are cheap enough to recount.
+    """
+
+    def __init__(self, params):
+        self.params = {}
+        for param in SALESONE_FILTER_PARAMS:
+            value = get_list_param(params, param) if param in SALESONE_LIST_PARAMS else params.get(param)
+            if value:
+                self.params[param] = value
+        self.bounds = range_bounds(self.params)
+        self.buckets = {}
+        self.use_rollup = self.rollup_applies()
+
+    def rollup_applies(self):
+        """Whether every active filter can be expressed on the rollup table."""
+        if set(self.params) - set(ROLLUP_PARAMS):
+            # has_* filters only apply when 'true'
+            return False
+
+        for facet, (column, buckets) in RANGE_FACETS.items():
+            low, high = self.bounds[facet]
+            if low is None and high is None:
+                continue
+            keys = bucket_keys(buckets, low, high)
+            if keys is None:
+                return False
+            self.buckets[facet] = keys
+        return True
+
+    def get(self):
+        """Return the facet counts, from the cache when possible."""
+        if self.use_rollup and self.params:
+            # Not worth a cache entry per filter combination
+            return self.count()
+
+        digest = hashlib.md5(json.dumps(self.params, sort_keys=True).encode('utf-8')).hexdigest()
+        cache_key = f'leads:facets:{get_rollups_version()}:{digest}'
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.count()
+            cache.set(cache_key, data, ROLLUPS_CACHE_TIMEOUT if self.use_rollup else COUNT_CACHE_TIMEOUT)
+        return data
+
+    def count(self):
+        queries = [self.facet_query('count', exclude=())]
+        for facet, exclude in FACET_EXCLUDES.items():
+            if facet == 'sgg_nm' and not self.has_si_nm():
+                continue
+            queries.append(self.facet_query(facet, exclude))
+        rows = queries[0].union(*queries[1:], all=True)
+
+        data = {'count': 0, 'si_nm': [], 'industry': []}
+        if self.has_si_nm():
+            data['sgg_nm'] = []
+        range_counts = {facet: {} for facet in RANGE_FACETS}
+        for row in rows:
+            facet, value, count = row['facet'], row['value'], row['count']
+            if facet == 'count':
+                data['count'] = count or 0
+            elif facet in range_counts:
+                range_counts[facet][value] = count
+            elif value:
+                entry = {'value': value, 'count': count}
+                if facet == 'industry':
+                    entry = {'code': value, 'name': row['label'], 'count': count}
+                data[facet].append(entry)
+
+        for facet in ('si_nm', 'sgg_nm'):
+            if facet in data:
+                data[facet].sort(key=lambda entry: (-entry['count'], entry['value']))
+        data['industry'].sort(key=lambda entry: (-entry['count'], entry['code']))
+
+        for facet, (column, buckets) in RANGE_FACETS.items():
+            data[facet] = [
+                {
+                    'key': key,
+                    'min': lower,
+                    # Inclusive, so it can be sent back as employee_max/revenue_range
+                    'max': upper - 1 if upper is not None else None,
+                    'count': range_counts[facet].get(key, 0),
+                }
+                for key, lower, upper in buckets
+            ]
+        data['source'] = 'rollup' if self.use_rollup else 'live'
+        return data
+
+    def has_si_nm(self):
+        return bool(self.params.get('si_nm') or self.params.get('si_nm__in'))
+
+    def facet_query(self, facet, exclude):
+        """Return one grouped (facet, value, label, count) query."""
+        if self.use_rollup:
+            queryset = SalesOneFacetRollup.objects.filter(self.rollup_filter(exclude))
+            count = Sum('lead_count')
+        else:
+            queryset = filter_salesone_leads(SalesOneLead.objects.all(), self.without(exclude))
+            count = Count('id')
+
+        label = Value(None, output_field=CharField())
+        if facet == 'count':
+            value = Value(None, output_field=CharField())
+        elif facet == 'industry':
+            value, label = F('industry__code'), F('industry__name')
+        elif facet in RANGE_FACETS:
+            column, buckets = RANGE_FACETS[facet]
+            value = F(f'{facet}_bucket') if self.use_rollup else bucket_case(column, buckets)
+        else:
+            value = F(facet)
+
+        rows = queryset.order_by().annotate(
+            facet=Value(facet, output_field=CharField()),
+            value=value,
+            label=label,
+        ).values('facet', 'value', 'label').annotate(count=count)
+        if facet == 'industry':
+            rows = rows.filter(industry__isnull=False).order_by('-count')[:FACET_INDUSTRY_LIMIT]
+        return rows
+
+    def without(self, exclude):
+        """Return the active parameters minus those of the excluded filters."""
+        excluded = {param for name in exclude for param in FACET_FILTER_PARAMS[name]}
+        return {param: value for param, value in self.params.items() if param not in excluded}
+
+    def rollup_filter(self, exclude):
+        params = self.without(exclude)
+        condition = salesone_list_filter(params)
+        for name, lookup in (('si_nm', 'si_nm'), ('sgg_nm', 'sgg_nm'), ('industry', 'industry__code')):
+            if params.get(name):
+                condition &= Q(**{lookup: params[name]})
+        for facet, keys in self.buckets.items():
+            if facet not in exclude:
+                condition &= Q(**{f'{facet}_bucket__any': keys})
+        return condition
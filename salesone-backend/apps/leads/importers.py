@@ -0,0 +1,448 @@
+import csv
+import io
+import os
+import numpy as np
+import pandas as pd
+from django.db import connection, transaction
+from openpyxl import load_workbook
+from .industries import industry_map
+from .models import Lead, LeadList, SalesOneLead
+
+# Lead fields accepted from an import file, besides industry_code
+TEXT_FIELDS = (
+    'corporation_number', 'business_number', 'name', 'owner', 'email', 'phone',
+    'address', 'si_nm', 'sgg_nm',
+)
+REQUIRED_FIELDS = ('name', 'corporation_number')
+INTEGER_LIMITS = {
+    'employee': 2 ** 31 - 1,
+    'revenue': 2 ** 63 - 1,
+}
+
+# Lead field -> SalesOneLead field copied by copy_salesone_leads
+SALESONE_LEAD_FIELDS = {
+    'corporation_number': 'corporation_number',
+    'business_number': 'business_number',
+    'name': 'name',
+    'owner': 'owner',
+    'email': 'email',
+    'phone': 'phone',
+    'homepage': 'homepage',
+    'employee': 'employee',
+    'revenue': 'finance_revenue',
+    'address': 'address',
+    'si_nm': 'si_nm',
+    'sgg_nm': 'sgg_nm',
+    'established_date': 'established_date',
+    'industry': 'industry',
+}
+
+
+# Bytes read at a time by split_csv_records
+SPLIT_BLOCK_SIZE = 1024 * 1024
+DUPLICATE_IN_FILE = "Duplicate corporation number in file: "
+LEAD_EXISTS = "Lead already exists: "
+
+
+def split_csv_records(file_path, shard_bytes):
+    """
+    Split a CSV file into byte ranges of whole records, about shard_bytes each.
+
+    A newline ends a record only outside quotes, i.e. after an even number
+    of quote characters from the start of the file (an escaped quote is
+    doubled, so it never changes the parity). The file is read once in
+    blocks; quotes are counted with ``bytes.count`` and only the newlines
+    after each shard's target size are looked at one by one.
+
+    Returns:
+        tuple: (end of the header row, list of (start, end) ranges of the data rows)
+    """
+    size = os.path.getsize(file_path)
+    boundaries = []
+    target = 0
+    quotes = 0
+    position = 0
+    with open(file_path, 'rb') as csv_file:
+        while True:
+            block = csv_file.read(SPLIT_BLOCK_SIZE)
+            if not block:
+                break
+            parity, counted = quotes, 0
+            search = max(target - position, 0)
+            while search < len(block):
+                newline = block.find(b'\n', search)
+                if newline < 0:
+                    break
+                parity += block.count(b'"', counted, newline)
+                counted = newline
+                if parity % 2 == 0:
+                    boundaries.append(position + newline + 1)
+                    target = boundaries[-1] + shard_bytes
+                    search = target - position
+                else:
+                    search = newline + 1
+            quotes += block.count(b'"')
+            position += len(block)
+
+    if not boundaries:
+        return size, []
+    ends = boundaries[1:] + [size]
+    ranges = [(start, end) for start, end in zip(boundaries, ends) if end > start]
+    return boundaries[0], ranges
+
+
+def clean_text(series):
+    """Strip a column to nullable strings, with blanks as missing."""
+    return series.astype('string').str.strip().replace('', pd.NA)
+
+
+def copy_salesone_leads(salesone_leads, user_id):
+    """
+    Copy SalesOne leads into a user's leads in a single statement.
+
+    Runs ``INSERT ... SELECT ... ON CONFLICT (corporation_number, user) DO
+    NOTHING RETURNING`` so the rows never leave the database. Leads the user
+    already had are reported separately; the statement's own snapshot does
+    not include the rows it inserts.
+
+    Args:
+        salesone_leads: SalesOneLead queryset selecting the rows to copy
+        user_id: ID of the user receiving the leads
+
+    Returns:
+        tuple: (list of created Lead ids, list of existing Lead ids)
+    """
+    quote_name = connection.ops.quote_name
+    lead_columns = [Lead._meta.get_field(field).column for field in SALESONE_LEAD_FIELDS]
+    salesone_columns = [
+        SalesOneLead._meta.get_field(field).column for field in SALESONE_LEAD_FIELDS.values()
+    ]
+    selection, params = salesone_leads.order_by().values('id').query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            WITH selected AS (
+                SELECT * FROM {SalesOneLead._meta.db_table}
+                WHERE id IN ({selection})
+            ), inserted AS (
+                INSERT INTO {Lead._meta.db_table} (
+                    id, created_at, updated_at, user_id,
+                    {', '.join(quote_name(column) for column in lead_columns)}
+                )
+                SELECT
+                    gen_random_uuid(), now(), now(), %s,
+                    {', '.join(f's.{quote_name(column)}' for column in salesone_columns)}
+                FROM selected s
+                ON CONFLICT (corporation_number, user_id) DO NOTHING
+                RETURNING id
+            )
+            SELECT id, true FROM inserted
+            UNION ALL
+            SELECT l.id, false FROM {Lead._meta.db_table} l
+            JOIN selected s ON s.corporation_number = l.corporation_number
+            WHERE l.user_id = %s
+        """, [*params, user_id, user_id])
+        rows = cursor.fetchall()
+
+    created = [lead_id for lead_id, is_new in rows if is_new]
+    existing = [lead_id for lead_id, is_new in rows if not is_new]
+    return created, existing
+
+
+class LeadFileImporter:
+    """
+    Streams a CSV or Excel lead file into Lead in chunks.
+
+    Each chunk is validated and transformed with vectorized pandas operations,
+    then written with one ``bulk_create`` for the leads and one for the lead
+    list links. Rows that fail validation are reported with their file row
+    number instead of failing the chunk.
+    """
+
+    def __init__(self, file_path, user_id, file_type='csv', options=None, chunk_size=2000, byte_range=None):
+        self.file_path = file_path
+        self.user_id = user_id
+        self.file_type = file_type.lower()
+        self.options = options or {}
+        self.chunk_size = chunk_size
+        # (header end, start, end) of the CSV shard to read, see split_csv_records
+        self.byte_range = byte_range
+        self.lead_list_id = self.options.get('lead_list_id')
+        # Corporation numbers already taken in earlier chunks of this file
+        self.seen = set()
+
+    def validate_lead_list(self):
+        """Return False if the target lead list is missing or not the user's."""
+        if not self.lead_list_id:
+            return True
+        return LeadList.objects.filter(id=self.lead_list_id, user_id=self.user_id).exists()
+
+    def count_rows(self):
+        """
+        Count data rows without loading the file.
+
+        Returns:
+            int or None: Row count, or None if the workbook has no dimension record
+        """
+        if self.file_type == 'csv':
+            with io.TextIOWrapper(self.open_csv(), encoding='utf-8', newline='') as csv_file:
+                return max(sum(1 for _ in csv.reader(csv_file)) - 1, 0)
+
+        if self.is_xlsx():
+            workbook = load_workbook(self.file_path, read_only=True)
+            try:
+                max_row = workbook.active.max_row
+            finally:
+                workbook.close()
+            return max(max_row - 1, 0) if max_row else None
+
+        return None
+
+    def open_csv(self):
+        """
+        Open the CSV file in binary mode.
+
+        For a shard, returns the header row followed by the shard's records,
+        read into memory (a shard is about LEAD_IMPORT_SHARD_BYTES).
+        """
+        if self.byte_range is None:
+            return open(self.file_path, 'rb')
+        header_end, start, end = self.byte_range
+        with open(self.file_path, 'rb') as csv_file:
+            header = csv_file.read(header_end)
+            csv_file.seek(start)
+            return io.BytesIO(header + csv_file.read(end - start))
+
+    def iter_chunks(self):
+        """Yield DataFrames of at most chunk_size rows, indexed by 0-based row."""
+        if self.file_type == 'csv':
+            with self.open_csv() as csv_file:
+                yield from pd.read_csv(
+                    csv_file,
+                    chunksize=self.chunk_size,
+                    dtype=str,
+                    keep_default_na=False,
+                    encoding='utf-8',
+                )
+        elif self.is_xlsx():
+            yield from self.iter_xlsx_chunks()
+        elif self.file_type in ['excel', 'xls']:
+            # Legacy .xls has no streaming reader
+            df = pd.read_excel(self.file_path, dtype=str)
+            for start in range(0, len(df), self.chunk_size):
+                yield df.iloc[start:start + self.chunk_size]
+        else:
+            raise ValueError(f"Unsupported file type: {self.file_type}")
+
+    def is_xlsx(self):
+        return (
+            self.file_type in ['excel', 'xlsx'] and
+            os.path.splitext(self.file_path)[1].lower() != '.xls'
+        )
+
+    def iter_xlsx_chunks(self):
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(column).strip() if column is not None else '' for column in header]
+
+            start = 0
+            batch = []
+            for row in rows:
+                batch.append(row[:len(columns)])
+                if len(batch) >= self.chunk_size:
+                    yield self.xlsx_frame(batch, columns, start)
+                    start += len(batch)
+                    batch = []
+            if batch:
+                yield self.xlsx_frame(batch, columns, start)
+        finally:
+            workbook.close()
+
+    def xlsx_frame(self, rows, columns, start):
+        return pd.DataFrame.from_records(
+            rows,
+            columns=columns,
+            index=pd.RangeIndex(start, start + len(rows))
+        )
+
+    def transform(self, raw):
+        """
+        Validate and transform one chunk.
+
+        Args:
+            raw: DataFrame as read from the file
+
+        Returns:
+            tuple: (DataFrame of Lead field values for valid rows,
+                    list of error row dicts)
+        """
+        df = raw
+        column_mapping = self.options.get('column_mapping')
+        if column_mapping:
+            present = {
+                file_column: db_field
+                for db_field, file_column in column_mapping.items()
+                if file_column in raw.columns
+            }
+            df = raw[list(present)].rename(columns=present)
+
+        missing = pd.Series(pd.NA, index=df.index, dtype='string')
+
+        def column(name):
+            return df[name] if name in df.columns else missing
+
+        leads = pd.DataFrame(index=df.index)
+        for field in TEXT_FIELDS:
+            leads[field] = clean_text(column(field))
+
+        errors = pd.Series(None, index=df.index, dtype=object)
+
+        def flag(condition, message):
+            condition = condition.fillna(False).astype(bool) & errors.isna()
+            errors[condition] = message if isinstance(message, str) else message[condition]
+
+        for field in REQUIRED_FIELDS:
+            flag(leads[field].isna(), f"Missing required field: {field}")
+
+        for field in TEXT_FIELDS:
+            max_length = Lead._meta.get_field(field).max_length
+            if max_length:
+                flag(
+                    leads[field].str.len() > max_length,
+                    f"Ensure {field} has at most {max_length} characters"
+                )
+
+        for field, limit in INTEGER_LIMITS.items():
+            text = clean_text(column(field))
+            number = pd.to_numeric(text, errors='coerce')
+            valid = number.notna() & (number.abs() <= limit)
+            flag(text.notna() & ~valid, f"Invalid {field}: " + text.fillna(''))
+            leads[field] = np.trunc(number.where(valid)).astype('Int64')
+        leads['employee'] = leads['employee'].fillna(1)
+
+        homepage = clean_text(column('homepage'))
+        leads['homepage'] = homepage.map(lambda url: [url], na_action='ignore')
+
+        leads['established_date'] = pd.to_datetime(
+            clean_text(column('established_date')),
+            errors='coerce',
+            format='mixed'
+        ).dt.date
+
+        codes = clean_text(column('industry_code'))
+        industry_ids = industry_map.resolve_codes(codes.dropna().unique())
+        leads['industry_id'] = codes.map(industry_ids).astype('Int64')
+
+        self.flag_duplicates(leads, errors, flag)
+
+        error_rows = self.error_rows(raw, errors.dropna())
+
+        valid = leads[errors.isna()]
+        self.seen.update(valid['corporation_number'])
+        return valid, error_rows
+
+    def mark_seen(self, raw, error_rows):
+        """
+        Remember the corporation numbers of a chunk imported before a retry.
+
+        A resumed shard skips the chunks it already committed; this rebuilds
+        ``seen`` as transform() left it, so a later copy of one of their rows
+        is still reported as an in-file duplicate. Rows rejected for any
+        other reason never entered ``seen`` and are left out.
+        """
+        column_mapping = self.options.get('column_mapping')
+        column = column_mapping.get('corporation_number') if column_mapping else 'corporation_number'
+        if column not in raw.columns:
+            return
+        rejected = [
+            error_row['row'] - 2 for error_row in error_rows
+            if not error_row['error'].startswith(DUPLICATE_IN_FILE)
+        ]
+        self.seen.update(clean_text(raw[column]).drop(rejected, errors='ignore').dropna())
+
+    def error_rows(self, raw, messages):
+        """Report rows of a chunk by file row number, with their raw values."""
+        return [
+            {
+                'row': index + 2,  # +2 because index is 0-based and we need to account for header row
+                'data': {
+                    key: None if pd.isna(value) else str(value)
+                    for key, value in raw.loc[index].items()
+                },
+                'error': message,
+            }
+            for index, message in messages.items()
+        ]
+
+    def flag_duplicates(self, leads, errors, flag):
+        """Flag rows whose corporation number the user already has."""
+        corporation_numbers = leads.loc[errors.isna(), 'corporation_number']
+        existing = set(
+            Lead.objects.filter(
+                user_id=self.user_id,
+                corporation_number__in=corporation_numbers.unique().tolist()
+            ).values_list('corporation_number', flat=True)
+        ) - self.seen
+        duplicated = leads['corporation_number'].isin(self.seen) | (
+            errors.isna() & leads['corporation_number'].duplicated()
+        )
+        message = DUPLICATE_IN_FILE + leads['corporation_number'].fillna('')
+        flag(duplicated, message)
+        flag(
+            leads['corporation_number'].isin(existing),
+            LEAD_EXISTS + leads['corporation_number'].fillna('')
+        )
+
+    def insert(self, raw, leads, link_to_list=True, conflict_message=LEAD_EXISTS):
+        """
+        Insert one chunk of transformed leads and link them to the lead list.
+
+        flag_duplicates() only sees leads committed before the chunk was
+        validated, so a concurrent import can still take a corporation
+        number. The chunk is written with ``ON CONFLICT DO NOTHING`` and the
+        rows that did not land are reported with ``conflict_message``
+        instead of failing the whole chunk.
+
+        Returns:
+            tuple: (number of leads created, list of error row dicts)
+        """
+        if leads.empty:
+            return 0, []
+
+        records = leads.astype(object).where(leads.notna(), None).to_dict('records')
+        objs = [Lead(user_id=self.user_id, **record) for record in records]
+
+        with transaction.atomic():
+            Lead.objects.bulk_create(objs, ignore_conflicts=True)
+            created = set(
+                Lead.objects.filter(id__in=[lead.id for lead in objs]).values_list('id', flat=True)
+            )
+            if self.lead_list_id and link_to_list:
+                through = LeadList.leads.through
+                through.objects.bulk_create([
+                    through(leadlist_id=self.lead_list_id, lead_id=lead.id)
+                    for lead in objs if lead.id in created
+                ])
+
+        skipped = pd.Series(
+            [lead.id not in created for lead in objs], index=leads.index
+        )
+        messages = conflict_message + leads.loc[skipped, 'corporation_number']
+        return len(created), self.error_rows(raw, messages)
+
+    def insert_shard(self, raw, leads, link_to_list=True):
+        """
+        Insert one chunk of a shard, skipping leads another shard inserted first.
+
+        Shards of one file run concurrently, so a corporation number repeated
+        in two shards is only caught by the unique constraint; those rows are
+        reported like in-file duplicates.
+
+        Returns:
+            tuple: (number of leads created, list of error row dicts)
+        """
+        return self.insert(raw, leads, link_to_list=link_to_list, conflict_message=DUPLICATE_IN_FILE)
@@ -0,0 +1,141 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from django.core.cache import cache
+from .models import Industry
+
+# Bumped whenever Industry changes; every process reloads its map on mismatch
+INDUSTRY_MAP_VERSION_KEY = 'leads:industry_map:version'
+# Reload at least this often, for changes that bypass model signals (bulk_create)
+INDUSTRY_MAP_MAX_AGE = 300
+# Unknown industry codes remembered per process
+NEGATIVE_CACHE_SIZE = 1024
+
+
+def normalize_industry_name(name):
+    """Industry names are matched with spaces removed, as in the SalesOne CSV."""
+    return name.replace(' ', '') if name else name
+
+
+def invalidate_industry_map():
+    cache.set(INDUSTRY_MAP_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+class IndustryMap:
+    """
+    Process-local memo of the Industry table.
+
+    Industry is a few thousand rows that imports resolve once per lead, so
+    each process keeps code, normalized-name and id lookups in memory. The
+    map reloads when the shared version key changes or after
+    ``INDUSTRY_MAP_MAX_AGE`` seconds. Codes that are not in the table are
+    remembered in a bounded LRU so they are only queried once.
+    """
+
+    def __init__(self, max_age=INDUSTRY_MAP_MAX_AGE, negative_cache_size=NEGATIVE_CACHE_SIZE):
+        self.max_age = max_age
+        self.negative_cache_size = negative_cache_size
+        self.lock = threading.Lock()
+        self.version = None
+        self.loaded_at = None
+        self.by_code = {}
+        self.by_name = {}
+        self.by_id = {}
+        self.unknown_codes = OrderedDict()
+
+    def refresh(self):
+        """Reload the map if the table changed or the map is stale."""
+        version = cache.get(INDUSTRY_MAP_VERSION_KEY)
+        with self.lock:
+            if (
+                self.loaded_at is not None and
+                version == self.version and
+                time.monotonic() - self.loaded_at < self.max_age
+            ):
+                return
+
+            by_code, by_name, by_id = {}, {}, {}
+            # Descending so the lowest id wins for duplicate names
+            for industry in Industry.objects.order_by('-id'):
+                by_code[industry.code] = industry.id
+                by_name[normalize_industry_name(industry.name)] = industry.id
+                by_id[industry.id] = industry
+
+            self.by_code, self.by_name, self.by_id = by_code, by_name, by_id
+            self.unknown_codes.clear()
+            self.version = version
+            self.loaded_at = time.monotonic()
+
+    def expire(self):
+        """Reload this process's map on next use, whatever the version."""
+        with self.lock:
+            self.loaded_at = None
+
+    def resolve_codes(self, codes):
+        """
+        Map industry codes to ids.
+
+        Args:
+            codes: Iterable of industry codes
+
+        Returns:
+            dict: code -> id for every known code
+        """
+        self.refresh()
+        resolved = {}
+        missing = []
+        for code in set(codes):
+            if code in self.by_code:
+                resolved[code] = self.by_code[code]
+            elif code in self.unknown_codes:
+                self.unknown_codes.move_to_end(code)
+            else:
+                missing.append(code)
+
+        if missing:
+            # Rows added since the last load without a version bump
+            found = {industry.code: industry for industry in Industry.objects.filter(code__in=missing)}
+            with self.lock:
+                for code in missing:
+                    if code in found:
+                        industry = found[code]
+                        self.by_code[code] = industry.id
+                        self.by_id[industry.id] = industry
+                        resolved[code] = industry.id
+                    else:
+                        self.unknown_codes[code] = True
+                        if len(self.unknown_codes) > self.negative_cache_size:
+                            self.unknown_codes.popitem(last=False)
+        return resolved
+
+    def names(self):
+        """Return normalized industry name -> id."""
+        self.refresh()
+        return self.by_name
+
+    def search(self, text):
+        """Return the ids of industries whose name contains the text, ignoring case."""
+        self.refresh()
+        text = text.strip().lower()
+        return [
+            industry_id for industry_id, industry in self.by_id.items()
+            if text in industry.name.lower()
+        ]
+
+    def get(self, industry_id):
+        """Return the Industry instance for an id, or None."""
+        if industry_id is None:
+            return None
+        self.refresh()
+        industry = self.by_id.get(industry_id)
+        if industry is None:
+            industry = Industry.objects.filter(id=industry_id).first()
+            if industry is not None:
+                with self.lock:
+                    self.by_code[industry.code] = industry.id
+                    self.by_id[industry.id] = industry
+        return industry
+
+
+industry_map = IndustryMap()
@@ -0,0 +1,293 @@
+import csv
+import json
+import logging
+import time
+from django.db import connections, models, transaction
+from .industries import industry_map
+from .models import SalesOneLead
+from .signals import salesone_leads_synced
+
+logger = logging.getLogger(__name__)
+
+
+# Session-local helpers mirroring the clean_json_field/established_date
+# handling of the original row-by-row importer, without aborting the load on
+# bad input.
+CLEANING_FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION pg_temp.salesone_clean_json(value text) RETURNS jsonb
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    IF value IS NULL OR btrim(value) = '' THEN
+        RETURN '[]'::jsonb;
+    END IF;
+    IF left(value, 1) = '[' AND right(value, 1) = ']' THEN
+        BEGIN
+            RETURN value::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN jsonb_build_array(value);
+        END;
+    END IF;
+    RETURN jsonb_build_array(value);
+END
+$$;
+
+CREATE OR REPLACE FUNCTION pg_temp.salesone_clean_date(value text) RETURNS date
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    IF value IS NULL OR btrim(value) = '' THEN
+        RETURN NULL;
+    END IF;
+    RETURN value::date;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END
+$$;
+"""
+
+DECIMAL_PATTERN = r'^[+-]?(\d{1,8}(\.\d*)?|\.\d+)$'
+BOOLEAN_TRUE_VALUES = "('true', '1', 'yes')"
+
+CHANGE_TYPES = ('inserted', 'changed', 'removed')
+
+
+class SalesOneLeadLoader:
+    """
+    Loads the SalesOne master CSV into SalesOneLead.
+
+    The file is streamed with ``COPY FROM STDIN`` into a temporary text table,
+    cleaned with set-based SQL into a typed temporary table, and merged into
+    the live table in a single transaction: new and changed rows (by content
+    hash) are upserted on ``corporation_number`` and rows missing from the
+    file are deleted. The live table is never empty, existing ids are
+    preserved, and the corporation numbers touched are published as a change
+    manifest through ``salesone_leads_synced``.
+    """
+    staging_table = 'salesone_staging'
+    load_table = 'salesone_load'
+    changes_table = 'salesone_changes'
+
+    def __init__(self, csv_path, using='default', log=None):
+        self.csv_path = csv_path
+        self.using = using
+        self.log = log or logger.info
+        self.quote_name = connections[using].ops.quote_name
+        self.table = SalesOneLead._meta.db_table
+        self.keywords_table = SalesOneLead.keywords.through._meta.db_table
+
+    def load(self, keep_missing=False, manifest_path=None):
+        """
+        Run the full load.
+
+        Args:
+            keep_missing: Keep live rows whose corporation_number is not in the file
+            manifest_path: Optional path the change manifest is written to as JSON
+
+        Returns:
+            dict: Row counts and timing for the load
+        """
+        start_time = time.time()
+        connection = connections[self.using]
+
+        with connection.cursor() as cursor:
+            header = self.stage(cursor)
+            staged = self.clean(cursor, header)
+            self.log(f'Staged {staged} distinct corporations in {time.time() - start_time:.1f}s')
+
+            with transaction.atomic(using=self.using):
+                stats = self.merge(cursor, keep_missing=keep_missing)
+
+            manifest = self.manifest(cursor)
+            cursor.execute(
+                f'DROP TABLE IF EXISTS {self.staging_table}, {self.load_table}, {self.changes_table}'
+            )
+
+        stats['staged'] = staged
+        stats['unchanged'] = staged - stats['inserted'] - stats['changed']
+        stats['duration'] = time.time() - start_time
+
+        if manifest_path:
+            with open(manifest_path, 'w', encoding='utf-8') as manifest_file:
+                json.dump(manifest, manifest_file, ensure_ascii=False)
+        salesone_leads_synced.send(sender=self.__class__, manifest=manifest)
+        return stats
+
+    def stage(self, cursor):
+        """COPY the raw CSV into a temporary table of text columns."""
+        with open(self.csv_path, 'r', encoding='utf-8', newline='') as csv_file:
+            header = next(csv.reader(csv_file))
+
+        if 'corporation_number' not in header or 'name' not in header:
+            raise ValueError('CSV must have corporation_number and name columns')
+
+        columns = ', '.join(f'{self.quote_name(column)} text' for column in header)
+        cursor.execute(f'DROP TABLE IF EXISTS {self.staging_table}')
+        cursor.execute(
+            f'CREATE TEMP TABLE {self.staging_table} (line bigserial, {columns})'
+        )
+
+        column_list = ', '.join(self.quote_name(column) for column in header)
+        with open(self.csv_path, 'r', encoding='utf-8', newline='') as csv_file:
+            cursor.copy_expert(
+                f"COPY {self.staging_table} ({column_list}) FROM STDIN WITH (FORMAT csv, HEADER true)",
+                csv_file
+            )
+        return header
+
+    def clean(self, cursor, header):
+        """
+        Convert staged text into typed SalesOneLead columns.
+
+        The first row wins for duplicate corporation numbers, matching the old
+        bulk_create(ignore_conflicts=True) importer.
+        """
+        cursor.execute(CLEANING_FUNCTIONS_SQL)
+
+        header = set(header)
+        expressions = [
+            f'{self.clean_expression(field, header)} AS {self.quote_name(field.column)}'
+            for field in self.load_fields()
+        ]
+        expressions.append(f'industry_map.id AS {self.quote_name("industry_id")}')
+
+        cursor.execute(f'DROP TABLE IF EXISTS {self.load_table}')
+        # Same normalization as normalize_industry_name
+        industry_name = "replace(s.industry_name, ' ', '')" if 'industry_name' in header else 'NULL'
+        industry_names = industry_map.names()
+        cursor.execute(f"""
+            CREATE TEMP TABLE {self.load_table} AS
+            SELECT cleaned.*, md5(cleaned::text) AS content_hash
+            FROM (
+                SELECT DISTINCT ON (s.corporation_number) {', '.join(expressions)}
+                FROM {self.staging_table} s
+                LEFT JOIN unnest(%s::text[], %s::bigint[]) AS industry_map (key, id)
+                    ON industry_map.key = {industry_name}
+                WHERE s.corporation_number <> '' AND s.name <> ''
+                ORDER BY s.corporation_number, s.line
+            ) cleaned
+        """, [list(industry_names), list(industry_names.values())])
+        cursor.execute(f'CREATE UNIQUE INDEX ON {self.load_table} (corporation_number)')
+        # Temporary tables are never auto-analyzed
+        cursor.execute(f'ANALYZE {self.load_table}')
+
+        cursor.execute(f'SELECT count(*) FROM {self.load_table}')
+        return cursor.fetchone()[0]
+
+    def merge(self, cursor, keep_missing=False):
+        """
+        Apply the delta between the cleaned rows and the live table.
+
+        Rows are upserted on corporation_number, but existing rows are only
+        rewritten when their content hash differs, so unchanged rows keep
+        their tuple (no dead rows, index or search_vector churn). Every
+        change is recorded in the changes table for the manifest.
+        """
+        columns = [field.column for field in self.load_fields()] + ['industry_id', 'content_hash']
+        column_list = ', '.join(self.quote_name(column) for column in columns)
+        updates = ', '.join(
+            f'{self.quote_name(column)} = EXCLUDED.{self.quote_name(column)}'
+            for column in columns if column != 'corporation_number'
+        )
+
+        cursor.execute(f'DROP TABLE IF EXISTS {self.changes_table}')
+        cursor.execute(
+            f'CREATE TEMP TABLE {self.changes_table} (corporation_number text, change text)'
+        )
+        # xmax is 0 only for tuples inserted (not updated) by this statement
+        cursor.execute(f"""
+            WITH upserted AS (
+                INSERT INTO {self.table} ({column_list})
+                SELECT {column_list} FROM {self.load_table}
+                ON CONFLICT (corporation_number) DO UPDATE SET {updates}
+                WHERE {self.table}.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                RETURNING corporation_number, xmax = 0 AS inserted
+            )
+            INSERT INTO {self.changes_table}
+            SELECT corporation_number, CASE WHEN inserted THEN 'inserted' ELSE 'changed' END
+            FROM upserted
+        """)
+
+        deleted = 0
+        if not keep_missing:
+            deleted = self.delete_missing(cursor)
+
+        cursor.execute(f'SELECT change, count(*) FROM {self.changes_table} GROUP BY change')
+        counts = dict(cursor.fetchall())
+        return {
+            'inserted': counts.get('inserted', 0),
+            'changed': counts.get('changed', 0),
+            'deleted': deleted,
+        }
+
+    def delete_missing(self, cursor):
+        """Delete live rows (and their keyword links) absent from the load."""
+        cursor.execute(f"""
+            CREATE TEMP TABLE salesone_removed ON COMMIT DROP AS
+            SELECT l.id, l.corporation_number FROM {self.table} l
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {self.load_table} s
+                WHERE s.corporation_number = l.corporation_number
+            )
+        """)
+        cursor.execute(
+            f'DELETE FROM {self.keywords_table} WHERE salesonelead_id IN (SELECT id FROM salesone_removed)'
+        )
+        cursor.execute(f'DELETE FROM {self.table} WHERE id IN (SELECT id FROM salesone_removed)')
+        deleted = cursor.rowcount
+        cursor.execute(f"""
+            INSERT INTO {self.changes_table}
+            SELECT corporation_number, 'removed' FROM salesone_removed
+        """)
+        cursor.execute('DROP TABLE salesone_removed')
+        return deleted
+
+    def manifest(self, cursor):
+        """Corporation numbers touched by the last merge, grouped by change."""
+        manifest = {change: [] for change in CHANGE_TYPES}
+        cursor.execute(
+            f'SELECT change, corporation_number FROM {self.changes_table} ORDER BY corporation_number'
+        )
+        for change, corporation_number in cursor.fetchall():
+            manifest[change].append(corporation_number)
+        return manifest
+
+    def load_fields(self):
+        """SalesOneLead columns populated from the CSV."""
+        return [
+            field for field in SalesOneLead._meta.concrete_fields
+            if field.column not in ('id', 'industry_id', 'search_vector', 'content_hash')
+        ]
+
+    def clean_expression(self, field, header):
+        """Return the SQL turning a staged text column into the field's type."""
+        if field.column not in header:
+            if isinstance(field, models.BooleanField):
+                return 'false'
+            if field.column == 'employee':
+                return '1'
+            # Typed so the temporary table gets the live column's type
+            return f'NULL::{field.db_type(connections[self.using])}'
+
+        value = f's.{self.quote_name(field.column)}'
+        trimmed = f'btrim({value})'
+        if isinstance(field, models.BooleanField):
+            return f'coalesce(lower({trimmed}) IN {BOOLEAN_TRUE_VALUES}, false)'
+        if isinstance(field, models.JSONField):
+            return f'pg_temp.salesone_clean_json({value})'
+        if isinstance(field, models.DateField):
+            return f'pg_temp.salesone_clean_date({value})'
+        if isinstance(field, models.DecimalField):
+            return f"CASE WHEN {trimmed} ~ '{DECIMAL_PATTERN}' THEN {trimmed}::numeric END"
+        if isinstance(field, models.IntegerField):
+            # Digit limits keep out-of-range values NULL instead of failing the cast
+            if isinstance(field, models.BigIntegerField):
+                cast, digits = 'bigint', 18
+            else:
+                cast, digits = 'integer', 9
+            integer = f"CASE WHEN {trimmed} ~ '^[+-]?\\d{{1,{digits}}}$' THEN {trimmed}::{cast} END"
+            if field.column == 'employee':
+                # clean_integer(...) or 1
+                return f'coalesce(nullif({integer}, 0), 1)'
+            return integer
+        if field.null:
+            return f"nullif({value}, '')"
+        return value
@@ -0,0 +1,161 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from apps.leads.models import Industry, Lead, LeadList
+from apps.leads.search import filter_lead_members
+import statistics
+import time
+import uuid
+
+User = get_user_model()
+
+DEFAULT_QUERIES = '넥스파,서울특별시,nexpa,소프트웨어,1234'
+
+# Synthetic members: every name gets one of these words, regions and industries rotate
+SYNTHETIC_WORDS = ('넥스파', '대우', '한빛', '미래', '세종', 'nexpa', 'hanbit', 'daewoo')
+SYNTHETIC_REGIONS = (
+    ('서울특별시', '강남구'), ('서울특별시', '금천구'), ('경기도', '성남시 분당구'),
+    ('부산광역시', '해운대구'), ('대전광역시', '유성구'),
+)
+SYNTHETIC_INDUSTRIES = (('J62', '소프트웨어 개발'), ('G47', '소매업'), ('C26', '전자부품 제조업'))
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare lead list member search through search_vector with the old '
+        'eight-column icontains search with DISTINCT'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lead-list',
+            type=str,
+            help='ID of an existing lead list to search (defaults to a synthetic list)'
+        )
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=100000,
+            help='Members of the synthetic list, which is rolled back afterwards'
+        )
+        parser.add_argument(
+            '--queries',
+            type=str,
+            default=DEFAULT_QUERIES,
+            help='Comma-separated search terms'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per pattern; the median is reported'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=10,
+            help='Members fetched per search, as in the lead list page'
+        )
+
+    def handle(self, *args, **options):
+        queries = [query.strip() for query in options['queries'].split(',') if query.strip()]
+        if options['lead_list']:
+            try:
+                lead_list = LeadList.objects.get(id=options['lead_list'])
+            except (LeadList.DoesNotExist, ValueError):
+                raise CommandError(f"Lead list {options['lead_list']} not found")
+            self.run(lead_list, queries, options)
+            return
+
+        with transaction.atomic():
+            lead_list = self.create_synthetic_list(options['size'])
+            self.run(lead_list, queries, options)
+            transaction.set_rollback(True)
+
+    def run(self, lead_list, queries, options):
+        self.stdout.write(f'{lead_list.name}: {lead_list.leads_count} members')
+        patterns = [
+            ('icontains + DISTINCT', self.icontains),
+            ('search_vector', self.search_vector),
+        ]
+        for query in queries:
+            for label, search in patterns:
+                timings = []
+                for _ in range(max(options['repeat'], 1)):
+                    start_time = time.perf_counter()
+                    queryset = search(lead_list, query)
+                    total = queryset.count()
+                    list(queryset[:options['page_size']])
+                    timings.append(time.perf_counter() - start_time)
+                self.stdout.write(
+                    f'{query:<12} {label:<22} {statistics.median(timings) * 1000:8.1f} ms median, '
+                    f'{total} matches'
+                )
+
+    def icontains(self, lead_list, query):
+        """The member search LeadListViewSet.retrieve used to run"""
+        return lead_list.leads.filter(
+            Q(name__icontains=query) |
+            Q(owner__icontains=query) |
+            Q(email__icontains=query) |
+            Q(phone__icontains=query) |
+            Q(address__icontains=query) |
+            Q(si_nm__icontains=query) |
+            Q(sgg_nm__icontains=query) |
+            Q(industry__name__icontains=query)
+        ).distinct()
+
+    def search_vector(self, lead_list, query):
+        queryset = filter_lead_members(lead_list.leads.select_related('industry'), query)
+        return queryset.order_by('-search_rank', 'name', 'id')
+
+    def create_synthetic_list(self, size):
+        self.stdout.write(f'Creating a synthetic list of {size} leads...')
+        start_time = time.time()
+        user = User.objects.create_user(email=f'benchmark-{uuid.uuid4().hex}@example.com')
+        lead_list = LeadList.objects.create(name='Benchmark list', user=user)
+        industry_ids = [
+            Industry.objects.get_or_create(code=code, defaults={'name': name})[0].id
+            for code, name in SYNTHETIC_INDUSTRIES
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                INSERT INTO {Lead._meta.db_table} (
+                    id, created_at, updated_at, user_id, corporation_number, name, owner,
+                    email, phone, employee, address, si_nm, sgg_nm, industry_id
+                )
+                SELECT
+                    gen_random_uuid(), now(), now(), %s, lpad(g::text, 13, '0'),
+                    '주식회사 ' || (%s::text[])[1 + g %% %s] || ' ' || g,
+                    '대표' || g,
+                    'contact' || g || '@' || (%s::text[])[1 + g %% %s] || '.co.kr',
+                    '02-' || lpad((g %% 10000)::text, 4, '0') || '-' || lpad((g / 10)::text, 4, '0'),
+                    1 + g %% 300,
+                    region.si_nm || ' ' || region.sgg_nm || ' ' || g || '번길',
+                    region.si_nm, region.sgg_nm,
+                    (%s::bigint[])[1 + g %% %s]
+                FROM generate_series(1, %s) g
+                JOIN unnest(%s::text[], %s::text[]) WITH ORDINALITY AS region (si_nm, sgg_nm, position)
+                    ON region.position = 1 + g %% %s
+            """, [
+                user.id,
+                list(SYNTHETIC_WORDS), len(SYNTHETIC_WORDS),
+                list(SYNTHETIC_WORDS), len(SYNTHETIC_WORDS),
+                industry_ids, len(industry_ids),
+                size,
+                [si_nm for si_nm, _ in SYNTHETIC_REGIONS], [sgg_nm for _, sgg_nm in SYNTHETIC_REGIONS],
+                len(SYNTHETIC_REGIONS),
+            ])
+            through = LeadList.leads.through._meta.db_table
+            cursor.execute(f"""
+                INSERT INTO {through} (leadlist_id, lead_id)
+                SELECT %s, id FROM {Lead._meta.db_table} WHERE user_id = %s
+            """, [lead_list.id, user.id])
+            cursor.execute(f'ANALYZE {Lead._meta.db_table}')
+            cursor.execute(f'ANALYZE {through}')
+
+        lead_list.refresh_from_db()
+        self.stdout.write(f'Created in {time.time() - start_time:.1f}s')
+        return lead_list
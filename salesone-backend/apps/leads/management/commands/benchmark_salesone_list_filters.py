@@ -0,0 +1,105 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from apps.leads.models import SalesOneFacetRollup, SalesOneLead
+from apps.leads.search import filter_salesone_leads, order_salesone_leads
+import statistics
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare one multi-select search_salesone query (= ANY(array)) with the '
+        'one-search-per-value pattern the search panel used'
+    )
+
+    # list parameter -> (single-value parameter, rollup column used to pick default values)
+    PARAMS = {
+        'si_nm': ('si_nm__in', 'si_nm'),
+        'sgg_nm': ('sgg_nm__in', 'sgg_nm'),
+        'industry': ('industry__in', 'industry__code'),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--param',
+            choices=list(self.PARAMS),
+            default='sgg_nm',
+            help='Filter to multi-select'
+        )
+        parser.add_argument(
+            '--values',
+            type=str,
+            help='Comma-separated values (defaults to the most common ones)'
+        )
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=5,
+            help='Number of default values to select'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per pattern; the median is reported'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=10,
+            help='Results fetched per search, as in the search page'
+        )
+
+    def handle(self, *args, **options):
+        param = options['param']
+        list_param, column = self.PARAMS[param]
+        if options['values']:
+            values = [value.strip() for value in options['values'].split(',') if value.strip()]
+        else:
+            values = list(
+                SalesOneFacetRollup.objects.exclude(**{f'{column}__isnull': True})
+                .values_list(column, flat=True)
+                .annotate(total=Sum('lead_count'))
+                .order_by('-total')[:options['count']]
+            )
+        if not values:
+            raise CommandError('No values to search for; rebuild the rollups or pass --values')
+
+        self.stdout.write(f'{param}: {", ".join(values)}')
+        patterns = [
+            ('one query per value', lambda: self.per_value(param, values, options['page_size'])),
+            (f'{list_param} (= ANY)', lambda: self.multi_select(list_param, values, options['page_size'])),
+        ]
+        results = []
+        for label, run in patterns:
+            timings = []
+            for _ in range(max(options['repeat'], 1)):
+                with CaptureQueriesContext(connection) as queries:
+                    start_time = time.perf_counter()
+                    ids, total = run()
+                    timings.append(time.perf_counter() - start_time)
+            results.append((ids, total))
+            self.stdout.write(
+                f'{label:<24} {statistics.median(timings) * 1000:8.1f} ms median, '
+                f'{len(queries)} queries, {total} rows'
+            )
+
+        if results[0] != results[1]:
+            self.stdout.write(self.style.WARNING('Patterns returned different results'))
+
+    def per_value(self, param, values, page_size):
+        """One paginated search per value, merged client-side"""
+        ids, total = set(), 0
+        for value in values:
+            params = {param: value}
+            queryset = order_salesone_leads(filter_salesone_leads(SalesOneLead.objects.all(), params), params)
+            ids.update(queryset.values_list('id', flat=True)[:page_size])
+            total += queryset.count()
+        return sorted(ids)[:page_size], total
+
+    def multi_select(self, list_param, values, page_size):
+        params = {list_param: values}
+        queryset = order_salesone_leads(filter_salesone_leads(SalesOneLead.objects.all(), params), params)
+        return list(queryset.values_list('id', flat=True)[:page_size]), queryset.count()
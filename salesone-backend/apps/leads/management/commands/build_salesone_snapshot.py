@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.leads.columnar import build_salesone_snapshot
+import time
+
+
+class Command(BaseCommand):
+    help = 'Build the memory-mapped SalesOneLead snapshot (normally done after each sync)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--directory',
+            type=str,
+            default=None,
+            help='Snapshot directory (defaults to SALESONE_COLUMNAR_DIR)'
+        )
+
+    def handle(self, *args, **options):
+        directory = options['directory'] or settings.SALESONE_COLUMNAR_DIR
+        if not directory:
+            raise CommandError('Set SALESONE_COLUMNAR_DIR or pass --directory')
+
+        start_time = time.time()
+        path = build_salesone_snapshot(directory)
+        self.stdout.write(self.style.SUCCESS(
+            f'SalesOne snapshot written to {path} in {time.time() - start_time:.1f}s'
+        ))
@@ -0,0 +1,87 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.leads.models import SalesOneLead
+from apps.leads.search import filter_salesone_leads, order_salesone_leads
+import json
+
+
+# Representative search_salesone requests, as sent by the search panel.
+CANNED_QUERIES = [
+    ('unfiltered first page', {}),
+    ('region', {'si_nm': '서울특별시', 'sgg_nm': '강남구'}),
+    ('region with email', {'si_nm': '서울특별시', 'sgg_nm': '강남구', 'has_email': 'true'}),
+    ('region with phone', {'si_nm': '경기도', 'has_phone': 'true'}),
+    ('region with homepage', {'si_nm': '경기도', 'sgg_nm': '성남시 분당구', 'has_homepage': 'true'}),
+    ('industry', {'industry': 'J58221'}),
+    ('district multi-select', {'si_nm': '서울특별시', 'sgg_nm__in': '강남구,서초구,송파구'}),
+    ('excluded industries', {'si_nm': '경기도', 'exclude_industry': 'J58221,G47'}),
+    ('industry in region', {'industry': 'J58221', 'si_nm': '경기도', 'sgg_nm': '성남시 분당구'}),
+    ('employee range', {'employee_min': '50', 'employee_max': '300'}),
+    ('revenue range by revenue', {'revenue_range': '1000000000,10000000000', 'sort': '-finance_revenue'}),
+    ('established range', {'established_after': '2015-01-01', 'established_before': '2020-12-31'}),
+    ('company name prefix', {'company_name': '삼성'}),
+    ('company name trigram', {'company_name': '소프트웨어'}),
+    ('full-text search', {'search': '넥스파 금천구'}),
+    ('combined', {
+        'si_nm': '서울특별시', 'industry': 'J58221', 'employee_min': '10',
+        'revenue_range': '100000000,0', 'has_email': 'true',
+    }),
+]
+
+
+class Command(BaseCommand):
+    help = 'Print EXPLAIN plans for representative search_salesone queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run EXPLAIN ANALYZE (executes the queries)'
+        )
+        parser.add_argument(
+            '--shape',
+            action='store_true',
+            help='Print only the plan node/index tree, for diffing in review'
+        )
+        parser.add_argument(
+            '--query',
+            type=str,
+            help='Only explain canned queries whose label contains this text'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=10,
+            help='LIMIT applied to each query, matching the search page size'
+        )
+
+    def handle(self, *args, **options):
+        queries = [
+            (label, params) for label, params in CANNED_QUERIES
+            if not options['query'] or options['query'] in label
+        ]
+        if not queries:
+            raise CommandError(f"No canned query matches '{options['query']}'")
+
+        for label, params in queries:
+            queryset = filter_salesone_leads(SalesOneLead.objects.all(), params)
+            queryset = order_salesone_leads(queryset, params)[:options['page_size']]
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {label} {params}'))
+            if options['shape']:
+                plan = json.loads(queryset.explain(format='json', analyze=options['analyze']))
+                for line in self.plan_shape(plan[0]['Plan']):
+                    self.stdout.write(line)
+            else:
+                self.stdout.write(queryset.explain(analyze=options['analyze']))
+            self.stdout.write('')
+
+    def plan_shape(self, node, depth=0):
+        """Yield one line per plan node with its scan target and index"""
+        line = '  ' * depth + node['Node Type']
+        if 'Index Name' in node:
+            line += f" using {node['Index Name']}"
+        if 'Relation Name' in node:
+            line += f" on {node['Relation Name']}"
+        yield line
+        for child in node.get('Plans', []):
+            yield from self.plan_shape(child, depth + 1)
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.leads.loader import SalesOneLeadLoader
+import os
+
+
+class Command(BaseCommand):
+    help = 'Sync the SalesOne master CSV into SalesOneLead, applying only changed rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'csv_path',
+            nargs='?',
+            default=os.path.join(settings.BASE_DIR, 'insert', 'ultimate.csv'),
+            help='Path to the SalesOne master CSV (defaults to insert/ultimate.csv)'
+        )
+        parser.add_argument(
+            '--keep-missing',
+            action='store_true',
+            help='Keep existing rows whose corporation_number is not in the file'
+        )
+        parser.add_argument(
+            '--manifest',
+            type=str,
+            help='Write the inserted/changed/removed corporation numbers to this JSON file'
+        )
+
+    def handle(self, *args, **options):
+        csv_path = options['csv_path']
+        if not os.path.exists(csv_path):
+            raise CommandError(f'File not found: {csv_path}')
+
+        self.stdout.write(f'Starting SalesOne leads sync from {csv_path}')
+        loader = SalesOneLeadLoader(csv_path, log=self.stdout.write)
+        try:
+            stats = loader.load(
+                keep_missing=options['keep_missing'],
+                manifest_path=options['manifest']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"SalesOne leads sync completed in {stats['duration']:.1f}s: "
+            f"{stats['staged']} staged, {stats['inserted']} inserted, {stats['changed']} changed, "
+            f"{stats['unchanged']} unchanged, {stats['deleted']} deleted"
+        ))
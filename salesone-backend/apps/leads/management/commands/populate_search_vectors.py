@@ -1,14 +1,24 @@
-from django.core.management.base import BaseCommand
-from django.contrib.postgres.search import SearchVector
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models.expressions import RawSQL
 from apps.leads.models import Lead, SalesOneLead
+from apps.leads.pagination import estimate_count
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import json
+import os
+import tempfile
 import time
-import sys
 
 
 class Command(BaseCommand):
     help = 'Populate search vectors for Lead and SalesOneLead models'
 
+    # model option -> (model, SQL function computing the row's search vector)
+    MODELS = {
+        'lead': (Lead, 'leads_lead_search_vector(leads_lead)'),
+        'salesonelead': (SalesOneLead, 'leads_salesonelead_search_vector(leads_salesonelead)'),
+    }
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--model',
@@ -20,102 +30,165 @@ class Command(BaseCommand):
         parser.add_argument(
             '--batch-size',
             type=int,
-            default=1000,
-            help='Number of records to process in each batch'
+            default=10000,
+            help='Number of primary keys covered by each UPDATE statement'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of chunks updated in parallel, each on its own connection'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='rebuild_all',
+            help='Rebuild every row, not only rows whose search_vector is NULL'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue after the last primary key recorded in the checkpoint file'
+        )
+        parser.add_argument(
+            '--checkpoint-dir',
+            type=str,
+            default=tempfile.gettempdir(),
+            help='Directory holding the per-model checkpoint files'
         )
 
     def handle(self, *args, **options):
-        model = options['model']
-        batch_size = options['batch_size']
-        
-        if model in ['lead', 'all']:
-            self.update_lead_search_vectors(batch_size)
-        
-        if model in ['salesonelead', 'all']:
-            self.update_salesone_lead_search_vectors(batch_size)
-            
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--batch-size and --workers must be positive')
+
+        models = ['lead', 'salesonelead'] if options['model'] == 'all' else [options['model']]
+        for name in models:
+            self.rebuild(name, options)
+
         self.stdout.write(self.style.SUCCESS('Search vectors populated successfully'))
 
-    def update_lead_search_vectors(self, batch_size):
-        """Update search vectors for Lead model in batches"""
-        self.stdout.write('Updating Lead search vectors...')
-        
-        # Get leads with null search_vector
-        leads_to_update = Lead.objects.filter(search_vector__isnull=True)
-        total_leads = leads_to_update.count()
-        
-        if total_leads == 0:
-            self.stdout.write('No Lead records need updating')
-            return
-            
-        self.stdout.write(f'Found {total_leads} Lead records to update')
-        
-        # Process in batches
-        offset = 0
-        start_time = time.time()
-        
-        while offset < total_leads:
-            batch = leads_to_update[offset:offset + batch_size]
-            
-            # Update each lead in the batch
-            with transaction.atomic():
-                for lead in batch:
-                    Lead.objects.filter(id=lead.id).update(search_vector=
-                        SearchVector('name', weight='A') +
-                        SearchVector('owner', weight='B') +
-                        SearchVector('corporation_number', weight='A') +
-                        SearchVector('business_number', weight='B') +
-                        SearchVector('address', weight='C') +
-                        SearchVector('si_nm', weight='C') +
-                        SearchVector('sgg_nm', weight='C')
-                    )
-            
-            # Update progress
-            offset += batch_size
-            progress = min(offset, total_leads) / total_leads * 100
-            elapsed_time = time.time() - start_time
-            self.stdout.write(f'Progress: {progress:.1f}% ({min(offset, total_leads)}/{total_leads}) - Time elapsed: {elapsed_time:.1f}s')
-            sys.stdout.flush()
-    
-    def update_salesone_lead_search_vectors(self, batch_size):
-        """Update search vectors for SalesOneLead model in batches"""
-        self.stdout.write('Updating SalesOneLead search vectors...')
-        
-        # Get leads with null search_vector
-        leads_to_update = SalesOneLead.objects.filter(search_vector__isnull=True)
-        total_leads = leads_to_update.count()
-        
-        if total_leads == 0:
-            self.stdout.write('No SalesOneLead records need updating')
-            return
-            
-        self.stdout.write(f'Found {total_leads} SalesOneLead records to update')
-        
-        # Process in batches
-        offset = 0
+    def rebuild(self, name, options):
+        """
+        Rebuild search vectors for one model in primary-key ordered chunks.
+
+        Each chunk is a single ``UPDATE ... WHERE id > lo AND id <= hi``; chunk
+        bounds come from an index-only walk of the primary key, so they work
+        for both integer and UUID keys. The checkpoint records the highest key
+        below which every chunk has committed.
+        """
+        model, function = self.MODELS[name]
+        batch_size = options['batch_size']
+        checkpoint_path = os.path.join(options['checkpoint_dir'], f'populate_search_vectors.{name}.json')
+
+        queryset = model.objects.all()
+        if not options['rebuild_all']:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        start_after = None
+        if options['resume']:
+            start_after = self.read_checkpoint(checkpoint_path, model)
+            if start_after is not None:
+                self.stdout.write(f'Resuming {model.__name__} after id {start_after}')
+
+        remaining = queryset if start_after is None else queryset.filter(id__gt=start_after)
+        estimated_total = estimate_count(remaining)
+        self.stdout.write(f'Updating {model.__name__} search vectors (~{estimated_total} rows)...')
+
+        updated_rows = 0
         start_time = time.time()
-        
-        while offset < total_leads:
-            batch = leads_to_update[offset:offset + batch_size]
-            
-            # Update each lead in the batch
-            with transaction.atomic():
-                for lead in batch:
-                    SalesOneLead.objects.filter(id=lead.id).update(search_vector=
-                        SearchVector('name', weight='A') +
-                        SearchVector('name_eng', weight='B') +
-                        SearchVector('owner', weight='B') +
-                        SearchVector('corporation_number', weight='A') +
-                        SearchVector('business_number', weight='B') +
-                        SearchVector('address', weight='C') +
-                        SearchVector('si_nm', weight='C') +
-                        SearchVector('sgg_nm', weight='C') +
-                        SearchVector('industry_name', weight='B')
-                    )
-            
-            # Update progress
-            offset += batch_size
-            progress = min(offset, total_leads) / total_leads * 100
-            elapsed_time = time.time() - start_time
-            self.stdout.write(f'Progress: {progress:.1f}% ({min(offset, total_leads)}/{total_leads}) - Time elapsed: {elapsed_time:.1f}s')
-            sys.stdout.flush() 
\ No newline at end of file
+        # chunk index -> upper bound, for every chunk not yet covered by the checkpoint
+        pending_bounds = {}
+        completed = set()
+        next_to_checkpoint = 0
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            in_flight = set()
+            chunks = enumerate(self.chunk_bounds(model, start_after, batch_size))
+            exhausted = False
+
+            while in_flight or not exhausted:
+                # Keep a bounded number of chunks queued ahead of the workers
+                while not exhausted and len(in_flight) < options['workers'] * 2:
+                    try:
+                        index, (low, high) = next(chunks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending_bounds[index] = high
+                    future = executor.submit(self.update_chunk, queryset, function, low, high)
+                    future.chunk_index = index
+                    in_flight.add(future)
+
+                if not in_flight:
+                    break
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    updated_rows += future.result()
+                    completed.add(future.chunk_index)
+
+                # Advance the checkpoint over the contiguous run of finished chunks
+                last_high = None
+                while next_to_checkpoint in completed:
+                    completed.discard(next_to_checkpoint)
+                    last_high = pending_bounds.pop(next_to_checkpoint)
+                    next_to_checkpoint += 1
+                if last_high is not None:
+                    self.write_checkpoint(checkpoint_path, last_high)
+
+                elapsed_time = time.time() - start_time
+                rate = updated_rows / elapsed_time if elapsed_time else 0
+                progress = min(updated_rows / estimated_total * 100, 100) if estimated_total else 100
+                self.stdout.write(
+                    f'Progress: ~{progress:.1f}% ({updated_rows} rows) - '
+                    f'{rate:,.0f} rows/sec - Time elapsed: {elapsed_time:.1f}s'
+                )
+                self.stdout.flush()
+
+        elapsed_time = time.time() - start_time
+        rate = updated_rows / elapsed_time if elapsed_time else 0
+        self.stdout.write(
+            f'Updated {updated_rows} {model.__name__} rows in {elapsed_time:.1f}s ({rate:,.0f} rows/sec)'
+        )
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    def chunk_bounds(self, model, start_after, batch_size):
+        """Yield (low, high] primary key bounds covering batch_size rows each"""
+        low = start_after
+        while True:
+            ids = model.objects.order_by('id').values_list('id', flat=True)
+            if low is not None:
+                ids = ids.filter(id__gt=low)
+            high = ids[batch_size - 1:batch_size].first()
+            if high is None:
+                high = ids.order_by('-id').first()
+                if high is not None:
+                    yield low, high
+                return
+            yield low, high
+            low = high
+
+    def update_chunk(self, queryset, function, low, high):
+        """Run one set-based UPDATE for the (low, high] key range in a worker thread"""
+        try:
+            chunk = queryset.filter(id__lte=high)
+            if low is not None:
+                chunk = chunk.filter(id__gt=low)
+            return chunk.update(search_vector=RawSQL(function, []))
+        finally:
+            # Worker threads own their connections; release them per chunk
+            connections.close_all()
+
+    def read_checkpoint(self, path, model):
+        if not os.path.exists(path):
+            return None
+        with open(path) as checkpoint:
+            last_id = json.load(checkpoint)['last_id']
+        return model._meta.pk.to_python(last_id)
+
+    def write_checkpoint(self, path, last_id):
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as checkpoint:
+            json.dump({'last_id': str(last_id)}, checkpoint)
+        os.replace(temp_path, path)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from apps.leads.rollups import rebuild_salesone_rollups
+import time
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the SalesOneLead rollup tables (normally done after each sync)'
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+        rebuild_salesone_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f'SalesOne rollups rebuilt in {time.time() - start_time:.1f}s'
+        ))
@@ -0,0 +1,149 @@
+from django.db import connection
+from .models import LeadList
+
+
+def selection_sql(leads):
+    """Return (sql, params) selecting the ids of a Lead queryset."""
+    return leads.order_by().values('id').query.sql_with_params()
+
+
+def add_to_lead_list(lead_list, leads):
+    """
+    Add the leads of a queryset to a lead list in one statement.
+
+    Runs ``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` on the membership
+    table, so neither the existing members nor the selected ids are loaded.
+    Only leads owned by the list's user are added, whatever the queryset
+    selects.
+
+    Args:
+        lead_list: LeadList receiving the leads
+        leads: Lead queryset selecting the leads to add
+
+    Returns:
+        int: Number of leads that were not members before
+    """
+    through = LeadList.leads.through._meta.db_table
+    selection, params = selection_sql(leads.filter(user_id=lead_list.user_id))
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO {through} (leadlist_id, lead_id)
+            SELECT %s, selected.id FROM ({selection}) selected
+            ON CONFLICT (leadlist_id, lead_id) DO NOTHING
+        """, [lead_list.id, *params])
+        return cursor.rowcount
+
+
+def remove_from_lead_list(lead_list, leads):
+    """
+    Remove the leads of a queryset from a lead list in one statement.
+
+    Runs ``DELETE ... USING`` the selection against the membership table.
+
+    Args:
+        lead_list: LeadList losing the leads
+        leads: Lead queryset selecting the leads to remove
+
+    Returns:
+        int: Number of leads that were members
+    """
+    through = LeadList.leads.through._meta.db_table
+    selection, params = selection_sql(leads.filter(user_id=lead_list.user_id))
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            DELETE FROM {through} member
+            USING ({selection}) selected
+            WHERE member.leadlist_id = %s AND member.lead_id = selected.id
+        """, [*params, lead_list.id])
+        return cursor.rowcount
+
+
+SET_OPERATIONS = ('union', 'intersection', 'difference')
+
+
+def member_groups_sql(lead_list_ids):
+    """
+    Return (sql, params) grouping the members of several lists by lead.
+
+    Each row is a lead with the number of the lists it belongs to and
+    whether the first list is the only one, read in one pass over the
+    membership table.
+    """
+    through = LeadList.leads.through._meta.db_table
+    sql = f"""
+        SELECT lead_id, count(*) AS lists, bool_and(leadlist_id = %s) AS only_first
+        FROM {through}
+        WHERE leadlist_id = ANY(%s::uuid[])
+        GROUP BY lead_id
+    """
+    return sql, [lead_list_ids[0], list(lead_list_ids)]
+
+
+def combination_sql(operation, lead_list_ids):
+    """
+    Return (sql, params) selecting the lead ids of a set operation over lists.
+
+    ``union`` is every member of any list, ``intersection`` the members of
+    all of them, and ``difference`` the members of the first list that are
+    in none of the others.
+    """
+    if operation not in SET_OPERATIONS:
+        raise ValueError(f'Unknown set operation: {operation}')
+    groups, params = member_groups_sql(lead_list_ids)
+    if operation == 'union':
+        condition = 'true'
+    elif operation == 'intersection':
+        condition, params = 'groups.lists = %s', [*params, len(lead_list_ids)]
+    else:
+        condition = 'groups.only_first'
+    return f'SELECT groups.lead_id FROM ({groups}) groups WHERE {condition}', params
+
+
+def preview_combination(lead_list_ids):
+    """
+    Count the results of every set operation over lists without creating one.
+
+    Returns:
+        dict: total_members (with duplicates), duplicates, and the size of
+              the union, intersection and difference
+    """
+    groups, params = member_groups_sql(lead_list_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT
+                coalesce(sum(groups.lists), 0),
+                count(*),
+                count(*) FILTER (WHERE groups.lists = %s),
+                count(*) FILTER (WHERE groups.only_first)
+            FROM ({groups}) groups
+        """, [len(lead_list_ids), *params])
+        total, union, intersection, difference = cursor.fetchone()
+    return {
+        'total_members': int(total),
+        'duplicates': int(total) - union,
+        'union': union,
+        'intersection': intersection,
+        'difference': difference,
+    }
+
+
+def add_combination_to_lead_list(lead_list, operation, lead_list_ids):
+    """
+    Fill a lead list with the result of a set operation over other lists.
+
+    The grouped member ids are inserted straight into the membership table
+    without joining Lead, so the source lists must belong to the receiving
+    list's user; their members are then the user's leads already.
+
+    Returns:
+        int: Number of leads added
+    """
+    through = LeadList.leads.through._meta.db_table
+    selection, params = combination_sql(operation, lead_list_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO {through} (leadlist_id, lead_id)
+            SELECT %s, selected.lead_id FROM ({selection}) selected
+            ON CONFLICT (leadlist_id, lead_id) DO NOTHING
+        """, [lead_list.id, *params])
+        return cursor.rowcount
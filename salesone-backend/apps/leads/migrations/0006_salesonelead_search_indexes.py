@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:54
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Build the indexes without locking the 5M-row table against writes
+    atomic = False
+
+    dependencies = [
+        ('leads', '0005_remove_lead_search_vector_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=models.Index(fields=['si_nm', 'sgg_nm', 'id'], name='salesone_region_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=models.Index(fields=['industry', 'si_nm', 'sgg_nm'], name='salesone_industry_region_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=models.Index(fields=['employee', 'id'], name='salesone_employee_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=models.Index(fields=['finance_revenue', 'id'], name='salesone_revenue_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=models.Index(fields=['established_date', 'id'], name='salesone_established_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=models.Index(fields=['name', 'id'], name='salesone_name_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=models.Index(condition=models.Q(('email__gt', '')), fields=['si_nm', 'sgg_nm', 'id'], name='salesone_region_email_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=models.Index(condition=models.Q(('phone__gt', '')), fields=['si_nm', 'sgg_nm', 'id'], name='salesone_region_phone_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=models.Index(condition=models.Q(('homepage__isnull', False), models.Q(('homepage', []), _negated=True)), fields=['si_nm', 'sgg_nm', 'id'], name='salesone_region_homepage_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:57
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('leads', '0006_salesonelead_search_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='salesone_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name_eng'], name='salesone_name_eng_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+# Hangul has no word segmentation in the 'simple' config, so Hangul runs are
+# also indexed as overlapping bigrams ("넥스파시스템" -> "넥스 스파 파시 시스 스템").
+SEARCH_TSVECTOR_SQL = """
+CREATE OR REPLACE FUNCTION leads_hangul_bigrams(value text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT coalesce(string_agg(substr(word, i, 2), ' '), '')
+    FROM regexp_split_to_table(coalesce(value, ''), '[^가-힣]+') AS word,
+         generate_series(1, char_length(word) - 1) AS i
+$$;
+
+CREATE OR REPLACE FUNCTION leads_search_tsvector(value text, weight "char") RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT setweight(to_tsvector('simple', coalesce(value, '') || ' ' || leads_hangul_bigrams(value)), weight)
+$$;
+"""
+
+SEARCH_TSVECTOR_REVERSE_SQL = """
+DROP FUNCTION IF EXISTS leads_search_tsvector(text, "char");
+DROP FUNCTION IF EXISTS leads_hangul_bigrams(text);
+"""
+
+LEAD_SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION leads_lead_search_vector(r leads_lead) RETURNS tsvector
+LANGUAGE sql STABLE PARALLEL SAFE AS $$
+    SELECT
+        leads_search_tsvector(r.name, 'A') ||
+        leads_search_tsvector(r.corporation_number, 'A') ||
+        leads_search_tsvector(r.owner, 'B') ||
+        leads_search_tsvector(r.business_number, 'B') ||
+        leads_search_tsvector(r.address, 'C') ||
+        leads_search_tsvector(r.si_nm, 'C') ||
+        leads_search_tsvector(r.sgg_nm, 'C')
+$$;
+
+CREATE OR REPLACE FUNCTION leads_lead_search_vector_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := leads_lead_search_vector(NEW);
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER leads_lead_search_vector_update
+BEFORE INSERT OR UPDATE OF name, corporation_number, owner, business_number, address, si_nm, sgg_nm
+ON leads_lead
+FOR EACH ROW EXECUTE FUNCTION leads_lead_search_vector_trigger();
+"""
+
+LEAD_SEARCH_VECTOR_REVERSE_SQL = """
+DROP TRIGGER IF EXISTS leads_lead_search_vector_update ON leads_lead;
+DROP FUNCTION IF EXISTS leads_lead_search_vector_trigger();
+DROP FUNCTION IF EXISTS leads_lead_search_vector(leads_lead);
+"""
+
+SALESONE_SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION leads_salesonelead_search_vector(r leads_salesonelead) RETURNS tsvector
+LANGUAGE sql STABLE PARALLEL SAFE AS $$
+    SELECT
+        leads_search_tsvector(r.name, 'A') ||
+        leads_search_tsvector(r.corporation_number, 'A') ||
+        leads_search_tsvector(r.name_eng, 'B') ||
+        leads_search_tsvector(r.owner, 'B') ||
+        leads_search_tsvector(r.business_number, 'B') ||
+        leads_search_tsvector(r.industry_name, 'B') ||
+        leads_search_tsvector(r.address, 'C') ||
+        leads_search_tsvector(r.si_nm, 'C') ||
+        leads_search_tsvector(r.sgg_nm, 'C')
+$$;
+
+CREATE OR REPLACE FUNCTION leads_salesonelead_search_vector_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := leads_salesonelead_search_vector(NEW);
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER leads_salesonelead_search_vector_update
+BEFORE INSERT OR UPDATE OF name, corporation_number, name_eng, owner, business_number, industry_name, address, si_nm, sgg_nm
+ON leads_salesonelead
+FOR EACH ROW EXECUTE FUNCTION leads_salesonelead_search_vector_trigger();
+"""
+
+SALESONE_SEARCH_VECTOR_REVERSE_SQL = """
+DROP TRIGGER IF EXISTS leads_salesonelead_search_vector_update ON leads_salesonelead;
+DROP FUNCTION IF EXISTS leads_salesonelead_search_vector_trigger();
+DROP FUNCTION IF EXISTS leads_salesonelead_search_vector(leads_salesonelead);
+"""
+
+
+class Migration(migrations.Migration):
+
+    # New and edited rows get their vector from the triggers. Existing rows are
+    # backfilled with `manage.py populate_search_vectors` after deploying.
+    atomic = False
+
+    dependencies = [
+        ('leads', '0007_salesonelead_name_trigram'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='salesonelead',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_TSVECTOR_SQL, SEARCH_TSVECTOR_REVERSE_SQL),
+        migrations.RunSQL(LEAD_SEARCH_VECTOR_SQL, LEAD_SEARCH_VECTOR_REVERSE_SQL),
+        migrations.RunSQL(SALESONE_SEARCH_VECTOR_SQL, SALESONE_SEARCH_VECTOR_REVERSE_SQL),
+        AddIndexConcurrently(
+            model_name='lead',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='lead_search_vector_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='salesonelead',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='salesone_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0008_search_vector_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salesonelead',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True),
+        ),
+    ]
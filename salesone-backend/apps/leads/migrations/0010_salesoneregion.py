@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:16
+
+from django.db import migrations, models
+
+
+# Initial fill; later rebuilds run after each sync (apps/leads/rollups.py)
+POPULATE_REGIONS_SQL = """
+INSERT INTO leads_salesoneregion (si_nm, sgg_nm, lead_count)
+SELECT si_nm, nullif(sgg_nm, ''), count(*)
+FROM leads_salesonelead
+WHERE si_nm IS NOT NULL AND si_nm <> ''
+GROUP BY si_nm, nullif(sgg_nm, '')
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0009_salesonelead_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesOneRegion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('si_nm', models.CharField(max_length=50, verbose_name='City/Province')),
+                ('sgg_nm', models.CharField(blank=True, max_length=50, null=True, verbose_name='District')),
+                ('lead_count', models.IntegerField(default=0, verbose_name='Number of Leads')),
+            ],
+            options={
+                'verbose_name': 'SalesOne Region',
+                'verbose_name_plural': 'SalesOne Regions',
+                'ordering': ['si_nm', 'sgg_nm'],
+            },
+        ),
+        migrations.RunSQL(POPULATE_REGIONS_SQL, migrations.RunSQL.noop),
+    ]
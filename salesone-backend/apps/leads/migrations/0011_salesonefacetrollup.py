@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Initial fill with the buckets of apps/leads/rollups.py; later rebuilds run
+# after each sync
+POPULATE_FACETS_SQL = """
+INSERT INTO leads_salesonefacetrollup
+    (si_nm, sgg_nm, industry_id, employee_bucket, revenue_bucket, lead_count)
+SELECT
+    si_nm,
+    sgg_nm,
+    industry_id,
+    CASE
+        WHEN employee < 10 THEN '1-9'
+        WHEN employee >= 10 AND employee < 50 THEN '10-49'
+        WHEN employee >= 50 AND employee < 100 THEN '50-99'
+        WHEN employee >= 100 AND employee < 300 THEN '100-299'
+        WHEN employee >= 300 AND employee < 1000 THEN '300-999'
+        WHEN employee >= 1000 THEN '1000+'
+        ELSE 'unknown'
+    END AS employee_bucket,
+    CASE
+        WHEN finance_revenue < 1000000000 THEN '0-1b'
+        WHEN finance_revenue >= 1000000000 AND finance_revenue < 10000000000 THEN '1b-10b'
+        WHEN finance_revenue >= 10000000000 AND finance_revenue < 100000000000 THEN '10b-100b'
+        WHEN finance_revenue >= 100000000000 THEN '100b+'
+        ELSE 'unknown'
+    END AS revenue_bucket,
+    count(*)
+FROM leads_salesonelead
+GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0010_salesoneregion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesOneFacetRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('si_nm', models.CharField(blank=True, max_length=50, null=True, verbose_name='City/Province')),
+                ('sgg_nm', models.CharField(blank=True, max_length=50, null=True, verbose_name='District')),
+                ('employee_bucket', models.CharField(max_length=20)),
+                ('revenue_bucket', models.CharField(max_length=20)),
+                ('lead_count', models.IntegerField(default=0, verbose_name='Number of Leads')),
+                ('industry', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='leads.industry')),
+            ],
+            options={
+                'verbose_name': 'SalesOne Facet Rollup',
+                'verbose_name_plural': 'SalesOne Facet Rollups',
+                'indexes': [models.Index(fields=['si_nm', 'sgg_nm'], name='salesone_facet_region_idx')],
+            },
+        ),
+        migrations.RunSQL(POPULATE_FACETS_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:36
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0011_salesonefacetrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadExportTask',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('task_id', models.CharField(max_length=50, unique=True, verbose_name='Celery Task ID')),
+                ('file_name', models.CharField(max_length=255, verbose_name='Download File Name')),
+                ('file_type', models.CharField(max_length=10, verbose_name='File Type')),
+                ('source', models.CharField(choices=[('lead_list', 'Lead List'), ('salesone', 'SalesOne Search')], max_length=20)),
+                ('params', models.JSONField(blank=True, null=True, verbose_name='Search Parameters')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('total_records', models.IntegerField(default=0, verbose_name='Total Records')),
+                ('exported_records', models.IntegerField(default=0, verbose_name='Exported Records')),
+                ('file', models.FileField(blank=True, null=True, upload_to='lead_exports/')),
+                ('errors', models.JSONField(blank=True, null=True, verbose_name='Error Details')),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('lead_list', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_tasks', to='leads.leadlist')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lead_export_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Lead Export Task',
+                'verbose_name_plural': 'Lead Export Tasks',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:45
+
+from django.db import migrations, models
+
+
+# Statement-level triggers keep leads_count in step with every write to the
+# membership table (add/remove, bulk_create from imports, cascades from
+# deleted leads), one UPDATE per affected list per statement.
+LEADS_COUNT_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION leads_leadlist_leads_count_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE leads_leadlist l SET leads_count = l.leads_count - removed.count
+        FROM (SELECT leadlist_id, count(*) AS count FROM old_rows GROUP BY leadlist_id) removed
+        WHERE l.id = removed.leadlist_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE leads_leadlist l SET leads_count = l.leads_count + added.count
+        FROM (SELECT leadlist_id, count(*) AS count FROM new_rows GROUP BY leadlist_id) added
+        WHERE l.id = added.leadlist_id;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER leads_leadlist_leads_count_insert
+AFTER INSERT ON leads_leadlist_leads
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION leads_leadlist_leads_count_trigger();
+
+CREATE TRIGGER leads_leadlist_leads_count_delete
+AFTER DELETE ON leads_leadlist_leads
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION leads_leadlist_leads_count_trigger();
+
+CREATE TRIGGER leads_leadlist_leads_count_update
+AFTER UPDATE ON leads_leadlist_leads
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION leads_leadlist_leads_count_trigger();
+"""
+
+LEADS_COUNT_TRIGGERS_REVERSE_SQL = """
+DROP TRIGGER IF EXISTS leads_leadlist_leads_count_insert ON leads_leadlist_leads;
+DROP TRIGGER IF EXISTS leads_leadlist_leads_count_delete ON leads_leadlist_leads;
+DROP TRIGGER IF EXISTS leads_leadlist_leads_count_update ON leads_leadlist_leads;
+DROP FUNCTION IF EXISTS leads_leadlist_leads_count_trigger();
+"""
+
+POPULATE_LEADS_COUNT_SQL = """
+UPDATE leads_leadlist l SET leads_count = members.count
+FROM (SELECT leadlist_id, count(*) AS count FROM leads_leadlist_leads GROUP BY leadlist_id) members
+WHERE l.id = members.leadlist_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0012_leadexporttask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leadlist',
+            name='leads_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Number of Leads'),
+        ),
+        migrations.RunSQL(LEADS_COUNT_TRIGGERS_SQL, LEADS_COUNT_TRIGGERS_REVERSE_SQL),
+        migrations.RunSQL(POPULATE_LEADS_COUNT_SQL, migrations.RunSQL.noop),
+    ]
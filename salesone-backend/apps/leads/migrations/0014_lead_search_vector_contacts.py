@@ -0,0 +1,65 @@
+from django.db import migrations
+
+
+# Adds email and phone to the Lead search vector, so lead list member search
+# can use it. Punctuation is split out so that "nexpa.co.kr" or "02-1234"
+# match word by word; phone numbers are also indexed as a single run of
+# digits.
+LEAD_SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION leads_lead_search_vector(r leads_lead) RETURNS tsvector
+LANGUAGE sql STABLE PARALLEL SAFE AS $$
+    SELECT
+        leads_search_tsvector(r.name, 'A') ||
+        leads_search_tsvector(r.corporation_number, 'A') ||
+        leads_search_tsvector(r.owner, 'B') ||
+        leads_search_tsvector(r.business_number, 'B') ||
+        leads_search_tsvector(regexp_replace(r.email, '[^[:alnum:]]+', ' ', 'g'), 'B') ||
+        leads_search_tsvector(
+            regexp_replace(r.phone, '[^0-9]+', ' ', 'g') || ' ' || regexp_replace(r.phone, '[^0-9]+', '', 'g'),
+            'B'
+        ) ||
+        leads_search_tsvector(r.address, 'C') ||
+        leads_search_tsvector(r.si_nm, 'C') ||
+        leads_search_tsvector(r.sgg_nm, 'C')
+$$;
+
+DROP TRIGGER IF EXISTS leads_lead_search_vector_update ON leads_lead;
+CREATE TRIGGER leads_lead_search_vector_update
+BEFORE INSERT OR UPDATE OF name, corporation_number, owner, business_number, email, phone, address, si_nm, sgg_nm
+ON leads_lead
+FOR EACH ROW EXECUTE FUNCTION leads_lead_search_vector_trigger();
+"""
+
+LEAD_SEARCH_VECTOR_REVERSE_SQL = """
+CREATE OR REPLACE FUNCTION leads_lead_search_vector(r leads_lead) RETURNS tsvector
+LANGUAGE sql STABLE PARALLEL SAFE AS $$
+    SELECT
+        leads_search_tsvector(r.name, 'A') ||
+        leads_search_tsvector(r.corporation_number, 'A') ||
+        leads_search_tsvector(r.owner, 'B') ||
+        leads_search_tsvector(r.business_number, 'B') ||
+        leads_search_tsvector(r.address, 'C') ||
+        leads_search_tsvector(r.si_nm, 'C') ||
+        leads_search_tsvector(r.sgg_nm, 'C')
+$$;
+
+DROP TRIGGER IF EXISTS leads_lead_search_vector_update ON leads_lead;
+CREATE TRIGGER leads_lead_search_vector_update
+BEFORE INSERT OR UPDATE OF name, corporation_number, owner, business_number, address, si_nm, sgg_nm
+ON leads_lead
+FOR EACH ROW EXECUTE FUNCTION leads_lead_search_vector_trigger();
+"""
+
+
+class Migration(migrations.Migration):
+
+    # Existing leads keep their old vector until
+    # `manage.py populate_search_vectors --model lead --all` is run after deploying.
+
+    dependencies = [
+        ('leads', '0013_leadlist_leads_count'),
+    ]
+
+    operations = [
+        migrations.RunSQL(LEAD_SEARCH_VECTOR_SQL, LEAD_SEARCH_VECTOR_REVERSE_SQL),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:10
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0014_lead_search_vector_contacts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadDedupTask',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('task_id', models.CharField(max_length=50, unique=True, verbose_name='Celery Task ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('total_records', models.IntegerField(default=0, verbose_name='Scanned Leads')),
+                ('duplicate_records', models.IntegerField(default=0, verbose_name='Merge Proposals')),
+                ('errors', models.JSONField(blank=True, null=True, verbose_name='Error Details')),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lead_dedup_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Lead Dedup Task',
+                'verbose_name_plural': 'Lead Dedup Tasks',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LeadDuplicate',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('score', models.FloatField(verbose_name='Name Similarity')),
+                ('matched_on', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=20), size=None, verbose_name='Matched On')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('dismissed', 'Dismissed')], default='pending', max_length=20)),
+                ('duplicate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='leads.lead')),
+                ('lead', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_proposals', to='leads.lead')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lead_duplicates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Lead Duplicate',
+                'verbose_name_plural': 'Lead Duplicates',
+                'ordering': ['-score', 'id'],
+                'indexes': [models.Index(fields=['user', 'status', '-score'], name='lead_duplicate_user_idx')],
+                'unique_together': {('lead', 'duplicate')},
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:21
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0015_leaddeduptask_leadduplicate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leadimporttask',
+            name='file_path',
+            field=models.CharField(blank=True, max_length=500, null=True, verbose_name='Uploaded File Path'),
+        ),
+        migrations.AddField(
+            model_name='leadimporttask',
+            name='options',
+            field=models.JSONField(blank=True, null=True, verbose_name='Import Options'),
+        ),
+        migrations.CreateModel(
+            name='LeadImportShard',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('index', models.IntegerField(verbose_name='Shard Index')),
+                ('start_byte', models.BigIntegerField(verbose_name='Start Byte')),
+                ('end_byte', models.BigIntegerField(verbose_name='End Byte')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('total_records', models.IntegerField(default=0, verbose_name='Total Records')),
+                ('processed_records', models.IntegerField(default=0, verbose_name='Processed Records')),
+                ('imported_records', models.IntegerField(default=0, verbose_name='Imported Records')),
+                ('error_records', models.IntegerField(default=0, verbose_name='Error Records')),
+                ('errors', models.JSONField(blank=True, null=True, verbose_name='Error Details')),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('import_task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shards', to='leads.leadimporttask')),
+            ],
+            options={
+                'verbose_name': 'Lead Import Shard',
+                'verbose_name_plural': 'Lead Import Shards',
+                'ordering': ['index'],
+                'unique_together': {('import_task', 'index')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0016_leadimportshard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leadimporttask',
+            name='existing_records',
+            field=models.IntegerField(default=0, verbose_name='Existing Records'),
+        ),
+    ]
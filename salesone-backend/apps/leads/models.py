@@ -1,11 +1,11 @@
 import uuid
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.search import SearchVectorField, SearchVector
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
-from django.dispatch import receiver
 from apps.common.models import BaseModel
 
 User = get_user_model()
@@ -37,6 +37,13 @@ class Keyword(models.Model):
         return self.name
 
 
+# Contact-info predicates shared by the search filters and the partial indexes
+# below. They must stay textually identical for the planner to use the indexes.
+SALESONE_HAS_EMAIL = Q(email__gt='')
+SALESONE_HAS_PHONE = Q(phone__gt='')
+SALESONE_HAS_HOMEPAGE = Q(homepage__isnull=False) & ~Q(homepage=[])
+
+
 class SalesOneLead(models.Model):
     """
     Global lead database not linked to specific workspaces.
@@ -79,11 +86,85 @@ class SalesOneLead(models.Model):
     description = models.TextField(null=True, blank=True)
     keywords = models.ManyToManyField(Keyword, related_name='ultimatedb', blank=True)
     scraped_bizinfo = models.BooleanField(default=False)
+    # Maintained by a database trigger, see migration 0008
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    # md5 of the loaded columns, maintained by SalesOneLeadLoader for delta syncs
+    content_hash = models.CharField(max_length=32, null=True, blank=True, editable=False)
+    
+    class Meta:
+        # Built from the filter combinations search_salesone emits. The trailing
+        # id column lets keyset pagination walk each index in order.
+        indexes = [
+            models.Index(fields=['si_nm', 'sgg_nm', 'id'], name='salesone_region_idx'),
+            models.Index(fields=['industry', 'si_nm', 'sgg_nm'], name='salesone_industry_region_idx'),
+            models.Index(fields=['employee', 'id'], name='salesone_employee_idx'),
+            models.Index(fields=['finance_revenue', 'id'], name='salesone_revenue_idx'),
+            models.Index(fields=['established_date', 'id'], name='salesone_established_idx'),
+            models.Index(fields=['name', 'id'], name='salesone_name_idx'),
+            models.Index(
+                fields=['si_nm', 'sgg_nm', 'id'],
+                condition=SALESONE_HAS_EMAIL,
+                name='salesone_region_email_idx'
+            ),
+            models.Index(
+                fields=['si_nm', 'sgg_nm', 'id'],
+                condition=SALESONE_HAS_PHONE,
+                name='salesone_region_phone_idx'
+            ),
+            models.Index(
+                fields=['si_nm', 'sgg_nm', 'id'],
+                condition=SALESONE_HAS_HOMEPAGE,
+                name='salesone_region_homepage_idx'
+            ),
+            # Trigram indexes serve ILIKE '%...%' and word-similarity name search
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='salesone_name_trgm_idx'),
+            GinIndex(fields=['name_eng'], opclasses=['gin_trgm_ops'], name='salesone_name_eng_trgm_idx'),
+            GinIndex(fields=['search_vector'], name='salesone_search_vector_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.corporation_number})"
 
 
+class SalesOneRegion(models.Model):
+    """
+    Materialized si_nm -> sgg_nm hierarchy of SalesOneLead with lead counts.
+    Rebuilt from SalesOneLead after every SalesOne sync, see rollups.py.
+    """
+    si_nm = models.CharField(max_length=50, verbose_name=_('City/Province'))
+    sgg_nm = models.CharField(max_length=50, null=True, blank=True, verbose_name=_('District'))
+    lead_count = models.IntegerField(default=0, verbose_name=_('Number of Leads'))
+
+    class Meta:
+        ordering = ['si_nm', 'sgg_nm']
+        verbose_name = _('SalesOne Region')
+        verbose_name_plural = _('SalesOne Regions')
+
+    def __str__(self):
+        return f"{self.si_nm} {self.sgg_nm or ''}".strip()
+
+
+class SalesOneFacetRollup(models.Model):
+    """
+    Pre-aggregated SalesOneLead counts per region, industry, employee bucket
+    and revenue bucket, serving search panel facets for unfiltered and
+    lightly filtered searches. Rebuilt with SalesOneRegion, see rollups.py.
+    """
+    si_nm = models.CharField(max_length=50, null=True, blank=True, verbose_name=_('City/Province'))
+    sgg_nm = models.CharField(max_length=50, null=True, blank=True, verbose_name=_('District'))
+    industry = models.ForeignKey(Industry, on_delete=models.SET_NULL, null=True, related_name='+')
+    employee_bucket = models.CharField(max_length=20)
+    revenue_bucket = models.CharField(max_length=20)
+    lead_count = models.IntegerField(default=0, verbose_name=_('Number of Leads'))
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['si_nm', 'sgg_nm'], name='salesone_facet_region_idx'),
+        ]
+        verbose_name = _('SalesOne Facet Rollup')
+        verbose_name_plural = _('SalesOne Facet Rollups')
+
+
 class Lead(BaseModel):
     """
     User's leads that can be added to lead lists and used in campaigns.
@@ -104,9 +185,14 @@ class Lead(BaseModel):
     established_date = models.DateField(null=True, blank=True)
     industry = models.ForeignKey(Industry, on_delete=models.SET_NULL, null=True, related_name='leads')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leads')
+    # Maintained by a database trigger, see migration 0008
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
     
     class Meta:
         unique_together = ('corporation_number', 'user')
+        indexes = [
+            GinIndex(fields=['search_vector'], name='lead_search_vector_idx'),
+        ]
         
     def __str__(self):
         return f"{self.name} ({self.corporation_number})"
@@ -120,10 +206,22 @@ class LeadList(BaseModel):
     description = models.TextField(null=True, blank=True)
     leads = models.ManyToManyField(Lead, related_name='lead_lists', blank=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lead_lists')
+    # Maintained by database triggers on the membership table, see migration 0013
+    leads_count = models.IntegerField(default=0, editable=False, verbose_name=_('Number of Leads'))
     
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # leads_count is owned by the membership triggers; never write back a
+        # copy that may have gone stale since the instance was loaded
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'leads_count'
+            ]
+        super().save(*args, **kwargs)
+
 
 class LeadImportTask(BaseModel):
     """
@@ -143,10 +241,15 @@ class LeadImportTask(BaseModel):
     total_records = models.IntegerField(default=0, verbose_name=_('Total Records'))
     imported_records = models.IntegerField(default=0, verbose_name=_('Imported Records'))
     error_records = models.IntegerField(default=0, verbose_name=_('Error Records'))
+    # Leads the user already had, linked to the list but not imported again
+    existing_records = models.IntegerField(default=0, verbose_name=_('Existing Records'))
     errors = models.JSONField(null=True, blank=True, verbose_name=_('Error Details'))
     lead_list = models.ForeignKey(LeadList, on_delete=models.SET_NULL, null=True, blank=True, related_name='import_tasks')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lead_import_tasks')
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Kept for sharded imports, whose shards may be retried after the upload
+    file_path = models.CharField(max_length=500, null=True, blank=True, verbose_name=_('Uploaded File Path'))
+    options = models.JSONField(null=True, blank=True, verbose_name=_('Import Options'))
     
     def __str__(self):
         return f"Import {self.task_id} ({self.status})"
@@ -155,3 +258,126 @@ class LeadImportTask(BaseModel):
         ordering = ['-created_at']
         verbose_name = _('Lead Import Task')
         verbose_name_plural = _('Lead Import Tasks')
+
+
+class LeadImportShard(BaseModel):
+    """
+    One byte range of a large CSV import, processed by its own Celery task.
+
+    The counters and error rows are written in the same transaction as each
+    chunk of leads, so a retried shard resumes after ``processed_records``.
+    Error row numbers are relative to the shard until the import is
+    reconciled.
+    """
+    STATUS_CHOICES = LeadImportTask.STATUS_CHOICES
+
+    import_task = models.ForeignKey(LeadImportTask, on_delete=models.CASCADE, related_name='shards')
+    index = models.IntegerField(verbose_name=_('Shard Index'))
+    start_byte = models.BigIntegerField(verbose_name=_('Start Byte'))
+    end_byte = models.BigIntegerField(verbose_name=_('End Byte'))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_records = models.IntegerField(default=0, verbose_name=_('Total Records'))
+    processed_records = models.IntegerField(default=0, verbose_name=_('Processed Records'))
+    imported_records = models.IntegerField(default=0, verbose_name=_('Imported Records'))
+    error_records = models.IntegerField(default=0, verbose_name=_('Error Records'))
+    errors = models.JSONField(null=True, blank=True, verbose_name=_('Error Details'))
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Import {self.import_task_id} shard {self.index} ({self.status})"
+
+    class Meta:
+        ordering = ['index']
+        unique_together = ('import_task', 'index')
+        verbose_name = _('Lead Import Shard')
+        verbose_name_plural = _('Lead Import Shards')
+
+
+class LeadExportTask(BaseModel):
+    """
+    Tracks a background lead export and the file it produced.
+    """
+    STATUS_CHOICES = LeadImportTask.STATUS_CHOICES
+    SOURCE_CHOICES = (
+        ('lead_list', _('Lead List')),
+        ('salesone', _('SalesOne Search')),
+    )
+
+    task_id = models.CharField(max_length=50, unique=True, verbose_name=_('Celery Task ID'))
+    file_name = models.CharField(max_length=255, verbose_name=_('Download File Name'))
+    file_type = models.CharField(max_length=10, verbose_name=_('File Type'))
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    params = models.JSONField(null=True, blank=True, verbose_name=_('Search Parameters'))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_records = models.IntegerField(default=0, verbose_name=_('Total Records'))
+    exported_records = models.IntegerField(default=0, verbose_name=_('Exported Records'))
+    file = models.FileField(upload_to='lead_exports/', null=True, blank=True)
+    errors = models.JSONField(null=True, blank=True, verbose_name=_('Error Details'))
+    lead_list = models.ForeignKey(LeadList, on_delete=models.SET_NULL, null=True, blank=True, related_name='export_tasks')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lead_export_tasks')
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Export {self.task_id} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = _('Lead Export Task')
+        verbose_name_plural = _('Lead Export Tasks')
+
+
+class LeadDedupTask(BaseModel):
+    """
+    Tracks a background search for duplicate leads of a user.
+    """
+    STATUS_CHOICES = LeadImportTask.STATUS_CHOICES
+
+    task_id = models.CharField(max_length=50, unique=True, verbose_name=_('Celery Task ID'))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_records = models.IntegerField(default=0, verbose_name=_('Scanned Leads'))
+    duplicate_records = models.IntegerField(default=0, verbose_name=_('Merge Proposals'))
+    errors = models.JSONField(null=True, blank=True, verbose_name=_('Error Details'))
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lead_dedup_tasks')
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Dedup {self.task_id} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = _('Lead Dedup Task')
+        verbose_name_plural = _('Lead Dedup Tasks')
+
+
+class LeadDuplicate(BaseModel):
+    """
+    A merge proposal: two leads of a user that look like the same company.
+
+    ``lead`` is the older of the two and ``duplicate`` the one to merge into
+    it. Proposals are written by apps/leads/dedup.py.
+    """
+    STATUS_CHOICES = (
+        ('pending', _('Pending')),
+        ('dismissed', _('Dismissed')),
+    )
+
+    lead = models.ForeignKey(Lead, on_delete=models.CASCADE, related_name='duplicate_proposals')
+    duplicate = models.ForeignKey(Lead, on_delete=models.CASCADE, related_name='+')
+    # Name similarity of the two leads (pg_trgm), 0 to 1
+    score = models.FloatField(verbose_name=_('Name Similarity'))
+    # Blocking keys the two leads share: business_number, phone, email_domain
+    matched_on = ArrayField(models.CharField(max_length=20), verbose_name=_('Matched On'))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lead_duplicates')
+
+    def __str__(self):
+        return f"{self.duplicate_id} -> {self.lead_id} ({self.score:.2f})"
+
+    class Meta:
+        ordering = ['-score', 'id']
+        unique_together = ('lead', 'duplicate')
+        indexes = [
+            models.Index(fields=['user', 'status', '-score'], name='lead_duplicate_user_idx'),
+        ]
+        verbose_name = _('Lead Duplicate')
+        verbose_name_plural = _('Lead Duplicates')
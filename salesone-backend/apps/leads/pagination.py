@@ -0,0 +1,328 @@
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+from functools import partial
+
+from django.core.cache import cache
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# Below this planner estimate an exact (cached) COUNT(*) is cheap enough to run.
+ESTIMATED_COUNT_THRESHOLD = 100000
+COUNT_CACHE_TIMEOUT = 60 * 5
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate for a queryset without executing it.
+    """
+    queryset = queryset.order_by()
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def cached_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """
+    Return an exact count for a queryset, cached by its SQL.
+    """
+    queryset = queryset.order_by()
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f'{sql}|{params}'.encode('utf-8')).hexdigest()
+    cache_key = f'leads:count:{digest}'
+
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, timeout)
+    return count
+
+
+def get_count(queryset, estimate=False):
+    """
+    Count a queryset, optionally trusting the planner for unselective filters.
+
+    Returns:
+        tuple: (count, is_estimate)
+    """
+    if not estimate:
+        return queryset.count(), False
+
+    estimated = estimate_count(queryset)
+    if estimated >= ESTIMATED_COUNT_THRESHOLD:
+        return estimated, True
+    return cached_count(queryset), False
+
+
+def wants_estimated_count(request):
+    return request.query_params.get('count') == 'estimate'
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """
+    Django paginator whose count comes from get_count(estimate=True).
+    """
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            # Already exact and cheap, e.g. columnar search results
+            return super().count
+        count, self.count_is_estimate = get_count(self.object_list, estimate=True)
+        return count
+
+
+class LeadPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class KnownCountPaginator(DjangoPaginator):
+    """
+    Django paginator for an object list whose size is already known, such as
+    a lead list's denormalized leads_count.
+    """
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.known_count = count
+
+    @cached_property
+    def count(self):
+        return self.known_count
+
+
+class LeadListMemberPagination(LeadPagination):
+    """
+    Page number pagination for lead list members that skips the COUNT(*)
+    when the caller passes the member count.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        if count is None:
+            self.django_paginator_class = DjangoPaginator
+        else:
+            self.django_paginator_class = partial(KnownCountPaginator, count=count)
+        return super().paginate_queryset(queryset, request, view)
+
+
+class SalesOneLeadPagination(LeadPagination):
+    """
+    Page number pagination for SalesOne search with an opt-in estimated count.
+
+    Pass ``count=estimate`` to replace the exact COUNT(*) with the planner's
+    estimate when the filter matches a large share of the table.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if wants_estimated_count(request):
+            self.django_paginator_class = EstimatedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['count_is_estimate'] = getattr(
+            self.page.paginator, 'count_is_estimate', False
+        )
+        return response
+
+
+class SalesOneLeadOrdering:
+    """
+    Parses the ``sort`` query parameter into a stable (field, id) ordering.
+    """
+    ordering_param = 'sort'
+    ordering_fields = ('id', 'name', 'employee', 'finance_revenue', 'established_date')
+    default_ordering = 'id'
+
+    def __init__(self, model, params):
+        self.model = model
+        sort = params.get(self.ordering_param) or self.default_ordering
+        self.descending = sort.startswith('-')
+        self.field = sort.lstrip('-')
+        if self.field not in self.ordering_fields:
+            self.field, self.descending = self.default_ordering, False
+
+    @property
+    def key(self):
+        return f"{'-' if self.descending else ''}{self.field}"
+
+    @property
+    def nullable(self):
+        return self.model._meta.get_field(self.field).null
+
+    def order_by(self, reverse=False):
+        """
+        Return order_by() arguments. NULLs always sort last in display order.
+        """
+        descending = self.descending != reverse
+        if self.field == 'id':
+            return ['-id' if descending else 'id']
+
+        expression = F(self.field).desc if descending else F(self.field).asc
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        return [expression(**nulls), '-id' if descending else 'id']
+
+    def after(self, value, pk, reverse=False):
+        """
+        Return a Q matching rows strictly after (value, pk) in scan order.
+        """
+        descending = self.descending != reverse
+        lookup = 'lt' if descending else 'gt'
+        if self.field == 'id':
+            return Q(**{f'id__{lookup}': pk})
+
+        # Scanning forward NULLs come last; scanning backward they come first.
+        nulls_last = not reverse
+        if value is None:
+            tail = Q(**{f'{self.field}__isnull': True, f'id__{lookup}': pk})
+            if nulls_last:
+                return tail
+            return tail | Q(**{f'{self.field}__isnull': False})
+
+        condition = (
+            Q(**{f'{self.field}__{lookup}': value}) |
+            Q(**{self.field: value, f'id__{lookup}': pk})
+        )
+        if nulls_last and self.nullable:
+            condition |= Q(**{f'{self.field}__isnull': True})
+        return condition
+
+    def position(self, item):
+        """
+        Return the JSON-safe (value, pk) keyset position of a result row.
+        """
+        value = item[self.field] if isinstance(item, dict) else getattr(item, self.field)
+        pk = item['id'] if isinstance(item, dict) else item.pk
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        return value, pk
+
+    def to_python(self, value):
+        if value is None:
+            return None
+        return self.model._meta.get_field(self.field).to_python(value)
+
+
+class SalesOneLeadCursorPagination(BasePagination):
+    """
+    Keyset pagination for SalesOne search.
+
+    Every page is fetched with ``WHERE (sort_key, id) > (last_key, last_id)``
+    instead of OFFSET, so page 2,000 costs the same as page 1. The cursor is
+    an opaque base64 token; the total count is only returned when the client
+    opts in with ``count=estimate``.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = SalesOneLeadOrdering(queryset.model, request.query_params)
+        self.count = None
+        self.count_is_estimate = False
+
+        if wants_estimated_count(request):
+            self.count, self.count_is_estimate = get_count(queryset, estimate=True)
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor['reverse']
+
+        queryset = queryset.order_by(*self.ordering.order_by(reverse=reverse))
+        if cursor is not None:
+            queryset = queryset.filter(
+                self.ordering.after(cursor['value'], cursor['id'], reverse=reverse)
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            if data['o'] != self.ordering.key:
+                raise ValueError('Cursor was issued for a different ordering')
+            return {
+                'value': self.ordering.to_python(data['v']),
+                'id': int(data['id']),
+                'reverse': bool(data.get('r')),
+            }
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, item, reverse=False):
+        value, pk = self.ordering.position(item)
+        data = {'o': self.ordering.key, 'v': value, 'id': pk}
+        if reverse:
+            data['r'] = 1
+        token = base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii')
+        return token.rstrip('=')
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self.encode_cursor(self.page[-1])
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        cursor = self.encode_cursor(self.page[0], reverse=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        response_data = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+        if self.count is not None:
+            response_data['count'] = self.count
+            response_data['count_is_estimate'] = self.count_is_estimate
+        return Response(response_data)
@@ -0,0 +1,99 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from .models import LeadImportTask
+
+# Upper bound on how long a crashed import's live progress lingers
+PROGRESS_CACHE_TIMEOUT = 60 * 60
+
+# LeadImportTask fields served by import_status
+PROGRESS_FIELDS = (
+    'status', 'file_name', 'total_records', 'imported_records', 'error_records',
+    'existing_records', 'errors', 'created_at', 'completed_at',
+)
+
+
+def progress_cache_key(task_id):
+    return f'leads:import:{task_id}'
+
+
+def get_import_progress(task_id):
+    """
+    Return the live progress of a running import, or None.
+
+    Only imports that are still processing are published; finished ones are
+    read from LeadImportTask.
+    """
+    return cache.get(progress_cache_key(task_id))
+
+
+class ImportProgress:
+    """
+    Throttled progress reporting for a LeadImportTask.
+
+    Counter deltas are accumulated in memory and written with ``F()``
+    increments on the counter columns only, at most every ``row_interval``
+    rows or ``time_interval`` seconds. Every update is also published to the
+    cache so import_status polling does not read Postgres while the import
+    runs. Shards of a sharded import pass ``live=False``: each only knows
+    its own counts, so their increments roll up in the database instead.
+    """
+
+    def __init__(self, import_task, row_interval=None, time_interval=None, live=True):
+        self.import_task = import_task
+        self.live = live
+        if row_interval is None:
+            row_interval = settings.LEAD_IMPORT_PROGRESS_ROWS
+        if time_interval is None:
+            time_interval = settings.LEAD_IMPORT_PROGRESS_INTERVAL
+        self.row_interval = row_interval
+        self.time_interval = time_interval
+        self.pending_imported = 0
+        self.pending_errors = 0
+        self.pending_existing = 0
+        self.last_flush = time.monotonic()
+
+    def set_total(self, total):
+        self.import_task.total_records = total
+        LeadImportTask.objects.filter(pk=self.import_task.pk).update(total_records=total)
+        self.publish()
+
+    def add(self, imported=0, errors=0, existing=0):
+        """Record processed rows, writing to the database when a batch is due."""
+        self.pending_imported += imported
+        self.pending_errors += errors
+        self.pending_existing += existing
+        self.import_task.imported_records += imported
+        self.import_task.error_records += errors
+        self.import_task.existing_records += existing
+        self.publish()
+
+        pending = self.pending_imported + self.pending_errors + self.pending_existing
+        if pending >= self.row_interval or time.monotonic() - self.last_flush >= self.time_interval:
+            self.flush()
+
+    def flush(self):
+        """Write the accumulated counter deltas."""
+        if self.pending_imported or self.pending_errors or self.pending_existing:
+            LeadImportTask.objects.filter(pk=self.import_task.pk).update(
+                imported_records=F('imported_records') + self.pending_imported,
+                error_records=F('error_records') + self.pending_errors,
+                existing_records=F('existing_records') + self.pending_existing,
+            )
+            self.pending_imported = 0
+            self.pending_errors = 0
+            self.pending_existing = 0
+        self.last_flush = time.monotonic()
+
+    def publish(self):
+        if not self.live:
+            return
+        progress = {field: getattr(self.import_task, field) for field in PROGRESS_FIELDS}
+        progress['user_id'] = str(self.import_task.user_id)
+        cache.set(progress_cache_key(self.import_task.task_id), progress, PROGRESS_CACHE_TIMEOUT)
+
+    def finish(self):
+        """Flush remaining counters and hand status reads back to the database."""
+        self.flush()
+        cache.delete(progress_cache_key(self.import_task.task_id))
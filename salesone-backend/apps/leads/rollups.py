@@ -0,0 +1,107 @@
+import uuid
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, CharField, Count, Q, Value, When
+from django.dispatch import receiver
+from .models import SalesOneFacetRollup, SalesOneLead, SalesOneRegion
+from .signals import salesone_leads_synced
+
+ROLLUPS_VERSION_KEY = 'leads:rollups:version'
+# Responses are keyed by the rollup version, so this only bounds how long
+# entries for a superseded version linger
+ROLLUPS_CACHE_TIMEOUT = 60 * 60
+
+# (key, lower bound inclusive, upper bound exclusive); None is unbounded
+EMPLOYEE_BUCKETS = (
+    ('1-9', None, 10),
+    ('10-49', 10, 50),
+    ('50-99', 50, 100),
+    ('100-299', 100, 300),
+    ('300-999', 300, 1000),
+    ('1000+', 1000, None),
+)
+REVENUE_BUCKETS = (
+    ('0-1b', None, 10 ** 9),
+    ('1b-10b', 10 ** 9, 10 ** 10),
+    ('10b-100b', 10 ** 10, 10 ** 11),
+    ('100b+', 10 ** 11, None),
+)
+UNKNOWN_BUCKET = 'unknown'
+
+
+def bucket_case(field, buckets):
+    """Return a CASE expression assigning each row its bucket key."""
+    whens = []
+    for key, lower, upper in buckets:
+        condition = Q()
+        if lower is not None:
+            condition &= Q(**{f'{field}__gte': lower})
+        if upper is not None:
+            condition &= Q(**{f'{field}__lt': upper})
+        whens.append(When(condition, then=Value(key)))
+    return Case(*whens, default=Value(UNKNOWN_BUCKET), output_field=CharField())
+
+
+def get_rollups_version():
+    """Return the current rollup version, used in cache keys and ETags."""
+    return cache.get_or_set(ROLLUPS_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+
+
+def rebuild_salesone_rollups():
+    """
+    Rebuild SalesOneRegion and SalesOneFacetRollup from SalesOneLead in one
+    transaction.
+
+    Readers keep seeing the previous rows until the rebuild commits; the
+    version is bumped afterwards so cached responses and ETags change.
+    """
+    facet_rows = SalesOneLead.objects.order_by().annotate(
+        employee_bucket=bucket_case('employee', EMPLOYEE_BUCKETS),
+        revenue_bucket=bucket_case('finance_revenue', REVENUE_BUCKETS),
+    ).values(
+        'si_nm', 'sgg_nm', 'industry_id', 'employee_bucket', 'revenue_bucket'
+    ).annotate(lead_count=Count('id'))
+    facet_sql, facet_params = facet_rows.query.sql_with_params()
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SalesOneRegion._meta.db_table}')
+            cursor.execute(f"""
+                INSERT INTO {SalesOneRegion._meta.db_table} (si_nm, sgg_nm, lead_count)
+                SELECT si_nm, nullif(sgg_nm, ''), count(*)
+                FROM {SalesOneLead._meta.db_table}
+                WHERE si_nm IS NOT NULL AND si_nm <> ''
+                GROUP BY si_nm, nullif(sgg_nm, '')
+            """)
+            cursor.execute(f'DELETE FROM {SalesOneFacetRollup._meta.db_table}')
+            cursor.execute(f"""
+                INSERT INTO {SalesOneFacetRollup._meta.db_table}
+                    (si_nm, sgg_nm, industry_id, employee_bucket, revenue_bucket, lead_count)
+                {facet_sql}
+            """, facet_params)
+        transaction.on_commit(lambda: cache.set(ROLLUPS_VERSION_KEY, uuid.uuid4().hex, None))
+
+
+def get_region_counts(si_nm=None):
+    """
+    Return lead counts per si_nm, or per sgg_nm within one si_nm.
+
+    Returns:
+        dict: name -> count, ordered by name
+    """
+    regions = SalesOneRegion.objects.all()
+    if si_nm:
+        rows = regions.filter(si_nm=si_nm, sgg_nm__isnull=False).values_list('sgg_nm', 'lead_count')
+        return dict(rows.order_by('sgg_nm'))
+
+    counts = {}
+    for name, lead_count in regions.values_list('si_nm', 'lead_count').order_by('si_nm'):
+        counts[name] = counts.get(name, 0) + lead_count
+    return counts
+
+
+@receiver(salesone_leads_synced)
+def rebuild_rollups_on_sync(sender, manifest, **kwargs):
+    """Rebuild the rollups when a SalesOne sync changed any rows."""
+    if any(manifest.values()):
+        rebuild_salesone_rollups()
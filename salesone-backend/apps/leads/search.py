@@ -0,0 +1,300 @@
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import CharField, F, ForeignKey, Lookup, Q, UUIDField
+from django.db.models.functions import Greatest
+from .industries import industry_map
+from .models import SALESONE_HAS_EMAIL, SALESONE_HAS_PHONE, SALESONE_HAS_HOMEPAGE
+from .pagination import SalesOneLeadOrdering
+
+
+# query parameter -> (lookup, type cast)
+SALESONE_FILTERS = {
+    'industry': ('industry__code', str),
+    'employee_min': ('employee__gte', int),
+    'employee_max': ('employee__lte', int),
+    'established_after': ('established_date__gte', str),
+    'established_before': ('established_date__lte', str),
+    # min_/max_ spellings of the range filters
+    'min_employee': ('employee__gte', int),
+    'max_employee': ('employee__lte', int),
+    'min_revenue': ('finance_revenue__gte', int),
+    'max_revenue': ('finance_revenue__lte', int),
+    'min_established': ('established_date__gte', str),
+    'max_established': ('established_date__lte', str),
+}
+
+# list query parameter -> field; rows matching any of the values are kept
+SALESONE_LIST_FILTERS = {
+    'si_nm__in': 'si_nm',
+    'sgg_nm__in': 'sgg_nm',
+    'industry__in': 'industry',
+}
+# list query parameter -> field; rows matching any of the values are dropped
+# (rows where the field is NULL are kept)
+SALESONE_EXCLUDE_FILTERS = {
+    'exclude_si_nm': 'si_nm',
+    'exclude_sgg_nm': 'sgg_nm',
+    'exclude_industry': 'industry',
+}
+SALESONE_LIST_PARAMS = (*SALESONE_LIST_FILTERS, *SALESONE_EXCLUDE_FILTERS)
+
+# query parameter -> predicate applied when the parameter is 'true'
+SALESONE_CONTACT_FILTERS = {
+    'has_email': SALESONE_HAS_EMAIL,
+    'has_phone': SALESONE_HAS_PHONE,
+    'has_homepage': SALESONE_HAS_HOMEPAGE,
+}
+SALESONE_FLAG_FILTERS = {
+    'is_corporation': Q(is_corporation=True),
+    'is_normal_taxpayer': Q(is_normal_taxpayer=True),
+}
+
+# Every query parameter filter_salesone_leads reads
+SALESONE_FILTER_PARAMS = (
+    *SALESONE_FILTERS, 'company_name', 'query', 'search', 'si_nm', 'sgg_nm',
+    *SALESONE_LIST_PARAMS, *SALESONE_CONTACT_FILTERS, *SALESONE_FLAG_FILTERS,
+    'revenue_range',
+)
+
+# Queries shorter than this yield no trigrams, so they use prefix matching
+NAME_TRIGRAM_MIN_LENGTH = 3
+
+# Annotations added by the filters below, in the order they rank results
+RELEVANCE_ANNOTATIONS = ('name_similarity', 'search_rank')
+
+SEARCH_WORD_RE = re.compile(r'\w+')
+HANGUL_WORD_RE = re.compile(r'^[가-힣]+$')
+
+
+def get_list_param(params, param):
+    """
+    Return the values of a list parameter.
+
+    Values may be repeated (``si_nm__in=a&si_nm__in=b``), comma-separated
+    (``si_nm__in=a,b``) or, in request bodies, a JSON list.
+    """
+    values = params.getlist(param) if hasattr(params, 'getlist') else params.get(param)
+    if not values:
+        return []
+    if isinstance(values, str):
+        values = [values]
+    return [
+        value.strip() for item in values for value in str(item).split(',') if value.strip()
+    ]
+
+
+class AnyLookup(Lookup):
+    """
+    ``field = ANY(%s::type[])``.
+
+    Unlike ``__in`` the list is sent as a single array parameter, so the SQL
+    text (and the planner's generic plan) does not change with the number of
+    values.
+    """
+    lookup_name = 'any'
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        return [self.lhs.output_field.get_prep_value(value) for value in self.rhs]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        db_type = self.lhs.output_field.db_type(connection)
+        return f'{lhs} = ANY(%s::{db_type}[])', [*lhs_params, self.rhs]
+
+
+CharField.register_lookup(AnyLookup)
+ForeignKey.register_lookup(AnyLookup)
+UUIDField.register_lookup(AnyLookup)
+
+
+def salesone_list_filter(params):
+    """
+    Return a Q for the multi-select and exclusion list parameters.
+
+    Every list compiles to one ``= ANY(array)`` predicate. Industry codes are
+    resolved to ids first so the predicate runs on ``industry_id`` without a
+    join. The columns exist on SalesOneLead and SalesOneFacetRollup alike.
+    """
+    condition = Q()
+    for param in SALESONE_LIST_PARAMS:
+        values = get_list_param(params, param)
+        if not values:
+            continue
+        field = SALESONE_LIST_FILTERS.get(param) or SALESONE_EXCLUDE_FILTERS[param]
+        if field == 'industry':
+            field, values = 'industry_id', list(industry_map.resolve_codes(values).values())
+        predicate = Q(**{f'{field}__any': values})
+        condition &= predicate if param in SALESONE_LIST_FILTERS else ~predicate
+    return condition
+
+
+def build_search_query(text):
+    """
+    Build a tsquery that matches the search_vector tokenisation.
+
+    The search_vector triggers index Hangul runs as overlapping bigrams, so a
+    Hangul word matches its bigram sequence as a phrase ("넥스파" becomes
+    '넥스' <-> '스파'). Other words match as prefixes.
+
+    Returns:
+        SearchQuery or None if the text has no searchable words
+    """
+    terms = []
+    for word in SEARCH_WORD_RE.findall(text.lower()):
+        if HANGUL_WORD_RE.match(word) and len(word) > 1:
+            bigrams = [word[i:i + 2] for i in range(len(word) - 1)]
+            terms.append(' <-> '.join(f"'{bigram}'" for bigram in bigrams))
+        else:
+            terms.append(f"'{word}':*")
+
+    if not terms:
+        return None
+    return SearchQuery(
+        ' & '.join(f'({term})' for term in terms),
+        search_type='raw',
+        config='simple'
+    )
+
+
+def filter_full_text(queryset, text):
+    """
+    Filter a Lead or SalesOneLead queryset through its GIN-indexed search_vector.
+
+    Matches are annotated with ``search_rank``.
+    """
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F('search_vector'), query)
+    )
+
+
+def filter_lead_members(queryset, text):
+    """
+    Search a Lead queryset, such as a lead list's members.
+
+    Matches the GIN-indexed search_vector (names, owner, contacts and
+    address) or an industry whose name contains the text. Industries are
+    resolved from the in-memory industry map first, so the industry match
+    is an indexed ``industry_id = ANY(...)`` that the planner can OR with
+    the search_vector bitmap; no join, and no DISTINCT. Matches are
+    annotated with ``search_rank``.
+    """
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+    condition = Q(search_vector=query)
+    industry_ids = industry_map.search(text)
+    if industry_ids:
+        condition |= Q(industry__any=industry_ids)
+    return queryset.filter(condition).annotate(
+        search_rank=SearchRank(F('search_vector'), query)
+    )
+
+
+def filter_salesone_name(queryset, query):
+    """
+    Filter SalesOneLead by company name using the trigram indexes.
+
+    Substring and fuzzy (word-similarity) matches on ``name`` and ``name_eng``
+    are ranked by similarity in a ``name_similarity`` annotation. The fuzzy
+    threshold is the connection's ``pg_trgm.word_similarity_threshold``, set
+    from ``SALESONE_NAME_SIMILARITY_THRESHOLD``. Very short queries fall back
+    to prefix matching.
+    """
+    query = query.strip()
+    if len(query) < NAME_TRIGRAM_MIN_LENGTH:
+        return queryset.filter(Q(name__istartswith=query) | Q(name_eng__istartswith=query))
+
+    return queryset.filter(
+        Q(name__icontains=query) |
+        Q(name_eng__icontains=query) |
+        Q(name__trigram_word_similar=query) |
+        Q(name_eng__trigram_word_similar=query)
+    ).annotate(
+        name_similarity=Greatest(
+            TrigramWordSimilarity(query, 'name'),
+            TrigramWordSimilarity(query, 'name_eng')
+        )
+    )
+
+
+def filter_salesone_leads(queryset, params):
+    """
+    Apply search_salesone query parameters to a SalesOneLead queryset.
+
+    Args:
+        queryset: SalesOneLead queryset to filter
+        params: QueryDict or dict of search parameters
+
+    Returns:
+        QuerySet: The filtered queryset
+    """
+    for param, (field, type_cast) in SALESONE_FILTERS.items():
+        value = params.get(param)
+        if value:
+            try:
+                queryset = queryset.filter(**{field: type_cast(value)})
+            except (ValueError, TypeError):
+                pass
+
+    # Handle company name search ('query' is accepted as an alias)
+    company_name = params.get('company_name') or params.get('query')
+    if company_name and company_name.strip():
+        queryset = filter_salesone_name(queryset, company_name)
+
+    # Handle full-text search across all indexed text columns
+    search = params.get('search')
+    if search and search.strip():
+        queryset = filter_full_text(queryset, search)
+
+    # Handle region filters
+    si_nm = params.get('si_nm')
+    sgg_nm = params.get('sgg_nm')
+    if si_nm:
+        queryset = queryset.filter(si_nm=si_nm)
+    if sgg_nm:
+        queryset = queryset.filter(sgg_nm=sgg_nm)
+
+    # Handle multi-select and exclusion filters
+    queryset = queryset.filter(salesone_list_filter(params))
+
+    # Handle required fields and company type filters
+    for param, predicate in {**SALESONE_CONTACT_FILTERS, **SALESONE_FLAG_FILTERS}.items():
+        if params.get(param) == 'true':
+            queryset = queryset.filter(predicate)
+
+    # Handle revenue range
+    revenue_range = params.get('revenue_range')
+    if revenue_range:
+        try:
+            min_rev, max_rev = map(int, revenue_range.split(','))
+            if min_rev > 0:
+                queryset = queryset.filter(finance_revenue__gte=min_rev)
+            if max_rev > 0:
+                queryset = queryset.filter(finance_revenue__lte=max_rev)
+        except (ValueError, AttributeError):
+            pass
+
+    return queryset
+
+
+def order_salesone_leads(queryset, params):
+    """
+    Order filtered SalesOneLead results.
+
+    An explicit ``sort`` wins; otherwise text searches are ranked by
+    relevance, and everything else is ordered by id.
+    """
+    if not params.get(SalesOneLeadOrdering.ordering_param):
+        relevance = [
+            f'-{name}' for name in RELEVANCE_ANNOTATIONS
+            if name in queryset.query.annotations
+        ]
+        if relevance:
+            return queryset.order_by(*relevance, 'id')
+
+    ordering = SalesOneLeadOrdering(queryset.model, params)
+    return queryset.order_by(*ordering.order_by())
@@ -1,5 +1,9 @@
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Industry, Keyword, SalesOneLead, Lead, LeadList, LeadImportTask
+from .models import (
+    Industry, Keyword, SalesOneLead, Lead, LeadList, LeadImportTask, LeadExportTask,
+    LeadDedupTask, LeadDuplicate
+)
 
 
 class IndustrySerializer(serializers.ModelSerializer):
@@ -28,6 +32,73 @@ class SalesOneLeadSerializer(serializers.ModelSerializer):
         ]
 
 
+class SalesOneLeadListSerializer:
+    """
+    Dict-based serializer for SalesOne search result pages.
+
+    Produces the same output as SalesOneLeadSerializer from ``values()`` rows
+    that carry only the displayed columns, with the industry joined in SQL.
+    Keywords for the whole page are loaded with one query, so a page costs
+    two queries whatever its size.
+    """
+    fields = (
+        'id', 'corporation_number', 'business_number', 'industry_id', 'industry_name',
+        'name', 'name_eng', 'owner', 'email', 'phone', 'homepage', 'handle_goods',
+        'employee', 'finance_revenue', 'address', 'si_nm', 'sgg_nm', 'established_date',
+    )
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    @classmethod
+    def select(cls, queryset):
+        """Restrict a SalesOneLead queryset to the listed columns."""
+        return queryset.values(*cls.fields, 'industry__code', 'industry__name')
+
+    @property
+    def data(self):
+        keywords = {row['id']: [] for row in self.rows}
+        if keywords:
+            links = SalesOneLead.keywords.through.objects.filter(
+                salesonelead_id__in=list(keywords)
+            ).order_by('keyword_id').values_list('salesonelead_id', 'keyword_id', 'keyword__name')
+            for lead_id, keyword_id, name in links:
+                keywords[lead_id].append({'id': keyword_id, 'name': name})
+
+        return [self.to_representation(row, keywords[row['id']]) for row in self.rows]
+
+    def to_representation(self, row, keywords):
+        industry = None
+        if row['industry_id'] is not None:
+            industry = {
+                'id': row['industry_id'],
+                'code': row['industry__code'],
+                'name': row['industry__name'],
+            }
+        established_date = row['established_date']
+        return {
+            'id': row['id'],
+            'corporation_number': row['corporation_number'],
+            'business_number': row['business_number'],
+            'industry': industry,
+            'industry_name': row['industry_name'],
+            'name': row['name'],
+            'name_eng': row['name_eng'],
+            'owner': row['owner'],
+            'email': row['email'],
+            'phone': row['phone'],
+            'homepage': row['homepage'],
+            'handle_goods': row['handle_goods'],
+            'employee': row['employee'],
+            'finance_revenue': row['finance_revenue'],
+            'address': row['address'],
+            'si_nm': row['si_nm'],
+            'sgg_nm': row['sgg_nm'],
+            'established_date': established_date.isoformat() if established_date else None,
+            'keywords': keywords,
+        }
+
+
 class LeadSerializer(serializers.ModelSerializer):
     industry = IndustrySerializer(read_only=True)
     industry_id = serializers.UUIDField(write_only=True, required=False)
@@ -54,15 +125,10 @@ class LeadSerializer(serializers.ModelSerializer):
 
 
 class LeadListSerializer(serializers.ModelSerializer):
-    leads_count = serializers.SerializerMethodField()
-    
     class Meta:
         model = LeadList
         fields = ['id', 'name', 'description', 'leads_count', 'created_at', 'updated_at']
-        read_only_fields = ['created_at', 'updated_at']
-        
-    def get_leads_count(self, obj):
-        return obj.leads.count()
+        read_only_fields = ['leads_count', 'created_at', 'updated_at']
 
 
 class LeadListDetailSerializer(serializers.ModelSerializer):
@@ -123,20 +189,20 @@ class LeadImportTaskSerializer(serializers.ModelSerializer):
         model = LeadImportTask
         fields = [
             'id', 'task_id', 'file_name', 'file_type', 'status',
-            'total_records', 'imported_records', 'error_records',
+            'total_records', 'imported_records', 'error_records', 'existing_records',
             'lead_list', 'lead_list_name', 'progress', 'errors',
             'created_at', 'completed_at'
         ]
         read_only_fields = [
             'id', 'task_id', 'file_name', 'file_type', 'status',
-            'total_records', 'imported_records', 'error_records',
+            'total_records', 'imported_records', 'error_records', 'existing_records',
             'progress', 'errors', 'created_at', 'completed_at'
         ]
     
     def get_progress(self, obj):
         """Calculate the import progress as a percentage."""
         if obj.total_records > 0:
-            return round((obj.imported_records / obj.total_records) * 100)
+            return round(((obj.imported_records + obj.existing_records) / obj.total_records) * 100)
         return 0
     
     def get_lead_list_name(self, obj):
@@ -144,3 +210,60 @@ class LeadImportTaskSerializer(serializers.ModelSerializer):
         if obj.lead_list:
             return obj.lead_list.name
         return None
+
+
+class LeadExportTaskSerializer(serializers.ModelSerializer):
+    """Serializer for the LeadExportTask model."""
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LeadExportTask
+        fields = [
+            'id', 'task_id', 'file_name', 'file_type', 'source', 'status',
+            'total_records', 'exported_records', 'lead_list', 'download_url',
+            'errors', 'created_at', 'completed_at'
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        """Download link of a finished export, served by export-download."""
+        if obj.status != 'completed' or not obj.file:
+            return None
+        url = reverse('leads-export-download', kwargs={'task_id': obj.task_id})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+class LeadDedupTaskSerializer(serializers.ModelSerializer):
+    """Serializer for the LeadDedupTask model."""
+
+    class Meta:
+        model = LeadDedupTask
+        fields = [
+            'id', 'task_id', 'status', 'total_records', 'duplicate_records',
+            'errors', 'created_at', 'completed_at'
+        ]
+        read_only_fields = fields
+
+
+class DuplicateLeadSerializer(serializers.ModelSerializer):
+    """The lead columns shown side by side in a merge proposal."""
+
+    class Meta:
+        model = Lead
+        fields = [
+            'id', 'corporation_number', 'business_number', 'name', 'owner',
+            'email', 'phone', 'address', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class LeadDuplicateSerializer(serializers.ModelSerializer):
+    """Serializer for LeadDuplicate merge proposals."""
+    lead = DuplicateLeadSerializer(read_only=True)
+    duplicate = DuplicateLeadSerializer(read_only=True)
+
+    class Meta:
+        model = LeadDuplicate
+        fields = ['id', 'lead', 'duplicate', 'score', 'matched_on', 'status', 'created_at']
+        read_only_fields = fields
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+# Sent by SalesOneLeadLoader after a load commits, with ``manifest``: a dict of
+# corporation numbers under 'inserted', 'changed' and 'removed'. Receivers use
+# it to refresh caches and Lead copies selectively.
+salesone_leads_synced = Signal()
+
+
+@receiver([post_save, post_delete], sender='leads.Industry')
+def invalidate_industry_map_on_change(sender, **kwargs):
+    """
+    Make every process reload its memoized industry map once the change
+    commits. A rolled-back save does not bump the shared version, and a
+    cache outage is logged rather than failing the save; the maps then
+    reload within INDUSTRY_MAP_MAX_AGE.
+    """
+    # Delayed import: industries imports the models
+    from .industries import industry_map, invalidate_industry_map
+    # This process can read the change before it commits
+    industry_map.expire()
+    transaction.on_commit(invalidate_industry_map, robust=True)
@@ -1,15 +1,26 @@
 import os
 import csv
 import io
-import pandas as pd
+import tempfile
 import uuid
-from celery import shared_task
+from celery import chord, shared_task
 from django.conf import settings
-from django.db import transaction
 from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
+from django.db import transaction
 from django.utils import timezone
-from .models import Lead, Industry, LeadList, LeadImportTask
+from .dedup import find_duplicate_leads
+from .exports import LeadExport, lead_list_queryset, salesone_search_queryset
+from .importers import LeadFileImporter, copy_salesone_leads, split_csv_records
+from .models import (
+    Lead, LeadDedupTask, LeadExportTask, LeadImportShard, LeadImportTask, LeadList, SalesOneLead
+)
+from .progress import ImportProgress
+from .search import filter_salesone_leads
+
+
+def lead_list_not_found(lead_list_id):
+    return f"Lead list with ID {lead_list_id} not found."
 
 
 @shared_task(bind=True, max_retries=3)
@@ -27,6 +38,7 @@ def process_lead_file_import(self, file_path, user_id, file_type='csv', options=
         dict: Results of the import process
     """
     import_task = None
+    progress = None
     try:
         # Initialize import task record
         lead_list_id = options.get('lead_list_id') if options else None
@@ -52,12 +64,14 @@ def process_lead_file_import(self, file_path, user_id, file_type='csv', options=
             'completed_at': None
         }
         
-        # Load data based on file type
-        if file_type.lower() == 'csv':
-            df = pd.read_csv(file_path)
-        elif file_type.lower() in ['excel', 'xlsx', 'xls']:
-            df = pd.read_excel(file_path)
-        else:
+        importer = LeadFileImporter(
+            file_path,
+            user_id,
+            file_type=file_type,
+            options=options,
+            chunk_size=settings.LEAD_IMPORT_CHUNK_SIZE
+        )
+        if file_type.lower() not in ['csv', 'excel', 'xlsx', 'xls']:
             results['status'] = 'failed'
             results['errors'].append(f"Unsupported file type: {file_type}")
             
@@ -69,48 +83,67 @@ def process_lead_file_import(self, file_path, user_id, file_type='csv', options=
                 
             return results
         
-        results['total'] = len(df)
-        import_task.total_records = len(df)
-        import_task.save()
+        # Large CSV files are split into shards imported in parallel
+        if file_type.lower() == 'csv' and os.path.getsize(file_path) > settings.LEAD_IMPORT_SHARD_BYTES:
+            header_end, ranges = split_csv_records(file_path, settings.LEAD_IMPORT_SHARD_BYTES)
+            # Resolved once for every shard, and kept for the reconciliation
+            link_to_list = importer.validate_lead_list()
+            if not link_to_list:
+                results['errors'].append(lead_list_not_found(lead_list_id))
+                import_task.errors = {'general': results['errors']}
+            # Counted once here, so retried shards never add to the total again
+            shards = [
+                LeadImportShard(
+                    import_task=import_task,
+                    index=index,
+                    start_byte=start,
+                    end_byte=end,
+                    total_records=LeadFileImporter(
+                        file_path, user_id, options=options, byte_range=(header_end, start, end)
+                    ).count_rows()
+                )
+                for index, (start, end) in enumerate(ranges)
+            ]
+            import_task.file_path = file_path
+            import_task.options = {**(options or {}), 'link_to_list': link_to_list}
+            import_task.total_records = sum(shard.total_records for shard in shards)
+            import_task.save(update_fields=['file_path', 'options', 'errors', 'total_records', 'updated_at'])
+            LeadImportShard.objects.bulk_create(shards)
+            run_import_shards(import_task)
+            results['shards'] = len(ranges)
+            return results
         
-        # Process each row
-        imported_leads = []
-        for index, row in df.iterrows():
-            try:
-                # Apply validation and transformation
-                lead_data = validate_and_transform_lead_data(row, options)
-                
-                # Add user ID
-                lead_data['user_id'] = user_id
-                
-                # Create lead in database
-                with transaction.atomic():
-                    lead = Lead.objects.create(**lead_data)
-                    
-                    # Add to lead list if specified
-                    if lead_list_id:
-                        try:
-                            lead_list = LeadList.objects.get(id=lead_list_id, user_id=user_id)
-                            lead_list.leads.add(lead)
-                        except LeadList.DoesNotExist:
-                            results['errors'].append(f"Lead list with ID {lead_list_id} not found.")
-                    
-                    imported_leads.append(lead)
-                    results['imported'] += 1
-                    import_task.imported_records += 1
-                    import_task.save()
-                
-            except Exception as e:
-                # Log the error and continue with next row
-                error_info = {
-                    'row': index + 2,  # +2 because index is 0-based and we need to account for header row
-                    'data': row.to_dict(),
-                    'error': str(e)
-                }
-                results['error_rows'].append(error_info)
-                results['errors'].append(f"Error in row {index + 2}: {str(e)}")
-                import_task.error_records += 1
-                import_task.save()
+        progress = ImportProgress(import_task)
+        progress.publish()
+        
+        link_to_list = importer.validate_lead_list()
+        if not link_to_list:
+            results['errors'].append(lead_list_not_found(lead_list_id))
+        
+        total = importer.count_rows()
+        if total is not None:
+            results['total'] = total
+            progress.set_total(total)
+        
+        # Validate and insert the file one chunk at a time
+        processed = 0
+        for chunk in importer.iter_chunks():
+            leads, error_rows = importer.transform(chunk)
+            imported, skipped_rows = importer.insert(chunk, leads, link_to_list=link_to_list)
+            error_rows.extend(skipped_rows)
+            processed += len(chunk)
+            
+            results['imported'] += imported
+            results['error_rows'].extend(error_rows)
+            results['errors'].extend(
+                f"Error in row {error_row['row']}: {error_row['error']}" for error_row in error_rows
+            )
+            progress.add(imported=imported, errors=len(error_rows))
+        
+        if processed > results['total']:
+            results['total'] = processed
+            progress.set_total(processed)
+        progress.flush()
         
         # Update final status
         results['status'] = 'completed'
@@ -119,8 +152,15 @@ def process_lead_file_import(self, file_path, user_id, file_type='csv', options=
         # Update import task record
         import_task.status = 'completed'
         import_task.completed_at = timezone.now()
-        import_task.errors = {'rows': results['error_rows']} if results['error_rows'] else None
-        import_task.save()
+        errors = {}
+        if not link_to_list:
+            errors['general'] = [lead_list_not_found(lead_list_id)]
+        if results['error_rows']:
+            errors['rows'] = results['error_rows']
+        import_task.errors = errors or None
+        # Counters are owned by ImportProgress; never overwrite them here
+        import_task.save(update_fields=['status', 'completed_at', 'errors', 'updated_at'])
+        progress.finish()
         
         # Clean up the temporary file
         if os.path.exists(file_path):
@@ -134,7 +174,9 @@ def process_lead_file_import(self, file_path, user_id, file_type='csv', options=
             import_task.status = 'failed'
             import_task.errors = {'general': [str(e)]}
             import_task.completed_at = timezone.now()
-            import_task.save()
+            import_task.save(update_fields=['status', 'completed_at', 'errors', 'updated_at'])
+        if progress:
+            progress.finish()
             
         self.retry(exc=e, countdown=60 * 5)  # Retry after 5 minutes
         results = {
@@ -145,68 +187,367 @@ def process_lead_file_import(self, file_path, user_id, file_type='csv', options=
         return results
 
 
-def validate_and_transform_lead_data(row_data, options=None):
+def run_import_shards(import_task):
     """
-    Validate and transform a row of lead data.
+    Import the unfinished shards of a sharded file import in parallel.
+
+    The shards run as a Celery chord whose callback reconciles the import
+    once all of them have completed.
+    """
+    shard_ids = import_task.shards.exclude(status='completed').values_list('id', flat=True)
+    callback = reconcile_lead_file_import.si(import_task.task_id)
+    if not shard_ids:
+        callback.delay()
+        return
+    chord(import_lead_file_shard.si(str(shard_id)) for shard_id in shard_ids)(callback)
+
+
+@shared_task(bind=True, max_retries=3)
+def import_lead_file_shard(self, shard_id):
+    """
+    Import one byte range of a large CSV file.
+
+    Each chunk of leads is committed together with the shard's counters and
+    error rows, so a retry skips the rows already processed. Throttled
+    counter increments roll up into the parent LeadImportTask while the
+    shards run.
     
     Args:
-        row_data: Dictionary or Series containing lead data
-        options: Import options including column mappings
+        shard_id: ID of the LeadImportShard
     
     Returns:
-        dict: Validated and transformed lead data ready for database insertion
+        dict: Results of the shard
     """
-    # Convert pandas Series to dict if needed
-    if hasattr(row_data, 'to_dict'):
-        data = row_data.to_dict()
-    else:
-        data = dict(row_data)
-    
-    # Apply column mappings if provided
-    if options and 'column_mapping' in options:
-        mapped_data = {}
-        for db_field, file_column in options['column_mapping'].items():
-            if file_column in data:
-                mapped_data[db_field] = data[file_column]
-        data = mapped_data
-    
-    # Required fields validation
-    required_fields = ['name', 'corporation_number']
-    for field in required_fields:
-        if field not in data or not data[field]:
-            raise ValueError(f"Missing required field: {field}")
+    shard = LeadImportShard.objects.select_related('import_task').get(id=shard_id)
+    import_task = shard.import_task
+    if shard.status == 'completed':
+        return {'status': 'completed', 'imported': shard.imported_records}
+    progress = None
+    try:
+        shard.status = 'processing'
+        shard.save(update_fields=['status', 'updated_at'])
+
+        # The first shard starts right after the header row
+        header_end = import_task.shards.get(index=0).start_byte
+        importer = LeadFileImporter(
+            import_task.file_path,
+            import_task.user_id,
+            file_type='csv',
+            options=import_task.options,
+            chunk_size=settings.LEAD_IMPORT_CHUNK_SIZE,
+            byte_range=(header_end, shard.start_byte, shard.end_byte)
+        )
+        link_to_list = import_task.options.get('link_to_list', True)
+        progress = ImportProgress(import_task, live=False)
+
+        for chunk in importer.iter_chunks():
+            if chunk.index[-1] < shard.processed_records:
+                # Committed before a retry; only its in-file duplicate bookkeeping is redone
+                importer.mark_seen(chunk, shard.errors or [])
+                continue
+            leads, error_rows = importer.transform(chunk)
+            with transaction.atomic():
+                imported, skipped_rows = importer.insert_shard(chunk, leads, link_to_list=link_to_list)
+                error_rows.extend(skipped_rows)
+                shard.processed_records += len(chunk)
+                shard.imported_records += imported
+                shard.error_records += len(error_rows)
+                if error_rows:
+                    shard.errors = (shard.errors or []) + error_rows
+                shard.save(update_fields=[
+                    'processed_records', 'imported_records', 'error_records', 'errors', 'updated_at'
+                ])
+            progress.add(imported=imported, errors=len(error_rows))
+        progress.flush()
+
+        shard.status = 'completed'
+        shard.completed_at = timezone.now()
+        shard.save(update_fields=['status', 'completed_at', 'updated_at'])
+        return {
+            'status': 'completed',
+            'imported': shard.imported_records,
+            'errors': shard.error_records
+        }
+
+    except Exception as e:
+        # Only the status: the counters stay as committed with the last chunk
+        LeadImportShard.objects.filter(pk=shard.pk).update(status='failed')
+        if progress:
+            progress.flush()
+        if self.request.retries >= self.max_retries:
+            # The chord callback will not run; the import can be retried
+            # from import-retry once the cause is fixed
+            import_task.status = 'failed'
+            import_task.errors = {'general': [f"Shard {shard.index} failed: {e}"]}
+            import_task.completed_at = timezone.now()
+            import_task.save(update_fields=['status', 'completed_at', 'errors', 'updated_at'])
+
+        self.retry(exc=e, countdown=60 * 5)  # Retry after 5 minutes
+        return {
+            'status': 'failed',
+            'errors': [str(e)],
+            'completed_at': timezone.now().isoformat()
+        }
+
+
+@shared_task
+def reconcile_lead_file_import(task_id):
+    """
+    Combine the shards of a sharded file import into its LeadImportTask.
+
+    The counters are recomputed from the shards, since throttled increments
+    may be lost when a shard is retried, and error rows are renumbered from
+    shard rows to file rows.
     
-    # Data type validation and transformation
-    lead_data = {
-        'name': str(data.get('name', '')).strip(),
-        'corporation_number': str(data.get('corporation_number', '')).strip(),
-        'business_number': str(data.get('business_number', '')).strip() if data.get('business_number') else None,
-        'owner': str(data.get('owner', '')).strip() if data.get('owner') else None,
-        'email': str(data.get('email', '')).strip() if data.get('email') else None,
-        'phone': str(data.get('phone', '')).strip() if data.get('phone') else None,
-        'homepage': [str(data.get('homepage', '')).strip()] if data.get('homepage') else None,
-        'employee': int(data.get('employee', 1)) if data.get('employee') else 1,
-        'revenue': int(data.get('revenue', 0)) if data.get('revenue') else None,
-        'address': str(data.get('address', '')).strip() if data.get('address') else None,
-        'si_nm': str(data.get('si_nm', '')).strip() if data.get('si_nm') else None,
-        'sgg_nm': str(data.get('sgg_nm', '')).strip() if data.get('sgg_nm') else None,
+    Returns:
+        dict: Results of the import process
+    """
+    import_task = LeadImportTask.objects.get(task_id=task_id)
+    shards = list(import_task.shards.order_by('index'))
+    incomplete = [shard.index for shard in shards if shard.status != 'completed']
+    if incomplete:
+        import_task.status = 'failed'
+        import_task.errors = {'general': [f"Shards not completed: {incomplete}"]}
+        import_task.completed_at = timezone.now()
+        import_task.save(update_fields=['status', 'completed_at', 'errors', 'updated_at'])
+        return {'status': 'failed', 'errors': import_task.errors['general']}
+
+    error_rows = []
+    offset = 0
+    for shard in shards:
+        error_rows.extend({**row, 'row': row['row'] + offset} for row in shard.errors or [])
+        offset += shard.processed_records
+
+    errors = {}
+    if not import_task.options.get('link_to_list', True):
+        errors['general'] = [lead_list_not_found(import_task.options.get('lead_list_id'))]
+    if error_rows:
+        errors['rows'] = error_rows
+
+    import_task.status = 'completed'
+    import_task.total_records = sum(shard.total_records for shard in shards)
+    import_task.imported_records = sum(shard.imported_records for shard in shards)
+    import_task.error_records = len(error_rows)
+    import_task.errors = errors or None
+    import_task.completed_at = timezone.now()
+    import_task.save(update_fields=[
+        'status', 'total_records', 'imported_records', 'error_records', 'errors',
+        'completed_at', 'updated_at'
+    ])
+
+    # Clean up the temporary file
+    if import_task.file_path and os.path.exists(import_task.file_path):
+        os.remove(import_task.file_path)
+
+    return {
+        'status': 'completed',
+        'total': import_task.total_records,
+        'imported': import_task.imported_records,
+        'errors': errors.get('general', []),
+        'error_rows': error_rows,
+        'completed_at': import_task.completed_at.isoformat()
     }
+
+
+@shared_task(bind=True, max_retries=3)
+def import_salesone_search(self, user_id, params, lead_list_id):
+    """
+    Copy every SalesOne lead matching search_salesone filters into the user's
+    leads and a lead list.
+
+    Matching rows are walked in id order in chunks of LEAD_IMPORT_CHUNK_SIZE;
+    each chunk is copied with one INSERT ... SELECT and linked to the list in
+    the same transaction, so a retry resumes cleanly.
     
-    # Special handling for dates
-    if data.get('established_date'):
-        try:
-            # Convert to datetime and then to date
-            established_date = pd.to_datetime(data['established_date']).date()
-            lead_data['established_date'] = established_date
-        except:
-            lead_data['established_date'] = None
+    Args:
+        user_id: ID of the user receiving the leads
+        params: search_salesone query parameters
+        lead_list_id: ID of the lead list the leads are added to
     
-    # Handle industry if provided
-    if data.get('industry_code'):
-        try:
-            industry = Industry.objects.get(code=data['industry_code'])
-            lead_data['industry'] = industry
-        except Industry.DoesNotExist:
-            pass
+    Returns:
+        dict: Results of the import process
+    """
+    import_task = LeadImportTask.objects.get(task_id=self.request.id)
+    progress = None
+    try:
+        import_task.status = 'processing'
+        import_task.imported_records = 0
+        import_task.error_records = 0
+        import_task.existing_records = 0
+        import_task.errors = None
+        import_task.save(update_fields=[
+            'status', 'imported_records', 'error_records', 'existing_records', 'errors', 'updated_at'
+        ])
+        
+        results = {
+            'total': 0,
+            'imported': 0,
+            'existing': 0,
+            'truncated': False,
+            'status': 'processing',
+            'started_at': timezone.now().isoformat(),
+            'completed_at': None
+        }
+        
+        queryset = filter_salesone_leads(SalesOneLead.objects.all(), params)
+        # The view refuses oversized searches, but SalesOneLead may have grown since
+        max_rows = settings.SALESONE_SEARCH_IMPORT_MAX_ROWS
+        total = queryset[:max_rows + 1].count()
+        if total > max_rows:
+            total = max_rows
+            results['truncated'] = True
+        results['total'] = total
+        progress = ImportProgress(import_task)
+        progress.set_total(total)
+        
+        through = LeadList.leads.through
+        last_id = 0
+        copied = 0
+        while copied < total:
+            chunk_size = min(settings.LEAD_IMPORT_CHUNK_SIZE, total - copied)
+            ids = list(
+                queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            
+            with transaction.atomic():
+                created, existing = copy_salesone_leads(SalesOneLead.objects.filter(id__in=ids), user_id)
+                through.objects.bulk_create(
+                    [through(leadlist_id=lead_list_id, lead_id=lead_id) for lead_id in created + existing],
+                    ignore_conflicts=True
+                )
             
-    return lead_data 
\ No newline at end of file
+            copied += len(ids)
+            results['imported'] += len(created)
+            results['existing'] += len(existing)
+            progress.add(imported=len(created), existing=len(existing))
+        
+        results['status'] = 'completed'
+        results['completed_at'] = timezone.now().isoformat()
+        
+        progress.flush()
+        import_task.status = 'completed'
+        import_task.completed_at = timezone.now()
+        if results['truncated']:
+            import_task.errors = {
+                'general': [f"The search matched more than {max_rows} leads; only the first {max_rows} were imported."]
+            }
+        import_task.save(update_fields=['status', 'completed_at', 'errors', 'updated_at'])
+        progress.finish()
+        return results
+        
+    except Exception as e:
+        import_task.status = 'failed'
+        import_task.errors = {'general': [str(e)]}
+        import_task.completed_at = timezone.now()
+        import_task.save(update_fields=['status', 'completed_at', 'errors', 'updated_at'])
+        if progress:
+            progress.finish()
+            
+        self.retry(exc=e, countdown=60 * 5)  # Retry after 5 minutes
+        return {
+            'status': 'failed',
+            'errors': [str(e)],
+            'completed_at': timezone.now().isoformat()
+        }
+
+
+@shared_task(bind=True, max_retries=3)
+def export_leads(self):
+    """
+    Write a lead list or SalesOne search export registered as a
+    LeadExportTask into a file in default storage.
+
+    The rows are written to a local temporary file first, then stored in
+    one piece, so the worker never holds the export in memory.
+
+    Returns:
+        dict: Results of the export
+    """
+    export_task = LeadExportTask.objects.get(task_id=self.request.id)
+    try:
+        export_task.status = 'processing'
+        export_task.save(update_fields=['status', 'updated_at'])
+
+        if export_task.source == 'lead_list':
+            if export_task.lead_list is None:
+                raise ValueError('The exported lead list no longer exists.')
+            queryset = lead_list_queryset(export_task.lead_list)
+        else:
+            queryset = salesone_search_queryset(export_task.params or {})
+
+        export = LeadExport(queryset, file_type=export_task.file_type)
+        with tempfile.TemporaryFile() as file:
+            rows = export.write(file)
+            file.seek(0)
+            export_task.file.save(f'{uuid.uuid4()}.{export_task.file_type}', File(file), save=False)
+
+        export_task.status = 'completed'
+        export_task.exported_records = rows
+        export_task.total_records = rows
+        export_task.completed_at = timezone.now()
+        export_task.save(update_fields=[
+            'status', 'file', 'exported_records', 'total_records', 'completed_at', 'updated_at'
+        ])
+        return {
+            'status': 'completed',
+            'exported': rows,
+            'completed_at': export_task.completed_at.isoformat()
+        }
+
+    except Exception as e:
+        export_task.status = 'failed'
+        export_task.errors = {'general': [str(e)]}
+        export_task.completed_at = timezone.now()
+        export_task.save(update_fields=['status', 'completed_at', 'errors', 'updated_at'])
+
+        self.retry(exc=e, countdown=60 * 5)  # Retry after 5 minutes
+        return {
+            'status': 'failed',
+            'errors': [str(e)],
+            'completed_at': timezone.now().isoformat()
+        }
+
+
+@shared_task(bind=True, max_retries=3)
+def find_lead_duplicates(self):
+    """
+    Scan a user's leads for duplicates registered as a LeadDedupTask and
+    replace their pending merge proposals.
+
+    Returns:
+        dict: Results of the scan
+    """
+    dedup_task = LeadDedupTask.objects.get(task_id=self.request.id)
+    try:
+        dedup_task.status = 'processing'
+        dedup_task.total_records = Lead.objects.filter(user_id=dedup_task.user_id).count()
+        dedup_task.save(update_fields=['status', 'total_records', 'updated_at'])
+
+        proposals = find_duplicate_leads(dedup_task.user_id)
+
+        dedup_task.status = 'completed'
+        dedup_task.duplicate_records = proposals
+        dedup_task.completed_at = timezone.now()
+        dedup_task.save(update_fields=['status', 'duplicate_records', 'completed_at', 'updated_at'])
+        return {
+            'status': 'completed',
+            'scanned': dedup_task.total_records,
+            'proposals': proposals,
+            'completed_at': dedup_task.completed_at.isoformat()
+        }
+
+    except Exception as e:
+        dedup_task.status = 'failed'
+        dedup_task.errors = {'general': [str(e)]}
+        dedup_task.completed_at = timezone.now()
+        dedup_task.save(update_fields=['status', 'completed_at', 'errors', 'updated_at'])
+
+        self.retry(exc=e, countdown=60 * 5)  # Retry after 5 minutes
+        return {
+            'status': 'failed',
+            'errors': [str(e)],
+            'completed_at': timezone.now().isoformat()
+        }
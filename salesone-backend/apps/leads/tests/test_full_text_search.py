@@ -0,0 +1,77 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth import get_user_model
+from apps.leads.models import Lead, SalesOneLead
+from apps.leads.search import build_search_query
+
+User = get_user_model()
+
+
+class FullTextSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.lead = Lead.objects.create(
+            user=self.user,
+            corporation_number='1101112955908',
+            name='주식회사 넥스파시스템',
+            owner='서종렬',
+            si_nm='서울특별시',
+            sgg_nm='금천구'
+        )
+        Lead.objects.create(
+            user=self.user,
+            corporation_number='1101111713381',
+            name='(주)대우캐리어판매',
+            owner='이경남',
+            si_nm='서울특별시',
+            sgg_nm='영등포구'
+        )
+        self.salesone_lead = SalesOneLead.objects.create(
+            corporation_number='1101112955908',
+            name='주식회사 넥스파시스템',
+            name_eng='NEXPA SYSTEM',
+            industry_name='피부 미용업',
+            si_nm='서울특별시',
+            sgg_nm='금천구'
+        )
+
+    def test_trigger_maintains_search_vector(self):
+        """Test the trigger fills search_vector on insert and update"""
+        self.lead.refresh_from_db()
+        self.assertIn("'넥스'", self.lead.search_vector)
+
+        Lead.objects.filter(id=self.lead.id).update(name='테스트상사')
+        self.lead.refresh_from_db()
+        self.assertIn("'상사'", self.lead.search_vector)
+        self.assertNotIn("'넥스'", self.lead.search_vector)
+
+    def test_build_search_query(self):
+        """Test Hangul words become bigram phrases and others prefixes"""
+        self.assertIsNone(build_search_query('  !! '))
+        query = build_search_query('넥스파 Nexpa')
+        self.assertEqual(query.source_expressions[-1].value, "('넥스' <-> '스파') & ('nexpa':*)")
+
+    def test_lead_list_search_matches_hangul_substring(self):
+        """Test Lead list search finds a Hangul word inside a company name"""
+        response = self.client.get(reverse('leads-list'), {'search': '넥스파'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['name'], '주식회사 넥스파시스템')
+
+    def test_salesone_search_across_columns(self):
+        """Test search_salesone full-text search over name, English name and region"""
+        url = reverse('leads-search-salesone')
+        for term in ('넥스파 금천구', 'nexpa', '미용'):
+            response = self.client.get(url, {'search': term})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), 1, term)
+
+        response = self.client.get(url, {'search': '넥스파 영등포구'})
+        self.assertEqual(len(response.data['results']), 0)
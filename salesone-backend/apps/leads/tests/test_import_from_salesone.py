@@ -0,0 +1,89 @@
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.models import Industry, Lead, SalesOneLead
+
+User = get_user_model()
+
+
+class ImportFromSalesOneTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('leads-import-from-salesone')
+        self.industry = Industry.objects.create(code='J58221', name='시스템 소프트웨어 개발 및 공급업')
+        self.salesone_leads = [
+            SalesOneLead.objects.create(
+                corporation_number=f'11011100000{index:02d}',
+                business_number=f'20681884{index:02d}',
+                name=f'테스트기업 {index}',
+                owner='홍길동',
+                email=f'contact{index}@example.com',
+                homepage=[f'https://example{index}.com'],
+                employee=10 + index,
+                finance_revenue=1000000000 + index,
+                si_nm='서울특별시',
+                sgg_nm='강남구',
+                established_date=date(2010, 1, 1),
+                industry=self.industry,
+            )
+            for index in range(20)
+        ]
+
+    def test_copies_fields(self):
+        """Test SalesOne fields are copied into the user's lead"""
+        salesone_lead = self.salesone_leads[0]
+        response = self.client.post(self.url, {'lead_ids': [salesone_lead.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['count'], 1)
+
+        lead = Lead.objects.get(user=self.user)
+        self.assertEqual(response.data['results'][0]['id'], str(lead.id))
+        self.assertEqual(lead.corporation_number, salesone_lead.corporation_number)
+        self.assertEqual(lead.business_number, salesone_lead.business_number)
+        self.assertEqual(lead.homepage, salesone_lead.homepage)
+        self.assertEqual(lead.employee, salesone_lead.employee)
+        self.assertEqual(lead.revenue, salesone_lead.finance_revenue)
+        self.assertEqual(lead.established_date, salesone_lead.established_date)
+        self.assertEqual(lead.industry, self.industry)
+        self.assertIsNotNone(lead.search_vector)
+
+    def test_created_and_existing_split(self):
+        """Test leads the user already has are returned as existing"""
+        existing = Lead.objects.create(
+            user=self.user,
+            corporation_number=self.salesone_leads[0].corporation_number,
+            name='이미 있는 리드'
+        )
+        lead_ids = [salesone_lead.id for salesone_lead in self.salesone_leads[:3]]
+        response = self.client.post(self.url, {'lead_ids': lead_ids}, format='json')
+
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(response.data['existing_count'], 1)
+        self.assertEqual(response.data['existing_leads'][0]['id'], str(existing.id))
+        self.assertEqual(Lead.objects.filter(user=self.user).count(), 3)
+
+        # Repeating the request creates nothing
+        response = self.client.post(self.url, {'lead_ids': lead_ids}, format='json')
+        self.assertEqual(response.data['count'], 0)
+        self.assertEqual(response.data['existing_count'], 3)
+
+    def test_query_count_independent_of_selection(self):
+        """Test the copy runs in a constant number of queries"""
+        lead_ids = [salesone_lead.id for salesone_lead in self.salesone_leads]
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, {'lead_ids': lead_ids}, format='json')
+        self.assertEqual(response.data['count'], 20)
+
+    def test_invalid_and_unknown_ids(self):
+        """Test invalid ids are rejected and unknown ids return 404"""
+        response = self.client.post(self.url, {'lead_ids': ['not-a-number']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {'lead_ids': [999999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
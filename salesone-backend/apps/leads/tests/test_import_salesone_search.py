@@ -0,0 +1,152 @@
+import uuid
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.models import Lead, LeadImportTask, LeadList, SalesOneLead
+from apps.leads.tasks import import_salesone_search
+
+User = get_user_model()
+
+
+class ImportSalesOneSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('leads-import-salesone-search')
+        for index in range(5):
+            SalesOneLead.objects.create(
+                corporation_number=f'11011100000{index:02d}',
+                name=f'분당 기업 {index}',
+                si_nm='경기도',
+                sgg_nm='성남시 분당구',
+                employee=10 + index,
+            )
+        SalesOneLead.objects.create(
+            corporation_number='1101110000099',
+            name='강남 기업',
+            si_nm='서울특별시',
+            sgg_nm='강남구',
+        )
+        self.params = {'si_nm': '경기도', 'sgg_nm': '성남시 분당구'}
+
+    @patch('apps.leads.views.import_salesone_search.apply_async')
+    def test_enqueues_job(self, apply_async):
+        """Test the endpoint registers the task and enqueues it without ids"""
+        response = self.client.post(
+            self.url, {**self.params, 'lead_list_name': '분당 IT 기업'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['count'], 5)
+
+        lead_list = LeadList.objects.get(user=self.user)
+        self.assertEqual(lead_list.name, '분당 IT 기업')
+        import_task = LeadImportTask.objects.get(task_id=response.data['task_id'])
+        self.assertEqual(import_task.status, 'pending')
+        self.assertEqual(import_task.lead_list, lead_list)
+        apply_async.assert_called_once_with(
+            args=[str(self.user.id), self.params, str(lead_list.id)],
+            task_id=response.data['task_id']
+        )
+
+    @patch('apps.leads.views.import_salesone_search.apply_async')
+    def test_repeated_form_values(self, apply_async):
+        """Test repeated list parameters in a form body are all kept"""
+        response = self.client.post(self.url, {
+            'si_nm__in': ['경기도', '서울특별시'],
+            'lead_list_name': '수도권 기업'
+        })
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['count'], 6)
+        params = apply_async.call_args.kwargs['args'][1]
+        self.assertEqual(params, {'si_nm__in': ['경기도', '서울특별시']})
+
+    @patch('apps.leads.views.import_salesone_search.apply_async')
+    def test_rejects_invalid_requests(self, apply_async):
+        """Test a target list is required and oversized searches are refused"""
+        response = self.client.post(self.url, self.params, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            self.url, {**self.params, 'lead_list_id': str(uuid.uuid4())}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        with override_settings(SALESONE_SEARCH_IMPORT_MAX_ROWS=4):
+            response = self.client.post(
+                self.url, {**self.params, 'lead_list_name': '너무 큰 리스트'}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['max_rows'], 4)
+        self.assertFalse(LeadList.objects.exists())
+        apply_async.assert_not_called()
+
+    @override_settings(LEAD_IMPORT_CHUNK_SIZE=2)
+    def test_job_copies_matching_rows_in_chunks(self):
+        """Test the job copies every matching row into leads and the list"""
+        lead_list = LeadList.objects.create(name='분당 IT 기업', user=self.user)
+        existing = Lead.objects.create(
+            user=self.user, corporation_number='1101110000000', name='이미 있는 리드'
+        )
+        task_id = str(uuid.uuid4())
+        LeadImportTask.objects.create(
+            task_id=task_id, file_name='SalesOne search', file_type='salesone',
+            status='pending', user=self.user, lead_list=lead_list
+        )
+
+        results = import_salesone_search.apply(
+            args=[str(self.user.id), {**self.params, 'employee_min': 11}, str(lead_list.id)],
+            task_id=task_id
+        ).get()
+
+        self.assertEqual(results['total'], 4)
+        self.assertEqual(results['imported'], 4)
+        self.assertEqual(results['existing'], 0)
+
+        results = import_salesone_search.apply(
+            args=[str(self.user.id), self.params, str(lead_list.id)],
+            task_id=task_id
+        ).get()
+        self.assertEqual(results['total'], 5)
+        self.assertEqual(results['imported'], 0)
+        self.assertEqual(results['existing'], 5)
+
+        self.assertEqual(Lead.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(lead_list.leads.count(), 5)
+        self.assertIn(existing, lead_list.leads.all())
+        self.assertFalse(lead_list.leads.filter(si_nm='서울특별시').exists())
+
+        import_task = LeadImportTask.objects.get(task_id=task_id)
+        self.assertEqual(import_task.status, 'completed')
+        self.assertEqual(import_task.total_records, 5)
+        self.assertEqual(import_task.imported_records, 0)
+        self.assertEqual(import_task.existing_records, 5)
+
+        response = self.client.get(reverse('leads-import-status', kwargs={'task_id': task_id}))
+        self.assertEqual(response.data['progress'], 100)
+
+    @override_settings(SALESONE_SEARCH_IMPORT_MAX_ROWS=3)
+    def test_job_records_truncation(self):
+        """Test a search that grew past the limit after it was accepted is reported as truncated"""
+        lead_list = LeadList.objects.create(name='분당 IT 기업', user=self.user)
+        task_id = str(uuid.uuid4())
+        LeadImportTask.objects.create(
+            task_id=task_id, file_name='SalesOne search', file_type='salesone',
+            status='pending', user=self.user, lead_list=lead_list
+        )
+
+        results = import_salesone_search.apply(
+            args=[str(self.user.id), self.params, str(lead_list.id)],
+            task_id=task_id
+        ).get()
+        self.assertTrue(results['truncated'])
+        self.assertEqual(results['total'], 3)
+        self.assertEqual(lead_list.leads.count(), 3)
+        import_task = LeadImportTask.objects.get(task_id=task_id)
+        self.assertEqual(import_task.status, 'completed')
+        self.assertIn('only the first 3', import_task.errors['general'][0])
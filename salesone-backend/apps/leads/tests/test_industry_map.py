@@ -0,0 +1,73 @@
+from unittest.mock import patch
+from django.db import transaction
+from django.test import TestCase
+from apps.leads.industries import IndustryMap
+from apps.leads.models import Industry
+
+
+class IndustryMapTests(TestCase):
+    def setUp(self):
+        self.software = Industry.objects.create(code='J58221', name='시스템 소프트웨어 개발 및 공급업')
+        self.retail = Industry.objects.create(code='G47312', name='전자상거래 소매업')
+        self.industry_map = IndustryMap()
+
+    def test_loaded_once(self):
+        """Test codes are resolved from memory after the first load"""
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.industry_map.resolve_codes(['J58221', 'G47312']),
+                {'J58221': self.software.id, 'G47312': self.retail.id}
+            )
+        with self.assertNumQueries(0):
+            self.industry_map.resolve_codes(['J58221'] * 1000)
+            self.assertEqual(self.industry_map.get(self.retail.id), self.retail)
+            self.assertEqual(
+                self.industry_map.names()['시스템소프트웨어개발및공급업'],
+                self.software.id
+            )
+
+    def test_unknown_codes_are_cached(self):
+        """Test unknown codes are queried once and the negative cache is bounded"""
+        self.industry_map.resolve_codes([])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.industry_map.resolve_codes(['X00000']), {})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.industry_map.resolve_codes(['X00000']), {})
+
+        small_map = IndustryMap(negative_cache_size=2)
+        small_map.resolve_codes(['X00001', 'X00002', 'X00003'])
+        self.assertEqual(len(small_map.unknown_codes), 2)
+
+    def test_refreshed_when_table_changes(self):
+        """Test saving an industry makes the map reload"""
+        self.industry_map.resolve_codes(['J58221'])
+        self.software.name = '응용 소프트웨어 개발 및 공급업'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.software.save()
+
+        self.assertIn('응용소프트웨어개발및공급업', self.industry_map.names())
+        self.assertEqual(self.industry_map.get(self.software.id).name, '응용 소프트웨어 개발 및 공급업')
+
+    def test_new_codes_found_without_reload(self):
+        """Test codes added without a version bump are still resolved"""
+        self.industry_map.resolve_codes([])
+        Industry.objects.bulk_create([Industry(code='C26110', name='전자집적회로 제조업')])
+        self.assertIn('C26110', self.industry_map.resolve_codes(['C26110']))
+
+    def test_invalidated_on_commit_only(self):
+        """Test a rolled-back save keeps the map and a cache outage does not fail a save"""
+        self.industry_map.resolve_codes([])
+        with patch('apps.leads.industries.cache.set') as cache_set:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        self.retail.save()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+            cache_set.assert_not_called()
+
+            cache_set.side_effect = ConnectionError('cache is down')
+            with self.captureOnCommitCallbacks(execute=True):
+                self.retail.save()
+            cache_set.assert_called_once()
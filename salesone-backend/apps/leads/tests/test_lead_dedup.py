@@ -0,0 +1,132 @@
+from datetime import timedelta
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.dedup import find_duplicate_leads
+from apps.leads.models import Lead, LeadDedupTask, LeadDuplicate
+from apps.leads.tasks import find_lead_duplicates
+
+User = get_user_model()
+
+
+class LeadDedupTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.count = 0
+
+    def lead(self, name, user=None, **fields):
+        self.count += 1
+        return Lead.objects.create(
+            user=user or self.user,
+            corporation_number=f'11011100000{self.count:02d}',
+            name=name,
+            **fields
+        )
+
+    def proposals(self):
+        return {
+            (proposal.lead.name, proposal.duplicate.name): proposal
+            for proposal in LeadDuplicate.objects.filter(user=self.user).select_related('lead', 'duplicate')
+        }
+
+    def test_blocks_and_scores_candidates(self):
+        """Test leads sharing a normalized key are proposed when their names match"""
+        older = self.lead('(주)에이비씨', phone='+82 2-555-1234')
+        newer = self.lead('에이비씨 주식회사', phone='02-555-1234')
+        Lead.objects.filter(id=older.id).update(created_at=timezone.now() - timedelta(days=1))
+        # Same business number under an English name
+        self.lead('한빛소프트', business_number='1234567890')
+        self.lead('Hanbit Soft Co., Ltd.', business_number='1234567890')
+        # Same company domain but different companies
+        self.lead('가나 물산', email='sales@group.co.kr')
+        self.lead('다라 전자', email='info@group.co.kr')
+        # Free mail is not a key, however similar the names
+        self.lead('마바 상사', email='mb@naver.com')
+        self.lead('마바 상사', email='mb2@naver.com')
+        # Another user's copy is never compared
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.lead('에이비씨', user=other, phone='025551234')
+
+        self.assertEqual(find_duplicate_leads(self.user.id), 2)
+        proposals = self.proposals()
+        self.assertEqual(set(proposals), {
+            ('(주)에이비씨', '에이비씨 주식회사'),
+            ('한빛소프트', 'Hanbit Soft Co., Ltd.'),
+        })
+        proposal = proposals[('(주)에이비씨', '에이비씨 주식회사')]
+        self.assertEqual((proposal.lead_id, proposal.duplicate_id), (older.id, newer.id))
+        self.assertEqual(proposal.score, 1.0)
+        self.assertEqual(proposal.matched_on, ['phone'])
+        self.assertEqual(proposals[('한빛소프트', 'Hanbit Soft Co., Ltd.')].matched_on, ['business_number'])
+
+    def test_rescan_keeps_dismissed_proposals(self):
+        """Test a rescan replaces pending proposals and does not repeat dismissed ones"""
+        self.lead('에이비씨', phone='02-555-1234', email='a@abc.co.kr')
+        self.lead('에이비씨 (주)', phone='025551234', email='b@abc.co.kr')
+        self.lead('디이에프', phone='02-777-0000')
+        # Excel drops the leading zero of a phone number typed as a number
+        self.lead('디이에프', phone='27770000')
+        find_duplicate_leads(self.user.id)
+        proposals = self.proposals()
+        self.assertEqual(proposals[('에이비씨', '에이비씨 (주)')].matched_on, ['email_domain', 'phone'])
+        dismissed = proposals[('디이에프', '디이에프')]
+        LeadDuplicate.objects.filter(id=dismissed.id).update(status='dismissed')
+
+        self.assertEqual(find_duplicate_leads(self.user.id), 1)
+        self.assertEqual(LeadDuplicate.objects.filter(user=self.user).count(), 2)
+        self.assertTrue(LeadDuplicate.objects.filter(id=dismissed.id, status='dismissed').exists())
+
+    @override_settings(LEAD_DEDUP_MAX_BLOCK_SIZE=2)
+    def test_skips_oversized_blocks(self):
+        """Test keys shared by more leads than the block limit are ignored"""
+        for _ in range(3):
+            self.lead('대표번호 기업', phone='1588-0000')
+        self.assertEqual(find_duplicate_leads(self.user.id), 0)
+
+    @patch('apps.leads.views.find_lead_duplicates.apply_async')
+    def test_dedup_endpoints(self, apply_async):
+        """Test scanning in the background, listing and dismissing proposals"""
+        self.lead('에이비씨', phone='02-555-1234')
+        self.lead('(주)에이비씨', phone='02-555-1234')
+
+        response = self.client.post(reverse('leads-find-duplicates'))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        task_id = response.data['task_id']
+        apply_async.assert_called_once_with(task_id=task_id)
+        status_url = reverse('leads-dedup-status', kwargs={'task_id': task_id})
+        self.assertEqual(self.client.get(status_url).data['status'], 'pending')
+
+        results = find_lead_duplicates.apply(task_id=task_id).get()
+        self.assertEqual(results['proposals'], 1)
+        response = self.client.get(status_url)
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(response.data['total_records'], 2)
+        self.assertEqual(response.data['duplicate_records'], 1)
+
+        response = self.client.get(reverse('leads-duplicates'))
+        self.assertEqual(response.data['count'], 1)
+        proposal = response.data['results'][0]
+        self.assertEqual(proposal['lead']['name'], '에이비씨')
+        self.assertEqual(proposal['duplicate']['name'], '(주)에이비씨')
+
+        dismiss_url = reverse('leads-dismiss-duplicate', kwargs={'proposal_id': proposal['id']})
+        self.assertEqual(self.client.post(dismiss_url).data['status'], 'dismissed')
+        self.assertEqual(self.client.get(reverse('leads-duplicates')).data['count'], 0)
+        response = self.client.get(reverse('leads-duplicates'), {'status': 'dismissed'})
+        self.assertEqual(response.data['count'], 1)
+        response = self.client.get(reverse('leads-duplicates'), {'status': 'merged'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(status_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.post(dismiss_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(LeadDedupTask.objects.filter(user=self.user).count(), 1)
@@ -0,0 +1,170 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.test import override_settings
+from django.urls import reverse
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.importers import LeadFileImporter
+from apps.leads.models import Industry, Lead, LeadExportTask, LeadList, SalesOneLead
+from apps.leads.tasks import export_leads
+
+User = get_user_model()
+
+
+def read_csv(content):
+    return list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+
+
+class LeadExportTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.industry = Industry.objects.create(code='J62', name='소프트웨어 개발')
+        self.lead_list = LeadList.objects.create(name='IT 기업', user=self.user)
+        for index in range(5):
+            lead = Lead.objects.create(
+                user=self.user,
+                corporation_number=f'11011100000{index:02d}',
+                name=f'기업 {index}',
+                homepage=[f'https://example{index}.com'],
+                employee=10 + index,
+                revenue=index * 1000000,
+                established_date=date(2010, 1, index + 1),
+                industry=self.industry,
+            )
+            self.lead_list.leads.add(lead)
+        Lead.objects.create(user=self.user, corporation_number='1101110000099', name='리스트 밖 기업')
+        self.export_url = reverse('lead-lists-export', kwargs={'id': self.lead_list.id})
+
+        for index in range(3):
+            SalesOneLead.objects.create(
+                corporation_number=f'21011100000{index:02d}',
+                name=f'분당 기업 {index}',
+                si_nm='경기도',
+                sgg_nm='성남시 분당구',
+                finance_revenue=index,
+                industry=self.industry,
+            )
+        SalesOneLead.objects.create(corporation_number='2101110000099', name='강남 기업', si_nm='서울특별시')
+
+    def test_streams_lead_list_csv(self):
+        """Test a lead list is streamed as CSV in the import file format"""
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertIn('attachment', response['Content-Disposition'])
+
+        content = b''.join(response.streaming_content)
+        rows = read_csv(content)
+        self.assertEqual(rows[0][:3], ['corporation_number', 'business_number', 'name'])
+        self.assertEqual(len(rows), 6)
+        record = dict(zip(rows[0], rows[1]))
+        self.assertEqual(record['name'], '기업 0')
+        self.assertEqual(record['homepage'], 'https://example0.com')
+        self.assertEqual(record['established_date'], '2010-01-01')
+        self.assertEqual(record['industry_code'], 'J62')
+
+        # The file imports back without errors
+        file_path = os.path.join(self.media_root, 'export.csv')
+        with open(file_path, 'wb') as file:
+            file.write(content)
+        Lead.objects.all().delete()
+        importer = LeadFileImporter(file_path, str(self.user.id))
+        leads, errors = importer.transform(next(importer.iter_chunks()))
+        self.assertEqual(errors, [])
+        self.assertEqual(list(leads['industry_id']), [self.industry.id] * 5)
+
+    def test_lead_list_xlsx(self):
+        """Test a lead list is exported as an xlsx workbook"""
+        response = self.client.get(self.export_url, {'file_type': 'xlsx'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][rows[0].index('employee')], 10)
+
+    def test_rejects_invalid_requests(self):
+        """Test unknown file types and other users' lists are refused"""
+        response = self.client.get(self.export_url, {'file_type': 'pdf'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=other)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_streams_salesone_search(self):
+        """Test a SalesOne search is exported in search order with its filters"""
+        response = self.client.get(
+            reverse('leads-export-salesone-search'),
+            {'si_nm': '경기도', 'sort': '-finance_revenue'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = read_csv(b''.join(response.streaming_content))
+        self.assertEqual([row[2] for row in rows[1:]], ['분당 기업 2', '분당 기업 1', '분당 기업 0'])
+        self.assertEqual(rows[1][rows[0].index('revenue')], '2')
+
+    @override_settings(LEAD_EXPORT_STREAM_MAX_ROWS=4)
+    @patch('apps.leads.views.export_leads.apply_async')
+    def test_large_export_runs_in_background(self, apply_async):
+        """Test exports over the streaming limit become a downloadable task"""
+        response = self.client.get(self.export_url, {'file_type': 'xlsx'})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        task_id = response.data['task_id']
+        apply_async.assert_called_once_with(task_id=task_id)
+
+        status_url = reverse('leads-export-status', kwargs={'task_id': task_id})
+        download_url = reverse('leads-export-download', kwargs={'task_id': task_id})
+        self.assertEqual(self.client.get(status_url).data['status'], 'pending')
+        self.assertEqual(self.client.get(download_url).status_code, status.HTTP_409_CONFLICT)
+
+        results = export_leads.apply(task_id=task_id).get()
+        self.assertEqual(results['exported'], 5)
+
+        response = self.client.get(status_url)
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertTrue(response.data['download_url'].endswith(download_url))
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('IT', response['Content-Disposition'])
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(workbook.active.max_row, 6)
+
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(download_url).status_code, status.HTTP_404_NOT_FOUND)
+
+    @patch('apps.leads.views.export_leads.apply_async')
+    def test_background_salesone_export(self, apply_async):
+        """Test background SalesOne exports keep repeated list parameters"""
+        response = self.client.get(
+            reverse('leads-export-salesone-search'),
+            {'si_nm__in': ['경기도', '서울특별시'], 'background': 'true'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        export_task = LeadExportTask.objects.get(task_id=response.data['task_id'])
+        self.assertEqual(export_task.params, {'si_nm__in': ['경기도', '서울특별시']})
+
+        export_leads.apply(task_id=export_task.task_id).get()
+        export_task.refresh_from_db()
+        self.assertEqual(export_task.exported_records, 4)
+        with export_task.file.open('rb') as file:
+            rows = read_csv(file.read())
+        self.assertEqual(len(rows), 5)
@@ -0,0 +1,391 @@
+import csv
+import io
+import os
+import tempfile
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from openpyxl import Workbook
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.importers import LeadFileImporter, split_csv_records
+from apps.leads.models import Industry, Lead, LeadImportTask, LeadList
+from apps.leads.progress import ImportProgress, progress_cache_key
+from apps.leads.tasks import process_lead_file_import
+
+User = get_user_model()
+
+HEADER = ['corporation_number', 'name', 'employee', 'revenue', 'homepage', 'established_date', 'industry_code']
+ROWS = [
+    ['1101110000001', '첫번째 회사', '12', '1000000000', 'first.co.kr', '2015-03-01', 'J58221'],
+    ['1101110000002', '', '5', '', '', '', ''],
+    ['1101110000003', '세번째 회사', 'many', '', '', '', ''],
+    ['1101110000001', '중복 회사', '', '', '', '', ''],
+    ['1101110000004', '기존 회사', '', '', '', '', ''],
+    ['1101110000005', '다섯번째 회사', '', '', '', 'not a date', 'UNKNOWN'],
+]
+
+
+@override_settings(LEAD_IMPORT_CHUNK_SIZE=2)
+class LeadFileImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.industry = Industry.objects.create(code='J58221', name='시스템 소프트웨어 개발 및 공급업')
+        self.lead_list = LeadList.objects.create(name='Import List', user=self.user)
+        Lead.objects.create(user=self.user, corporation_number='1101110000004', name='기존 회사')
+        self.upload_dir = tempfile.mkdtemp()
+
+    def write_csv(self, header, rows):
+        path = os.path.join(self.upload_dir, 'leads.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return path
+
+    def write_xlsx(self, header, rows):
+        path = os.path.join(self.upload_dir, 'leads.xlsx')
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+        workbook.save(path)
+        return path
+
+    def run_import(self, path, file_type, options=None):
+        options = options or {'lead_list_id': str(self.lead_list.id)}
+        return process_lead_file_import.apply(
+            args=[path, str(self.user.id), file_type, options]
+        ).get()
+
+    def assert_imported(self, results):
+        self.assertEqual(results['status'], 'completed')
+        self.assertEqual(results['total'], 6)
+        self.assertEqual(results['imported'], 2)
+        self.assertEqual(
+            {(row['row'], row['error']) for row in results['error_rows']},
+            {
+                (3, 'Missing required field: name'),
+                (4, 'Invalid employee: many'),
+                (5, 'Duplicate corporation number in file: 1101110000001'),
+                (6, 'Lead already exists: 1101110000004'),
+            }
+        )
+
+        lead = Lead.objects.get(corporation_number='1101110000001')
+        self.assertEqual(lead.name, '첫번째 회사')
+        self.assertEqual(lead.employee, 12)
+        self.assertEqual(lead.revenue, 1000000000)
+        self.assertEqual(lead.homepage, ['first.co.kr'])
+        self.assertEqual(str(lead.established_date), '2015-03-01')
+        self.assertEqual(lead.industry, self.industry)
+
+        other = Lead.objects.get(corporation_number='1101110000005')
+        self.assertEqual(other.employee, 1)
+        self.assertIsNone(other.established_date)
+        self.assertIsNone(other.industry)
+
+        self.assertEqual(
+            set(self.lead_list.leads.values_list('corporation_number', flat=True)),
+            {'1101110000001', '1101110000005'}
+        )
+
+        import_task = LeadImportTask.objects.get(user=self.user)
+        self.assertIsNone(cache.get(progress_cache_key(import_task.task_id)))
+        self.assertEqual(import_task.status, 'completed')
+        self.assertEqual(import_task.total_records, 6)
+        self.assertEqual(import_task.imported_records, 2)
+        self.assertEqual(import_task.error_records, 4)
+
+    def test_csv_import_in_chunks(self):
+        """Test CSV rows are validated and inserted chunk by chunk"""
+        self.assert_imported(self.run_import(self.write_csv(HEADER, ROWS), 'csv'))
+
+    def test_xlsx_import_in_chunks(self):
+        """Test xlsx files are streamed in read-only mode"""
+        self.assert_imported(self.run_import(self.write_xlsx(HEADER, ROWS), 'excel'))
+
+    def test_concurrent_import_duplicates(self):
+        """Test a lead inserted by another import after validation is reported, not the whole chunk"""
+        path = self.write_csv(['corporation_number', 'name'], [['1201110000001', '가'], ['1201110000002', '나']])
+        importer = LeadFileImporter(path, str(self.user.id), options={'lead_list_id': str(self.lead_list.id)})
+        chunk = next(importer.iter_chunks())
+        leads, _ = importer.transform(chunk)
+        Lead.objects.create(user=self.user, corporation_number='1201110000002', name='다른 가져오기')
+
+        imported, error_rows = importer.insert(chunk, leads)
+        self.assertEqual(imported, 1)
+        self.assertEqual(
+            [(row['row'], row['error']) for row in error_rows],
+            [(3, 'Lead already exists: 1201110000002')]
+        )
+        self.assertEqual(list(self.lead_list.leads.values_list('name', flat=True)), ['가'])
+
+    def test_column_mapping(self):
+        """Test file columns are mapped to lead fields"""
+        path = self.write_csv(['법인번호', '회사명', '이메일'], [['1101110000009', '매핑 회사', 'a@b.com']])
+        results = self.run_import(path, 'csv', {
+            'column_mapping': {'corporation_number': '법인번호', 'name': '회사명', 'email': '이메일'}
+        })
+        self.assertEqual(results['imported'], 1)
+        lead = Lead.objects.get(corporation_number='1101110000009')
+        self.assertEqual(lead.name, '매핑 회사')
+        self.assertEqual(lead.email, 'a@b.com')
+
+
+class ImportProgressTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.import_task = LeadImportTask.objects.create(
+            task_id='progress-task',
+            file_name='leads.csv',
+            file_type='csv',
+            status='processing',
+            user=self.user,
+            total_records=100
+        )
+        self.addCleanup(cache.delete, progress_cache_key(self.import_task.task_id))
+
+    def stored_counts(self):
+        return LeadImportTask.objects.values_list('imported_records', 'error_records').get()
+
+    def test_counters_are_batched_by_rows(self):
+        """Test counters are written only once a batch of rows is due"""
+        progress = ImportProgress(self.import_task, row_interval=10, time_interval=3600)
+        with self.assertNumQueries(0):
+            progress.add(imported=4)
+            progress.add(imported=3, errors=1)
+        self.assertEqual(self.stored_counts(), (0, 0))
+
+        with self.assertNumQueries(1):
+            progress.add(imported=2)
+        self.assertEqual(self.stored_counts(), (9, 1))
+
+    def test_counters_are_batched_by_time(self):
+        """Test a due time interval flushes a partial batch"""
+        progress = ImportProgress(self.import_task, row_interval=1000, time_interval=0)
+        progress.add(imported=1)
+        self.assertEqual(self.stored_counts(), (1, 0))
+
+    def test_increments_do_not_overwrite_other_writers(self):
+        """Test counters are incremented rather than overwritten"""
+        ImportProgress(self.import_task, row_interval=1).add(imported=5)
+        other = LeadImportTask.objects.get(pk=self.import_task.pk)
+        ImportProgress(other, row_interval=1).add(imported=2, errors=1)
+        self.assertEqual(self.stored_counts(), (7, 1))
+
+    def test_import_status_served_from_cache(self):
+        """Test polling a running import does not query the database"""
+        progress = ImportProgress(self.import_task, row_interval=1000, time_interval=3600)
+        progress.add(imported=40, errors=2)
+        url = reverse('leads-import-status', kwargs={'task_id': self.import_task.task_id})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.data['status'], 'processing')
+        self.assertEqual(response.data['imported_records'], 40)
+        self.assertEqual(response.data['error_records'], 2)
+        self.assertEqual(response.data['progress'], 40)
+
+        progress.finish()
+        response = self.client.get(url)
+        self.assertEqual(response.data['imported_records'], 40)
+
+    def test_import_status_checks_owner(self):
+        """Test cached progress is not served to other users"""
+        ImportProgress(self.import_task).publish()
+        other_user = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=other_user)
+        response = self.client.get(
+            reverse('leads-import-status', kwargs={'task_id': self.import_task.task_id})
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class EagerChord:
+    """Stands in for celery.chord: runs the header, then the callback if every task succeeded."""
+
+    def __init__(self):
+        self.headers = []
+
+    def __call__(self, header):
+        header = list(header)
+        self.headers.append([signature.args[0] for signature in header])
+
+        def run(callback):
+            results = [signature.apply() for signature in header]
+            if all(result.successful() for result in results):
+                callback.apply()
+        return run
+
+
+@override_settings(LEAD_IMPORT_CHUNK_SIZE=2, LEAD_IMPORT_SHARD_BYTES=100)
+class ShardedLeadFileImportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.lead_list = LeadList.objects.create(name='Import List', user=self.user)
+        self.upload_dir = tempfile.mkdtemp()
+        self.chord = EagerChord()
+        patcher = patch('apps.leads.tasks.chord', self.chord)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_csv(self, header, rows):
+        path = os.path.join(self.upload_dir, 'leads.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return path
+
+    def run_import(self, path):
+        return process_lead_file_import.apply(
+            args=[path, str(self.user.id), 'csv', {'lead_list_id': str(self.lead_list.id)}]
+        )
+
+    def test_split_csv_records(self):
+        """Test shards end on record boundaries, not on newlines inside quotes"""
+        rows = [['1', '첫 줄\n둘째 줄'], ['2', 'say "hi"\nbye'], ['3', 'plain']]
+        path = self.write_csv(['id', 'text'], rows)
+        header_end, ranges = split_csv_records(path, 1)
+        self.assertEqual(len(ranges), 3)
+        self.assertEqual(ranges[0][0], header_end)
+        self.assertEqual(ranges[-1][1], os.path.getsize(path))
+
+        with open(path, 'rb') as csv_file:
+            content = csv_file.read()
+        for (start, end), row in zip(ranges, rows):
+            records = list(csv.reader(io.StringIO(content[start:end].decode('utf-8'))))
+            self.assertEqual(records, [row])
+
+    @override_settings(LEAD_IMPORT_SHARD_BYTES=40)
+    def test_sharded_import(self):
+        """Test a large CSV is imported in shards and reconciled into one result"""
+        path = self.write_csv(HEADER, ROWS)
+        industry = Industry.objects.create(code='J58221', name='시스템 소프트웨어 개발 및 공급업')
+        Lead.objects.create(user=self.user, corporation_number='1101110000004', name='기존 회사')
+        self.run_import(path)
+
+        import_task = LeadImportTask.objects.get(user=self.user)
+        self.assertGreater(import_task.shards.count(), 2)
+        self.assertEqual(import_task.status, 'completed')
+        self.assertEqual(import_task.total_records, 6)
+        self.assertEqual(import_task.imported_records, 2)
+        self.assertEqual(import_task.error_records, 4)
+        # Shards commit independently, so a corporation number repeated in a
+        # later shard is found in the database
+        self.assertEqual(
+            {(row['row'], row['error']) for row in import_task.errors['rows']},
+            {
+                (3, 'Missing required field: name'),
+                (4, 'Invalid employee: many'),
+                (5, 'Lead already exists: 1101110000001'),
+                (6, 'Lead already exists: 1101110000004'),
+            }
+        )
+        self.assertEqual(Lead.objects.get(corporation_number='1101110000001').industry, industry)
+        self.assertEqual(
+            set(self.lead_list.leads.values_list('corporation_number', flat=True)),
+            {'1101110000001', '1101110000005'}
+        )
+        self.assertFalse(os.path.exists(path))
+
+    def test_concurrent_shard_duplicates(self):
+        """Test a lead inserted by another shard after validation is reported, not linked"""
+        path = self.write_csv(['corporation_number', 'name'], [['1201110000001', '가'], ['1201110000002', '나']])
+        importer = LeadFileImporter(path, str(self.user.id), options={'lead_list_id': str(self.lead_list.id)})
+        chunk = next(importer.iter_chunks())
+        leads, _ = importer.transform(chunk)
+        Lead.objects.create(user=self.user, corporation_number='1201110000002', name='다른 샤드')
+
+        imported, error_rows = importer.insert_shard(chunk, leads)
+        self.assertEqual(imported, 1)
+        self.assertEqual(
+            [(row['row'], row['error']) for row in error_rows],
+            [(3, 'Duplicate corporation number in file: 1201110000002')]
+        )
+        self.assertEqual(list(self.lead_list.leads.values_list('name', flat=True)), ['가'])
+
+    def test_failed_shard_is_retried_alone(self):
+        """Test retrying a failed import re-runs only its unfinished shard, from its last chunk"""
+        rows = [[f'12011100000{index:02d}', f'회사 {index:02d}'] for index in range(12)]
+        # Repeats row 5, committed in the failed shard's first chunk
+        rows[8] = ['1201110000005', '중복 05']
+        path = self.write_csv(['corporation_number', 'name'], rows)
+        insert_shard = LeadFileImporter.insert_shard
+
+        def failing_insert_shard(importer, raw, leads, link_to_list=True):
+            if '1201110000007' in set(leads['corporation_number']):
+                raise RuntimeError('database went away')
+            return insert_shard(importer, raw, leads, link_to_list=link_to_list)
+
+        with patch.object(LeadFileImporter, 'insert_shard', autospec=True, side_effect=failing_insert_shard):
+            self.run_import(path)
+
+        import_task = LeadImportTask.objects.get(user=self.user)
+        self.assertEqual(import_task.status, 'failed')
+        # Counted when the shards were created, not again by each attempt
+        self.assertEqual(import_task.total_records, 12)
+        self.assertEqual([shard.total_records for shard in import_task.shards.all()], [5, 5, 2])
+        failed = import_task.shards.get(status='failed')
+        self.assertEqual(failed.processed_records, 2)
+        self.assertEqual(import_task.shards.filter(status='completed').count(), 2)
+        self.assertEqual(Lead.objects.filter(user=self.user).count(), 9)
+        self.assertEqual(import_task.shards.get(index=0).end_byte, failed.start_byte)
+
+        response = self.client.get(reverse('leads-import-status', kwargs={'task_id': import_task.task_id}))
+        self.assertEqual([shard['status'] for shard in response.data['shards']], ['completed', 'failed', 'completed'])
+
+        url = reverse('leads-import-retry', kwargs={'task_id': import_task.task_id})
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['shards'], 1)
+        self.assertEqual(self.chord.headers[-1], [str(failed.id)])
+
+        import_task.refresh_from_db()
+        self.assertEqual(import_task.status, 'completed')
+        self.assertEqual(import_task.total_records, 12)
+        self.assertEqual(import_task.imported_records, 11)
+        self.assertEqual(
+            [(row['row'], row['error']) for row in import_task.errors['rows']],
+            [(10, 'Duplicate corporation number in file: 1201110000005')]
+        )
+        self.assertEqual(self.lead_list.leads.count(), 11)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_409_CONFLICT)
+
+    def test_missing_lead_list(self):
+        """Test sharded and serial imports report a missing lead list the same way"""
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        lead_list = LeadList.objects.create(name='Other List', user=other)
+        rows = [[f'12011100000{index:02d}', f'회사 {index:02d}'] for index in range(6)]
+        expected = {'general': [f"Lead list with ID {lead_list.id} not found."]}
+
+        for shard_bytes in (50, 10 * 1024 * 1024):
+            Lead.objects.filter(user=self.user).delete()
+            LeadImportTask.objects.filter(user=self.user).delete()
+            path = self.write_csv(['corporation_number', 'name'], rows)
+            with override_settings(LEAD_IMPORT_SHARD_BYTES=shard_bytes):
+                process_lead_file_import.apply(
+                    args=[path, str(self.user.id), 'csv', {'lead_list_id': str(lead_list.id)}]
+                )
+
+            import_task = LeadImportTask.objects.get(user=self.user)
+            self.assertEqual(import_task.status, 'completed')
+            self.assertEqual(import_task.imported_records, 6)
+            self.assertEqual(import_task.errors, expected)
+            self.assertEqual(import_task.shards.exists(), shard_bytes == 50)
+            self.assertFalse(lead_list.leads.exists())
@@ -0,0 +1,95 @@
+import uuid
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.models import Lead, LeadList
+
+User = get_user_model()
+
+
+class LeadListCombineTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('lead-lists-combine')
+        self.leads = [
+            Lead.objects.create(
+                user=self.user,
+                corporation_number=f'11011100000{index:02d}',
+                name=f'기업 {index}'
+            )
+            for index in range(6)
+        ]
+        # a: 0-3, b: 2-4, c: 3-5
+        self.lists = []
+        for name, members in (('a', self.leads[0:4]), ('b', self.leads[2:5]), ('c', self.leads[3:6])):
+            lead_list = LeadList.objects.create(name=name, user=self.user)
+            lead_list.leads.add(*members)
+            self.lists.append(lead_list)
+
+    def combine(self, operation, lists, **data):
+        return self.client.post(self.url, {
+            'operation': operation,
+            'lead_list_ids': [str(lead_list.id) for lead_list in lists],
+            **data
+        }, format='json')
+
+    def member_names(self, lead_list_id):
+        return sorted(LeadList.objects.get(id=lead_list_id).leads.values_list('name', flat=True))
+
+    def test_preview(self):
+        """Test a preview counts every operation and creates nothing"""
+        response = self.combine('union', self.lists, preview=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual(response.data['total_members'], 10)
+        self.assertEqual(response.data['duplicates'], 4)
+        self.assertEqual(response.data['intersection'], 1)
+        self.assertEqual(response.data['difference'], 2)
+        self.assertEqual(LeadList.objects.count(), 3)
+
+    def test_creates_combined_lists(self):
+        """Test union, intersection and difference lists are materialized"""
+        expected = {
+            'union': ['기업 0', '기업 1', '기업 2', '기업 3', '기업 4', '기업 5'],
+            'intersection': ['기업 3'],
+            'difference': ['기업 0', '기업 1'],
+        }
+        for operation, names in expected.items():
+            response = self.combine(operation, self.lists, name=f'{operation} 리스트')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data['name'], f'{operation} 리스트')
+            self.assertEqual(response.data['leads_count'], len(names))
+            self.assertEqual(response.data['added'], len(names))
+            self.assertEqual(self.member_names(response.data['id']), names)
+
+        # The difference is taken from the first list
+        response = self.combine('difference', [self.lists[1], self.lists[0]], name='b - a')
+        self.assertEqual(self.member_names(response.data['id']), ['기업 4'])
+
+    def test_rejects_invalid_requests(self):
+        """Test bad operations, too few lists, other users' lists and missing names"""
+        self.assertEqual(self.combine('xor', self.lists, name='x').status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.combine('union', [self.lists[0], self.lists[0]], name='x')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            self.url, {'operation': 'union', 'lead_list_ids': ['1', '2'], 'name': 'x'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.combine('union', self.lists).status_code, status.HTTP_400_BAD_REQUEST)
+
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        foreign = LeadList.objects.create(name='foreign', user=other)
+        response = self.combine('union', [self.lists[0], foreign], name='x')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.post(self.url, {
+            'operation': 'union',
+            'lead_list_ids': [str(self.lists[0].id), str(uuid.uuid4())],
+            'preview': True
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(LeadList.objects.filter(user=self.user).count(), 3)
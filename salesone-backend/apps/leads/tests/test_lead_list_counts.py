@@ -0,0 +1,97 @@
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.importers import LeadFileImporter
+from apps.leads.models import Lead, LeadList
+
+User = get_user_model()
+
+
+class LeadListCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.lead_list = LeadList.objects.create(name='IT 기업', user=self.user)
+        self.leads = [
+            Lead.objects.create(
+                user=self.user,
+                corporation_number=f'11011100000{index:02d}',
+                name=f'기업 {index}'
+            )
+            for index in range(5)
+        ]
+
+    def leads_count(self, lead_list=None):
+        return LeadList.objects.get(id=(lead_list or self.lead_list).id).leads_count
+
+    def test_add_and_remove_leads(self):
+        """Test add_leads/remove_leads keep the count, ignoring existing members"""
+        url = reverse('lead-lists-add-leads', kwargs={'id': self.lead_list.id})
+        ids = [str(lead.id) for lead in self.leads[:3]]
+        self.client.post(url, {'lead_ids': ids}, format='json')
+        self.assertEqual(self.leads_count(), 3)
+        self.client.post(url, {'lead_ids': [str(lead.id) for lead in self.leads]}, format='json')
+        self.assertEqual(self.leads_count(), 5)
+
+        url = reverse('lead-lists-remove-leads', kwargs={'id': self.lead_list.id})
+        self.client.post(url, {'lead_ids': ids}, format='json')
+        self.assertEqual(self.leads_count(), 2)
+        self.client.post(url, {'lead_ids': ids}, format='json')
+        self.assertEqual(self.leads_count(), 2)
+
+    def test_other_membership_writes(self):
+        """Test created, imported and deleted leads are counted"""
+        response = self.client.post(
+            reverse('leads-create-and-add-to-list'),
+            {'lead_list_id': str(self.lead_list.id), 'corporation_number': '1101110000099', 'name': '새 기업'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.leads_count(), 1)
+
+        importer = LeadFileImporter('', str(self.user.id), options={'lead_list_id': str(self.lead_list.id)})
+        leads = pd.DataFrame([
+            {'corporation_number': '1101110000098', 'name': '가져온 기업 1'},
+            {'corporation_number': '1101110000097', 'name': '가져온 기업 2'},
+        ])
+        importer.insert(leads, leads)
+        self.assertEqual(self.leads_count(), 3)
+
+        other_list = LeadList.objects.create(name='전체', user=self.user)
+        other_list.leads.add(*Lead.objects.all())
+        self.assertEqual(self.leads_count(other_list), 8)
+
+        Lead.objects.filter(name__startswith='가져온').delete()
+        self.assertEqual(self.leads_count(), 1)
+        self.assertEqual(self.leads_count(other_list), 6)
+        other_list.leads.clear()
+        self.assertEqual(self.leads_count(other_list), 0)
+
+    def test_stale_instance_save(self):
+        """Test saving a list loaded before its members changed keeps the count"""
+        stale = LeadList.objects.get(id=self.lead_list.id)
+        self.lead_list.leads.add(*self.leads)
+        stale.name = '이름 변경'
+        stale.save()
+        self.assertEqual(self.leads_count(), 5)
+        self.assertEqual(LeadList.objects.get(id=self.lead_list.id).name, '이름 변경')
+
+    def test_list_query_count(self):
+        """Test listing lead lists costs the same queries for any number of lists"""
+        self.lead_list.leads.add(*self.leads)
+        url = reverse('lead-lists-list')
+        # count and page
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data['results'][0]['leads_count'], 5)
+
+        for index in range(5):
+            LeadList.objects.create(name=f'리스트 {index}', user=self.user).leads.add(*self.leads[:index])
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'ordering': '-leads_count'})
+        self.assertEqual([item['leads_count'] for item in response.data['results']], [5, 4, 3, 2, 1, 0])
@@ -0,0 +1,95 @@
+import uuid
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.models import Lead, LeadList
+
+User = get_user_model()
+
+
+class LeadListMembershipTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.lead_list = LeadList.objects.create(name='IT 기업', user=self.user)
+        self.add_url = reverse('lead-lists-add-leads', kwargs={'id': self.lead_list.id})
+        self.remove_url = reverse('lead-lists-remove-leads', kwargs={'id': self.lead_list.id})
+
+        self.seoul = [
+            Lead.objects.create(
+                user=self.user,
+                corporation_number=f'11011100000{index:02d}',
+                name=f'서울 기업 {index}',
+                si_nm='서울특별시',
+                email=f'contact{index}@example.com' if index % 2 else None,
+            )
+            for index in range(4)
+        ]
+        self.busan = Lead.objects.create(
+            user=self.user, corporation_number='1101110000099', name='부산 기업', si_nm='부산광역시'
+        )
+        other = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.foreign = Lead.objects.create(
+            user=other, corporation_number='1101110000098', name='다른 사용자 기업', si_nm='서울특별시'
+        )
+
+    def members(self):
+        return set(self.lead_list.leads.values_list('name', flat=True))
+
+    def test_add_and_remove_by_ids(self):
+        """Test ids are added once and other users' leads are ignored"""
+        ids = [str(self.seoul[0].id), str(self.seoul[1].id), str(self.foreign.id)]
+        # list lookup, then one INSERT ... SELECT
+        with self.assertNumQueries(2):
+            response = self.client.post(self.add_url, {'lead_ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['added'], 2)
+        self.assertEqual(self.members(), {'서울 기업 0', '서울 기업 1'})
+
+        response = self.client.post(
+            self.add_url, {'lead_ids': [str(lead.id) for lead in self.seoul]}, format='json'
+        )
+        self.assertEqual(response.data['added'], 2)
+        self.assertEqual(LeadList.objects.get(id=self.lead_list.id).leads_count, 4)
+
+        with self.assertNumQueries(2):
+            response = self.client.post(self.remove_url, {'lead_ids': ids}, format='json')
+        self.assertEqual(response.data['removed'], 2)
+        self.assertEqual(self.members(), {'서울 기업 2', '서울 기업 3'})
+
+    def test_add_and_remove_by_filter(self):
+        """Test a filter expression selects the user's matching leads"""
+        response = self.client.post(
+            self.add_url, {'filter': {'si_nm': '서울', 'has_email': True}}, format='json'
+        )
+        self.assertEqual(response.data['added'], 2)
+        self.assertEqual(self.members(), {'서울 기업 1', '서울 기업 3'})
+
+        response = self.client.post(self.add_url, {'filter': {'search': '부산'}}, format='json')
+        self.assertEqual(response.data['added'], 1)
+
+        # An empty filter selects every lead of the user
+        response = self.client.post(self.add_url, {'filter': {}}, format='json')
+        self.assertEqual(response.data['added'], 2)
+        self.assertEqual(LeadList.objects.get(id=self.lead_list.id).leads_count, 5)
+
+        response = self.client.post(self.remove_url, {'filter': {'has_email': False}}, format='json')
+        self.assertEqual(response.data['removed'], 3)
+        self.assertEqual(self.members(), {'서울 기업 1', '서울 기업 3'})
+
+    def test_rejects_invalid_selections(self):
+        """Test missing, malformed and unknown selections are refused"""
+        for data in (
+            {},
+            {'lead_ids': []},
+            {'lead_ids': ['not-a-uuid']},
+            {'filter': {'user': str(uuid.uuid4())}},
+            {'filter': {'min_revenue': 'many'}},
+        ):
+            response = self.client.post(self.add_url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, data)
+        self.assertEqual(self.members(), set())
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.models import Industry, Lead, LeadList
+
+User = get_user_model()
+
+
+class LeadListSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.lead_list = LeadList.objects.create(name='IT 기업', user=self.user)
+        self.url = reverse('lead-lists-detail', kwargs={'id': self.lead_list.id})
+        industry = Industry.objects.create(code='J62', name='소프트웨어 개발')
+
+        self.lead_list.leads.add(
+            Lead.objects.create(
+                user=self.user, corporation_number='1101112955908', name='주식회사 넥스파시스템',
+                owner='서종렬', email='info@nexpa.co.kr', phone='02-1234-5678',
+                si_nm='서울특별시', sgg_nm='금천구', industry=industry
+            ),
+            Lead.objects.create(
+                user=self.user, corporation_number='1101111713381', name='(주)대우캐리어판매',
+                owner='이경남', si_nm='서울특별시', sgg_nm='영등포구'
+            ),
+            Lead.objects.create(
+                user=self.user, corporation_number='1101110000001', name='가나다 상사',
+                si_nm='부산광역시', sgg_nm='해운대구'
+            ),
+        )
+        # Matches the searches below but is not a member
+        Lead.objects.create(
+            user=self.user, corporation_number='1101110000002', name='넥스파 서울지점',
+            si_nm='서울특별시', industry=industry
+        )
+
+    def names(self, search):
+        response = self.client.get(self.url, {'search': search})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], len(response.data['leads']))
+        return [lead['name'] for lead in response.data['leads']]
+
+    def test_searches_members(self):
+        """Test member search over names, contacts, regions and industry"""
+        self.assertEqual(self.names('넥스파'), ['주식회사 넥스파시스템'])
+        self.assertEqual(self.names('nexpa.co.kr'), ['주식회사 넥스파시스템'])
+        self.assertEqual(self.names('02-1234'), ['주식회사 넥스파시스템'])
+        self.assertEqual(self.names('021234'), ['주식회사 넥스파시스템'])
+        self.assertEqual(self.names('소프트웨어'), ['주식회사 넥스파시스템'])
+        self.assertEqual(self.names('이경남'), ['(주)대우캐리어판매'])
+        self.assertEqual(len(self.names('서울특별시')), 2)
+        self.assertEqual(self.names('없는회사'), [])
+
+    def test_unfiltered_members(self):
+        """Test members are listed by name with the denormalized count"""
+        # list, page; no COUNT(*)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(
+            [lead['name'] for lead in response.data['leads']],
+            ['(주)대우캐리어판매', '가나다 상사', '주식회사 넥스파시스템']
+        )
+
+    def test_query_has_no_distinct(self):
+        """Test the member search query needs no DISTINCT"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {'search': '넥스파'})
+        self.assertFalse(any('DISTINCT' in query['sql'] for query in queries.captured_queries))
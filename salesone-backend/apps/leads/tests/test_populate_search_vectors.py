@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TransactionTestCase
+from apps.leads.models import Lead, SalesOneLead
+
+User = get_user_model()
+
+
+class PopulateSearchVectorsTests(TransactionTestCase):
+    """Worker threads use their own connections, so data must be committed."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        for index in range(7):
+            SalesOneLead.objects.create(
+                corporation_number=f'11011100000{index:02d}',
+                name=f'테스트기업 {index}',
+            )
+            Lead.objects.create(
+                user=self.user,
+                corporation_number=f'11011100000{index:02d}',
+                name=f'테스트기업 {index}',
+            )
+        # Simulate rows that predate the search_vector triggers
+        SalesOneLead.objects.update(search_vector=None)
+        Lead.objects.update(search_vector=None)
+        self.checkpoint_dir = tempfile.mkdtemp()
+
+    def populate(self, **options):
+        output = StringIO()
+        call_command(
+            'populate_search_vectors',
+            checkpoint_dir=self.checkpoint_dir,
+            stdout=output,
+            **options
+        )
+        return output.getvalue()
+
+    def test_parallel_rebuild_covers_every_row(self):
+        """Test chunked parallel updates fill every missing vector"""
+        output = self.populate(batch_size=2, workers=3)
+        self.assertFalse(SalesOneLead.objects.filter(search_vector__isnull=True).exists())
+        self.assertFalse(Lead.objects.filter(search_vector__isnull=True).exists())
+        self.assertIn('Updated 7 SalesOneLead rows', output)
+        self.assertIn('rows/sec', output)
+
+    def test_resume_from_checkpoint(self):
+        """Test --resume skips keys at or below the checkpoint"""
+        ids = list(SalesOneLead.objects.order_by('id').values_list('id', flat=True))
+        path = os.path.join(self.checkpoint_dir, 'populate_search_vectors.salesonelead.json')
+        with open(path, 'w') as checkpoint:
+            json.dump({'last_id': str(ids[2])}, checkpoint)
+
+        self.populate(model='salesonelead', batch_size=2, resume=True)
+
+        missing = set(SalesOneLead.objects.filter(search_vector__isnull=True).values_list('id', flat=True))
+        self.assertEqual(missing, set(ids[:3]))
+        self.assertFalse(os.path.exists(path))
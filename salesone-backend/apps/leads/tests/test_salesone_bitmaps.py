@@ -0,0 +1,58 @@
+import numpy as np
+from django.test import SimpleTestCase
+from apps.leads.bitmaps import ARRAY_MAX, BitmapIndex, RowBitmap
+
+
+class RowBitmapTests(SimpleTestCase):
+    def setUp(self):
+        random = np.random.default_rng(16)
+        rows = 300_000
+        # Dense, sparse and mixed sets so both container kinds meet
+        self.sets = [
+            np.flatnonzero(random.random(rows) < 0.5),
+            np.flatnonzero(random.random(rows) < 0.01),
+            np.concatenate([np.arange(70_000, 140_000), np.arange(200_000, 200_100)]),
+            np.arange(0),
+        ]
+
+    def test_containers(self):
+        """Test sparse containers are arrays and dense containers bitmaps"""
+        bitmap = RowBitmap.from_positions(self.sets[2])
+        self.assertEqual(bitmap.containers[1].dtype, np.uint8)
+        self.assertEqual(bitmap.containers[3].dtype, np.uint16)
+        self.assertEqual(len(bitmap.containers[3]), 100)
+        self.assertEqual(bitmap.cardinality(), 70_100)
+        np.testing.assert_array_equal(bitmap.to_positions(), self.sets[2])
+
+    def test_set_operations(self):
+        """Test union, intersection and difference match Python sets"""
+        bitmaps = [RowBitmap.from_positions(positions) for positions in self.sets]
+        sets = [set(positions.tolist()) for positions in self.sets]
+        for i in range(len(sets)):
+            for j in range(len(sets)):
+                difference = bitmaps[i] - bitmaps[j]
+                self.assertEqual(difference.to_positions().tolist(), sorted(sets[i] - sets[j]))
+                union = bitmaps[i] | bitmaps[j]
+                intersection = bitmaps[i] & bitmaps[j]
+                self.assertEqual(union.to_positions().tolist(), sorted(sets[i] | sets[j]))
+                self.assertEqual(intersection.to_positions().tolist(), sorted(sets[i] & sets[j]))
+                self.assertEqual(union.cardinality(), len(sets[i] | sets[j]))
+                self.assertEqual(intersection.cardinality(), len(sets[i] & sets[j]))
+                for container in intersection.containers.values():
+                    if container.dtype == np.uint8:
+                        self.assertGreater(np.unpackbits(container).sum(), ARRAY_MAX)
+
+        self.assertEqual(
+            RowBitmap.intersection(bitmaps[:3]).cardinality(),
+            len(sets[0] & sets[1] & sets[2])
+        )
+
+    def test_bitmap_index(self):
+        """Test posting lists round-trip through the stored table and buffer"""
+        codes = np.random.default_rng(3).integers(-1, 5, size=200_000).astype(np.int32)
+        index = BitmapIndex(*BitmapIndex.build(codes))
+        for code in range(5):
+            np.testing.assert_array_equal(index.get(code).to_positions(), np.flatnonzero(codes == code))
+        self.assertEqual(index.get(-1).cardinality(), 0)
+        self.assertEqual(index.get(99).cardinality(), 0)
+        self.assertEqual(index.get_any([1, 3]).cardinality(), int(np.isin(codes, [1, 3]).sum()))
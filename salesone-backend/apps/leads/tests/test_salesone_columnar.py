@@ -0,0 +1,151 @@
+import os
+import shutil
+import tempfile
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.columnar import (
+    CURRENT_FILE, SalesOneColumnarIndex, build_salesone_snapshot, read_current, salesone_columnar_index
+)
+from apps.leads.models import Industry, SalesOneLead
+from apps.leads.search import filter_salesone_leads, order_salesone_leads
+from apps.leads.signals import salesone_leads_synced
+
+User = get_user_model()
+
+
+class SalesOneColumnarIndexTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        settings_override = override_settings(SALESONE_COLUMNAR_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        software = Industry.objects.create(code='J62', name='소프트웨어 개발')
+        retail = Industry.objects.create(code='G47', name='소매업')
+        rows = [
+            ('서울특별시', '강남구', software, 5, 500_000_000, date(2010, 1, 1), 'a@example.com', ['a.com']),
+            ('서울특별시', '강남구', software, 30, None, date(2015, 6, 1), '', None),
+            ('서울특별시', '금천구', retail, 120, 50_000_000_000, None, 'b@example.com', []),
+            ('경기도', '성남시 분당구', software, 30, 200_000_000_000, date(1999, 3, 2), None, ['c.com']),
+            ('경기도', '', None, 8, 500_000_000, date(2010, 1, 1), 'c@example.com', None),
+            (None, None, retail, 1500, None, None, '', None),
+        ]
+        for index, (si_nm, sgg_nm, industry, employee, revenue, established, email, homepage) in enumerate(rows):
+            SalesOneLead.objects.create(
+                corporation_number=f'11011100000{index:02d}',
+                name=f'테스트기업 {index}',
+                si_nm=si_nm,
+                sgg_nm=sgg_nm,
+                industry=industry,
+                employee=employee,
+                finance_revenue=revenue,
+                established_date=established,
+                email=email,
+                phone='02-000-0000' if index % 2 else None,
+                homepage=homepage,
+                is_corporation=index < 3,
+            )
+        build_salesone_snapshot()
+        self.index = SalesOneColumnarIndex()
+
+    def database_ids(self, params):
+        queryset = filter_salesone_leads(SalesOneLead.objects.all(), params)
+        return list(order_salesone_leads(queryset, params).values_list('id', flat=True))
+
+    def test_matches_database_search(self):
+        """Test filter combinations and orderings match the Postgres search"""
+        for params in [
+            {},
+            {'si_nm': '서울특별시'},
+            {'si_nm': '서울특별시', 'sgg_nm': '강남구', 'industry': 'J62'},
+            {'industry': 'G47', 'sort': '-employee'},
+            {'industry': 'NONE'},
+            {'employee_min': '10', 'employee_max': '200', 'sort': 'employee'},
+            {'employee_min': 'abc'},
+            {'established_after': '2000-01-01', 'sort': '-established_date'},
+            {'established_before': '2012-12-31', 'sort': 'established_date'},
+            {'has_email': 'true', 'has_homepage': 'true'},
+            {'has_phone': 'true', 'has_email': 'false'},
+            {'is_corporation': 'true', 'si_nm__in': '경기도'},
+            {'sgg_nm__in': ['강남구', '성남시 분당구', '없는구'], 'sort': '-established_date'},
+            {'industry__in': 'J62,G47', 'si_nm': '서울특별시', 'sort': '-id'},
+            {'industry__in': 'NONE'},
+            {'exclude_industry': 'J62', 'sort': 'employee'},
+            {'si_nm': '서울특별시', 'exclude_sgg_nm': '금천구,없는구'},
+            {'min_employee': '10', 'max_revenue': '60000000000', 'sort': '-finance_revenue'},
+            {'min_established': '2010-01-01', 'max_established': '2015-12-31'},
+            {'revenue_range': '1000000000,0', 'sort': '-finance_revenue'},
+            {'revenue_range': '0,1000000000', 'sort': 'finance_revenue'},
+            {'sort': '-finance_revenue'},
+            {'sort': 'established_date'},
+            {'sort': '-id'},
+        ]:
+            result = self.index.search(params)
+            self.assertIsNotNone(result, params)
+            self.assertEqual([int(lead_id) for lead_id in result.ids], self.database_ids(params), params)
+
+    def test_unsupported_searches(self):
+        """Test text searches and name ordering are left to Postgres"""
+        self.assertIsNone(self.index.search({'company_name': '테스트'}))
+        self.assertIsNone(self.index.search({'search': '테스트'}))
+        self.assertIsNone(self.index.search({'sort': 'name'}))
+        self.assertIsNone(self.index.search({'established_after': 'not-a-date'}))
+        with override_settings(SALESONE_COLUMNAR_DIR=''):
+            self.assertIsNone(SalesOneColumnarIndex().search({}))
+
+    def test_search_salesone_hydrates_page(self):
+        """Test search_salesone reads only the requested page from Postgres"""
+        salesone_columnar_index.checked_at = None
+        url = reverse('leads-search-salesone')
+        params = {'si_nm': '서울특별시', 'sort': '-employee', 'page_size': 2}
+        # The page's rows, then its keywords
+        with self.assertNumQueries(2):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(response.data['count_is_estimate'], False)
+        self.assertEqual([lead['employee'] for lead in response.data['results']], [120, 30])
+
+        response = self.client.get(url, {**params, 'page': 2, 'count': 'estimate'})
+        self.assertEqual([lead['employee'] for lead in response.data['results']], [5])
+
+    def test_count_from_bitmaps(self):
+        """Test categorical counts come from bitmap cardinality without queries"""
+        with self.assertNumQueries(0):
+            self.assertEqual(self.index.count({'si_nm__in': '서울특별시,경기도', 'industry': 'J62'}), 3)
+            self.assertEqual(self.index.count({'has_email': 'true', 'is_corporation': 'true'}), 2)
+            self.assertEqual(self.index.count({}), 6)
+            self.assertEqual(self.index.count({'si_nm': '경기도', 'employee_min': '10'}), 1)
+        self.assertIsNone(self.index.count({'search': '테스트'}))
+
+    def test_rebuilt_after_sync(self):
+        """Test a SalesOne sync with changes writes a new current snapshot"""
+        first = read_current(self.directory)
+        SalesOneLead.objects.create(corporation_number='1101110000099', name='신규', si_nm='부산광역시')
+
+        salesone_leads_synced.send(sender=None, manifest={'inserted': [], 'changed': [], 'removed': []})
+        self.assertEqual(read_current(self.directory), first)
+
+        salesone_leads_synced.send(
+            sender=None, manifest={'inserted': ['1101110000099'], 'changed': [], 'removed': []}
+        )
+        second = read_current(self.directory)
+        self.assertNotEqual(second, first)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, CURRENT_FILE)))
+        self.assertEqual(self.index.search({'si_nm': '부산광역시'}).count(), 1)
+
+        build_salesone_snapshot()
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            sorted([CURRENT_FILE, second, read_current(self.directory)])
+        )
@@ -0,0 +1,132 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.facets import SalesOneFacets
+from apps.leads.models import Industry, SalesOneLead
+from apps.leads.rollups import rebuild_salesone_rollups
+
+User = get_user_model()
+
+
+class SalesOneFacetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('leads-salesone-facets')
+        software = Industry.objects.create(code='J62', name='소프트웨어 개발')
+        retail = Industry.objects.create(code='G47', name='소매업')
+        rows = [
+            ('서울특별시', '강남구', software, 5, 500_000_000, 'alpha@example.com'),
+            ('서울특별시', '강남구', software, 30, 5_000_000_000, ''),
+            ('서울특별시', '금천구', retail, 120, 50_000_000_000, 'beta@example.com'),
+            ('경기도', '성남시 분당구', software, 1500, 200_000_000_000, ''),
+            ('경기도', '수원시', None, 8, None, 'gamma@example.com'),
+        ]
+        for index, (si_nm, sgg_nm, industry, employee, revenue, email) in enumerate(rows):
+            SalesOneLead.objects.create(
+                corporation_number=f'11011100000{index:02d}',
+                name=f'테스트기업 {index}',
+                si_nm=si_nm,
+                sgg_nm=sgg_nm,
+                industry=industry,
+                employee=employee,
+                finance_revenue=revenue,
+                email=email,
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_salesone_rollups()
+
+    def counts(self, entries, key='value'):
+        return {entry[key]: entry['count'] for entry in entries}
+
+    def live(self, params):
+        facets = SalesOneFacets(params)
+        facets.use_rollup = False
+        facets.buckets = {}
+        return facets.count()
+
+    def test_unfiltered_facets_from_rollup(self):
+        """Test every facet is counted from the rollup in one query"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data
+        self.assertEqual(data['source'], 'rollup')
+        self.assertEqual(data['count'], 5)
+        self.assertNotIn('sgg_nm', data)
+        self.assertEqual(self.counts(data['si_nm']), {'서울특별시': 3, '경기도': 2})
+        self.assertEqual(data['industry'][0], {'code': 'J62', 'name': '소프트웨어 개발', 'count': 3})
+        self.assertEqual(self.counts(data['industry'], 'code'), {'J62': 3, 'G47': 1})
+        self.assertEqual(
+            self.counts(data['employee'], 'key'),
+            {'1-9': 2, '10-49': 1, '50-99': 0, '100-299': 1, '300-999': 0, '1000+': 1}
+        )
+        self.assertEqual(data['employee'][1]['min'], 10)
+        self.assertEqual(data['employee'][1]['max'], 49)
+        self.assertEqual(
+            self.counts(data['revenue'], 'key'),
+            {'0-1b': 1, '1b-10b': 1, '10b-100b': 1, '100b+': 1}
+        )
+
+    def test_facet_ignores_own_filter(self):
+        """Test a facet is counted with the other filters but not its own"""
+        response = self.client.get(self.url, {'si_nm': '서울특별시', 'industry': 'J62'})
+        data = response.data
+        self.assertEqual(data['source'], 'rollup')
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(self.counts(data['si_nm']), {'서울특별시': 2, '경기도': 1})
+        self.assertEqual(self.counts(data['sgg_nm']), {'강남구': 2})
+        self.assertEqual(self.counts(data['industry'], 'code'), {'J62': 2, 'G47': 1})
+        self.assertEqual(self.counts(data['employee'], 'key')['1-9'], 1)
+
+    def test_rollup_matches_live_counts(self):
+        """Test rollup-eligible searches give the same counts as live grouping"""
+        for params in [
+            {},
+            {'si_nm': '경기도'},
+            {'si_nm': '서울특별시', 'sgg_nm': '강남구'},
+            {'industry': 'J62', 'employee_min': '10'},
+            {'employee_min': '10', 'employee_max': '299'},
+            {'revenue_range': '1000000000,99999999999'},
+            {'sgg_nm__in': '강남구,수원시', 'industry__in': ['J62', 'G47']},
+            {'exclude_industry': 'G47', 'exclude_si_nm': '경기도'},
+        ]:
+            facets = SalesOneFacets(params)
+            self.assertTrue(facets.use_rollup, params)
+            rollup = facets.count()
+            live = self.live(params)
+            rollup.pop('source'), live.pop('source')
+            self.assertEqual(rollup, live, params)
+
+    def test_live_fallback(self):
+        """Test filters the rollup cannot express are grouped live"""
+        response = self.client.get(self.url, {'employee_min': '20', 'has_email': 'true'})
+        data = response.data
+        self.assertEqual(data['source'], 'live')
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(self.counts(data['si_nm']), {'서울특별시': 1})
+        self.assertEqual(
+            self.counts(data['employee'], 'key'),
+            {'1-9': 2, '10-49': 0, '50-99': 0, '100-299': 1, '300-999': 0, '1000+': 0}
+        )
+
+        data = self.client.get(self.url, {'company_name': '테스트기업', 'si_nm': '경기도'}).data
+        self.assertEqual(data['source'], 'live')
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(self.counts(data['sgg_nm']), {'성남시 분당구': 1, '수원시': 1})
+
+    def test_cached_response(self):
+        """Test unfiltered facet requests are served from the cache, filtered rollup ones are not"""
+        total = self.client.get(self.url, {'page': '2'}).data['count']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'sort': 'name'})
+        self.assertEqual(response.data['count'], total)
+
+        self.client.get(self.url, {'si_nm': '서울특별시', 'page': '2'})
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'si_nm': '서울특별시', 'sort': 'name'})
+        self.assertEqual(response.data['count'], 3)
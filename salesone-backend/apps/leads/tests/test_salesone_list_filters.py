@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.models import Industry, SalesOneLead
+from apps.leads.search import filter_salesone_leads
+
+User = get_user_model()
+
+
+class SalesOneListFilterTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.search_url = reverse('leads-search-salesone')
+        software = Industry.objects.create(code='J62', name='소프트웨어 개발')
+        retail = Industry.objects.create(code='G47', name='소매업')
+        rows = [
+            ('서울특별시', '강남구', software),
+            ('서울특별시', '금천구', retail),
+            ('서울특별시', '마포구', None),
+            ('경기도', '성남시 분당구', software),
+            ('부산광역시', '해운대구', retail),
+            (None, None, None),
+        ]
+        for index, (si_nm, sgg_nm, industry) in enumerate(rows):
+            SalesOneLead.objects.create(
+                corporation_number=f'11011100000{index:02d}',
+                name=f'테스트기업 {index}',
+                si_nm=si_nm,
+                sgg_nm=sgg_nm,
+                industry=industry,
+            )
+
+    def names(self, params):
+        response = self.client.get(self.search_url, {**params, 'page_size': 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(lead['sgg_nm'] or '' for lead in response.data['results'])
+
+    def test_multiple_values(self):
+        """Test list parameters match any value, repeated or comma-separated"""
+        self.assertEqual(self.names({'sgg_nm__in': ['강남구', '해운대구']}), ['강남구', '해운대구'])
+        self.assertEqual(self.names({'sgg_nm__in': '강남구,해운대구'}), ['강남구', '해운대구'])
+        self.assertEqual(self.names({'si_nm__in': '경기도,부산광역시'}), ['성남시 분당구', '해운대구'])
+        self.assertEqual(
+            self.names({'industry__in': 'J62,G47', 'si_nm': '서울특별시'}), ['강남구', '금천구']
+        )
+        self.assertEqual(self.names({'industry__in': 'UNKNOWN'}), [])
+
+    def test_exclusions(self):
+        """Test exclusion lists drop matching rows but keep NULLs"""
+        self.assertEqual(
+            self.names({'exclude_industry': 'J62'}), ['', '금천구', '마포구', '해운대구']
+        )
+        self.assertEqual(
+            self.names({'si_nm': '서울특별시', 'exclude_sgg_nm': '강남구,마포구'}), ['금천구']
+        )
+        self.assertEqual(
+            self.names({'exclude_si_nm': ['서울특별시', '경기도'], 'exclude_industry': 'UNKNOWN'}),
+            ['', '해운대구']
+        )
+
+    def test_single_array_parameter(self):
+        """Test lists compile to one = ANY(array) predicate whatever their length"""
+        statements = []
+        for values in (['강남구'], ['강남구', '금천구', '마포구', '해운대구', '수원시']):
+            with CaptureQueriesContext(connection) as queries:
+                list(filter_salesone_leads(SalesOneLead.objects.all(), {'sgg_nm__in': values}))
+            self.assertEqual(len(queries), 1)
+            statements.append(queries[0]['sql'])
+        self.assertIn('"sgg_nm" = ANY(', statements[0])
+        self.assertNotIn(' IN (', statements[1])
+
+        queryset = filter_salesone_leads(SalesOneLead.objects.all(), {'sgg_nm__in': 'a,b,c'})
+        sql, params = queryset.query.sql_with_params()
+        self.assertEqual(params, (['a', 'b', 'c'],))
+        self.assertEqual(sql.count('%s'), 1)
+
+    def test_industry_list_without_join(self):
+        """Test industry lists filter on industry_id instead of joining Industry"""
+        queryset = filter_salesone_leads(SalesOneLead.objects.all(), {'industry__in': 'J62,G47'})
+        self.assertNotIn('leads_industry', str(queryset.query))
+        self.assertEqual(queryset.count(), 4)
@@ -0,0 +1,78 @@
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.models import Industry, Keyword, SalesOneLead
+from apps.leads.serializers import SalesOneLeadListSerializer, SalesOneLeadSerializer
+
+User = get_user_model()
+
+
+class SalesOneLeadListingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.search_url = reverse('leads-search-salesone')
+        industries = [
+            Industry.objects.create(code='J62', name='소프트웨어 개발'),
+            Industry.objects.create(code='G47', name='소매업'),
+        ]
+        keywords = [Keyword.objects.create(name=f'키워드{index}') for index in range(3)]
+        for index in range(60):
+            lead = SalesOneLead.objects.create(
+                corporation_number=f'1101110000{index:03d}',
+                name=f'테스트기업 {index}',
+                industry=industries[index % 2] if index % 3 else None,
+                homepage=[f'example{index}.com'],
+                handle_goods=['소프트웨어'],
+                employee=index + 1,
+                finance_revenue=index * 1000000,
+                si_nm='서울특별시',
+                sgg_nm='강남구',
+                established_date=date(2000 + index % 20, 1, 1) if index % 4 else None,
+                finance_net_profit=index,
+            )
+            lead.keywords.set(keywords[:index % 4])
+
+    def test_matches_model_serializer(self):
+        """Test the dict serializer output equals SalesOneLeadSerializer"""
+        queryset = SalesOneLead.objects.order_by('id')
+        expected = SalesOneLeadSerializer(queryset, many=True).data
+        actual = SalesOneLeadListSerializer(SalesOneLeadListSerializer.select(queryset)).data
+        self.assertEqual([dict(row) for row in expected], actual)
+
+    def test_page_query_count(self):
+        """Test a page costs the same number of queries whatever its size"""
+        # count, page, keywords
+        with self.assertNumQueries(3):
+            response = self.client.get(self.search_url, {'page_size': 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 50)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.search_url, {'page_size': 5, 'sort': '-employee'})
+        self.assertEqual([lead['employee'] for lead in response.data['results']], [60, 59, 58, 57, 56])
+
+        # page and keywords; no count
+        with self.assertNumQueries(2):
+            response = self.client.get(self.search_url, {'page_size': 50, 'pagination': 'cursor'})
+        self.assertEqual(len(response.data['results']), 50)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_selects_displayed_columns(self):
+        """Test the listing does not read the financial detail columns"""
+        sql = str(SalesOneLeadListSerializer.select(SalesOneLead.objects.all()).query)
+        self.assertNotIn('finance_net_profit', sql)
+        self.assertNotIn('search_vector', sql)
+        self.assertIn('leads_industry', sql)
+
+    def test_ranked_search(self):
+        """Test relevance-ordered text searches work on the values() path"""
+        response = self.client.get(self.search_url, {'company_name': '테스트기업 5'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['name'], '테스트기업 5')
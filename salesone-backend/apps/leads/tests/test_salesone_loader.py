@@ -0,0 +1,168 @@
+import csv
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from apps.leads.loader import SalesOneLeadLoader
+from apps.leads.models import Industry, Keyword, SalesOneLead
+from apps.leads.signals import salesone_leads_synced
+
+HEADER = [
+    'corporation_number', 'business_number', 'industry_name', 'name', 'email',
+    'homepage', 'handle_goods', 'employee', 'finance_year', 'finance_revenue',
+    'finance_debt_ratio', 'is_corporation', 'si_nm', 'sgg_nm', 'established_date',
+]
+
+
+class SalesOneLeadLoaderTests(TestCase):
+    def setUp(self):
+        self.industry = Industry.objects.create(code='J58221', name='시스템 소프트웨어 개발 및 공급업')
+        self.csv_dir = tempfile.mkdtemp()
+
+    def write_csv(self, rows):
+        path = os.path.join(self.csv_dir, 'salesone.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(HEADER)
+            for row in rows:
+                writer.writerow([row.get(column, '') for column in HEADER])
+        return path
+
+    def load(self, rows, **kwargs):
+        return SalesOneLeadLoader(self.write_csv(rows), log=lambda message: None).load(**kwargs)
+
+    def test_cleans_values_in_sql(self):
+        """Test dirty values are cleaned the way the old importer cleaned them"""
+        self.load([
+            {
+                'corporation_number': '1101112955908', 'name': '넥스파시스템',
+                'industry_name': '시스템소프트웨어 개발 및 공급업', 'homepage': '["nexpa.co.kr"]',
+                'handle_goods': 'CCTV', 'employee': '11', 'finance_year': '2022',
+                'finance_revenue': '10589738000', 'finance_debt_ratio': '12.5',
+                'is_corporation': 'TRUE', 'si_nm': '서울특별시', 'established_date': '2003-10-17',
+            },
+            {
+                'corporation_number': '1101111713381', 'name': '대우캐리어판매',
+                'homepage': '[broken', 'employee': 'abc', 'finance_year': '99999999999',
+                'finance_debt_ratio': 'n/a', 'is_corporation': 'no', 'established_date': '2020-02-30',
+            },
+        ])
+
+        lead = SalesOneLead.objects.get(corporation_number='1101112955908')
+        self.assertEqual(lead.industry, self.industry)
+        self.assertEqual(lead.homepage, ['nexpa.co.kr'])
+        self.assertEqual(lead.handle_goods, ['CCTV'])
+        self.assertEqual(lead.employee, 11)
+        self.assertEqual(lead.finance_revenue, 10589738000)
+        self.assertEqual(lead.finance_debt_ratio, Decimal('12.5'))
+        self.assertTrue(lead.is_corporation)
+        self.assertEqual(lead.established_date, date(2003, 10, 17))
+        self.assertIsNone(lead.email)
+        self.assertIsNotNone(lead.search_vector)
+
+        dirty = SalesOneLead.objects.get(corporation_number='1101111713381')
+        self.assertIsNone(dirty.industry)
+        self.assertEqual(dirty.homepage, ['[broken'])
+        self.assertEqual(dirty.handle_goods, [])
+        self.assertEqual(dirty.employee, 1)
+        self.assertIsNone(dirty.finance_year)
+        self.assertIsNone(dirty.finance_debt_ratio)
+        self.assertFalse(dirty.is_corporation)
+        self.assertIsNone(dirty.established_date)
+
+    def test_duplicates_and_incomplete_rows(self):
+        """Test the first row wins for duplicates and rows without a name are skipped"""
+        stats = self.load([
+            {'corporation_number': '1101110000001', 'name': '첫번째'},
+            {'corporation_number': '1101110000001', 'name': '두번째'},
+            {'corporation_number': '1101110000002', 'name': ''},
+        ])
+        self.assertEqual(stats['staged'], 1)
+        self.assertEqual(SalesOneLead.objects.get().name, '첫번째')
+
+    def test_reload_merges_into_live_table(self):
+        """Test a reload keeps ids, updates rows and deletes missing ones"""
+        kept = SalesOneLead.objects.create(corporation_number='1101110000001', name='이전 이름')
+        removed = SalesOneLead.objects.create(corporation_number='1101110000002', name='삭제 대상')
+        removed.keywords.add(Keyword.objects.create(name='소프트웨어'))
+
+        stats = self.load([
+            {'corporation_number': '1101110000001', 'name': '새 이름'},
+            {'corporation_number': '1101110000003', 'name': '신규'},
+        ])
+
+        self.assertEqual(stats['inserted'], 1)
+        self.assertEqual(stats['changed'], 1)
+        self.assertEqual(stats['deleted'], 1)
+        kept.refresh_from_db()
+        self.assertEqual(kept.name, '새 이름')
+        self.assertFalse(SalesOneLead.objects.filter(pk=removed.pk).exists())
+        self.assertFalse(SalesOneLead.keywords.through.objects.exists())
+        self.assertEqual(SalesOneLead.objects.count(), 2)
+
+    def test_keep_missing(self):
+        """Test keep_missing leaves rows absent from the file in place"""
+        SalesOneLead.objects.create(corporation_number='1101110000002', name='유지 대상')
+        stats = self.load([{'corporation_number': '1101110000001', 'name': '신규'}], keep_missing=True)
+        self.assertEqual(stats['deleted'], 0)
+        self.assertEqual(SalesOneLead.objects.count(), 2)
+
+    def row_version(self, corporation_number):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT ctid::text FROM leads_salesonelead WHERE corporation_number = %s',
+                [corporation_number]
+            )
+            return cursor.fetchone()[0]
+
+    def test_delta_sync_skips_unchanged_rows(self):
+        """Test a second sync only rewrites rows whose content changed"""
+        rows = [
+            {'corporation_number': '1101110000001', 'name': '그대로', 'employee': '10'},
+            {'corporation_number': '1101110000002', 'name': '바뀔 회사', 'employee': '20'},
+        ]
+        self.load(rows)
+        unchanged_version = self.row_version('1101110000001')
+
+        rows[1]['employee'] = '25'
+        stats = self.load(rows)
+
+        self.assertEqual(stats['inserted'], 0)
+        self.assertEqual(stats['changed'], 1)
+        self.assertEqual(stats['unchanged'], 1)
+        self.assertEqual(self.row_version('1101110000001'), unchanged_version)
+        self.assertEqual(SalesOneLead.objects.get(corporation_number='1101110000002').employee, 25)
+
+    def test_change_manifest(self):
+        """Test the manifest is sent to receivers and written to disk"""
+        SalesOneLead.objects.create(corporation_number='1101110000009', name='삭제 대상')
+        self.load([{'corporation_number': '1101110000001', 'name': '기존'}], keep_missing=True)
+
+        received = []
+
+        def receiver(sender, manifest, **kwargs):
+            received.append(manifest)
+
+        salesone_leads_synced.connect(receiver)
+        self.addCleanup(salesone_leads_synced.disconnect, receiver)
+
+        manifest_path = os.path.join(self.csv_dir, 'manifest.json')
+        SalesOneLeadLoader(
+            self.write_csv([
+                {'corporation_number': '1101110000001', 'name': '기존 (변경)'},
+                {'corporation_number': '1101110000002', 'name': '신규'},
+            ]),
+            log=lambda message: None
+        ).load(manifest_path=manifest_path)
+
+        expected = {
+            'inserted': ['1101110000002'],
+            'changed': ['1101110000001'],
+            'removed': ['1101110000009'],
+        }
+        self.assertEqual(received, [expected])
+        with open(manifest_path, encoding='utf-8') as manifest_file:
+            self.assertEqual(json.load(manifest_file), expected)
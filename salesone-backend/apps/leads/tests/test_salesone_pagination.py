@@ -0,0 +1,97 @@
+from datetime import date
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth import get_user_model
+from apps.leads.models import SalesOneLead
+
+User = get_user_model()
+
+
+class SalesOneLeadCursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        # Duplicate sort keys and NULL revenues exercise the id tie-breaker
+        revenues = [None, 300, 100, 200, 100, None, 300, 100, 500, 200, None, 400]
+        for index, revenue in enumerate(revenues):
+            SalesOneLead.objects.create(
+                corporation_number=f'11011100000{index:02d}',
+                name=f'테스트기업 {index:02d}',
+                employee=(index % 3) + 1,
+                finance_revenue=revenue,
+                established_date=date(2000 + index, 1, 1),
+                si_nm='서울특별시',
+            )
+
+        self.search_url = reverse('leads-search-salesone')
+
+    def _walk(self, url):
+        """Follow next links and return the names seen on every page."""
+        names = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names.extend(lead['name'] for lead in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return names, pages
+
+    def test_cursor_walk_matches_full_ordering(self):
+        """Walking every cursor page returns each row exactly once, in order"""
+        expected = list(
+            SalesOneLead.objects.order_by('id').values_list('name', flat=True)
+        )
+        names, pages = self._walk(f'{self.search_url}?pagination=cursor&page_size=5')
+        self.assertEqual(names, expected)
+        self.assertEqual(pages, 3)
+
+    def test_cursor_walk_with_nullable_sort_key(self):
+        """Descending revenue keeps NULLs last and breaks ties by id"""
+        expected = [
+            lead.name for lead in SalesOneLead.objects.filter(finance_revenue__isnull=False)
+            .order_by('-finance_revenue', '-id')
+        ] + [
+            lead.name for lead in SalesOneLead.objects.filter(finance_revenue__isnull=True)
+            .order_by('-id')
+        ]
+        names, _ = self._walk(
+            f'{self.search_url}?pagination=cursor&page_size=4&sort=-finance_revenue'
+        )
+        self.assertEqual(names, expected)
+
+    def test_previous_link_returns_prior_page(self):
+        """The previous cursor restores the page before the current one"""
+        first = self.client.get(f'{self.search_url}?pagination=cursor&page_size=4&sort=finance_revenue')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.status_code, status.HTTP_200_OK)
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNone(first.data['previous'])
+
+    def test_invalid_cursor(self):
+        """A tampered cursor is rejected"""
+        response = self.client.get(f'{self.search_url}?pagination=cursor&cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_omits_count_unless_requested(self):
+        """Cursor pages skip COUNT(*) unless count=estimate is passed"""
+        response = self.client.get(f'{self.search_url}?pagination=cursor')
+        self.assertNotIn('count', response.data)
+
+        response = self.client.get(f'{self.search_url}?pagination=cursor&count=estimate')
+        self.assertEqual(response.data['count'], 12)
+        self.assertFalse(response.data['count_is_estimate'])
+
+    def test_page_number_estimated_count(self):
+        """Small result sets fall back to an exact count in estimate mode"""
+        response = self.client.get(f'{self.search_url}?count=estimate&si_nm=서울특별시')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 12)
+        self.assertFalse(response.data['count_is_estimate'])
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.leads.models import SalesOneLead, SalesOneRegion
+from apps.leads.rollups import rebuild_salesone_rollups
+from apps.leads.signals import salesone_leads_synced
+
+User = get_user_model()
+
+
+class SalesOneRegionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('leads-get-regions')
+        regions = [
+            ('서울특별시', '강남구'), ('서울특별시', '강남구'), ('서울특별시', '금천구'),
+            ('경기도', '성남시 분당구'), ('경기도', None), (None, None),
+        ]
+        for index, (si_nm, sgg_nm) in enumerate(regions):
+            SalesOneLead.objects.create(
+                corporation_number=f'11011100000{index:02d}',
+                name=f'테스트기업 {index}',
+                si_nm=si_nm,
+                sgg_nm=sgg_nm,
+            )
+        self.rebuild()
+
+    def rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_salesone_rollups()
+
+    def test_region_counts(self):
+        """Test provinces and districts are served from the rollup with counts"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['si_nm'], ['경기도', '서울특별시'])
+        self.assertEqual(response.data['counts'], {'경기도': 2, '서울특별시': 3})
+
+        response = self.client.get(self.url, {'si_nm': '서울특별시'})
+        self.assertEqual(response.data['sgg_nm'], ['강남구', '금천구'])
+        self.assertEqual(response.data['counts'], {'강남구': 2, '금천구': 1})
+
+    def test_cached_response(self):
+        """Test repeated calls are served from the versioned cache"""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['si_nm'], ['경기도', '서울특별시'])
+
+        # Unknown provinces are answered but never cached
+        self.client.get(self.url, {'si_nm': '없는도'})
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'si_nm': '없는도'})
+        self.assertEqual(response.data['sgg_nm'], [])
+
+    def test_etag_revalidation(self):
+        """Test If-None-Match returns 304 until the rollup is rebuilt"""
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+
+        district_etag = self.client.get(self.url, {'si_nm': '경기도'})['ETag']
+        self.assertNotEqual(district_etag, etag)
+
+        SalesOneLead.objects.create(corporation_number='1101110000099', name='신규', si_nm='부산광역시')
+        self.rebuild()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('부산광역시', response.data['si_nm'])
+
+    def test_rebuilt_after_sync(self):
+        """Test a SalesOne sync with changes rebuilds the region table"""
+        SalesOneLead.objects.filter(si_nm='경기도').delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            salesone_leads_synced.send(
+                sender=None, manifest={'inserted': [], 'changed': [], 'removed': ['1101110000003']}
+            )
+        self.assertFalse(SalesOneRegion.objects.filter(si_nm='경기도').exists())
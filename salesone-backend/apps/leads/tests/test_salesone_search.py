@@ -140,4 +140,45 @@ class SalesOneLeadSearchTests(APITestCase):
             f'{self.search_url}?si_nm=서울특별시&min_employee=10&is_corporation=true'
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data['results']), 2) 
\ No newline at end of file
+        self.assertEqual(len(response.data['results']), 2) 
+
+    def test_filter_by_contact_info(self):
+        """Test has_email/has_phone/has_homepage exclude blank contact data"""
+        SalesOneLead.objects.create(
+            corporation_number='1101110000001',
+            name='연락처없음',
+            email='',
+            phone=None,
+            homepage=[],
+            si_nm='서울특별시',
+            sgg_nm='금천구'
+        )
+        for param in ('has_email', 'has_phone', 'has_homepage'):
+            response = self.client.get(f'{self.search_url}?{param}=true')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), 2, param)
+
+    def test_company_name_fuzzy_match(self):
+        """Test trigram similarity tolerates typos in company names"""
+        response = self.client.get(f'{self.search_url}?company_name=넥스파시스탬')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], '주식회사 넥스파시스템')
+
+    def test_company_name_ranked_by_similarity(self):
+        """Test closer name matches are returned first"""
+        SalesOneLead.objects.create(
+            corporation_number='1101110000002',
+            name='넥스파',
+            name_eng='NEXPA'
+        )
+        response = self.client.get(f'{self.search_url}?company_name=넥스파시스템')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['name'], '주식회사 넥스파시스템')
+
+    def test_company_name_short_query_prefix(self):
+        """Test queries too short for trigrams fall back to prefix matching"""
+        response = self.client.get(f'{self.search_url}?company_name=(주')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], '(주)대우캐리어판매')
@@ -11,9 +11,23 @@ router.register('industries', IndustryViewSet, basename='industries')
 # /leads/ - GET (list), POST (create)
 # /leads/{id}/ - GET (retrieve), PUT/PATCH (update), DELETE (delete)
 # /leads/search_salesone/ - GET (search SalesOne leads)
+# /leads/salesone_facets/ - GET (SalesOne facet counts for a search)
 # /leads/import_from_salesone/ - POST (import leads from SalesOne)
+# /leads/import_salesone_search/ - POST (import a whole SalesOne search in the background)
+# /leads/export_salesone_search/ - GET (export a SalesOne search as CSV/xlsx)
+# /leads/export-status/{task_id}/ - GET (status of a background export)
+# /leads/export-download/{task_id}/ - GET (file of a finished background export)
+# /leads/find_duplicates/ - POST (scan the user's leads for duplicates in the background)
+# /leads/dedup-status/{task_id}/ - GET (status of a duplicate scan)
+# /leads/duplicates/ - GET (merge proposals)
+# /leads/duplicates/{id}/dismiss/ - POST (dismiss a merge proposal)
+# /leads/import_file/ - POST (import a CSV/Excel file; large CSV files run as parallel shards)
+# /leads/import-status/{task_id}/ - GET (progress of a file import, per shard when sharded)
+# /leads/import-retry/{task_id}/ - POST (re-run the failed shards of a sharded import)
 # /lists/ - GET (list), POST (create)
+# /lists/combine/ - POST (new list from a union/intersection/difference of lists, or a preview)
 # /lists/{id}/ - GET (retrieve w/ leads), PUT/PATCH (update), DELETE (delete)
+# /lists/{id}/export/ - GET (export the list's leads as CSV/xlsx)
 # /lists/{id}/add_leads/ - POST (add leads to list)
 # /lists/{id}/remove_leads/ - POST (remove leads from list)
 # /industries/ - GET (list of industries)
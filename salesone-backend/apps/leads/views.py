@@ -2,30 +2,69 @@ from rest_framework import permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from rest_framework.pagination import PageNumberPagination
-from django_filters.rest_framework import DjangoFilterBackend, FilterSet, CharFilter, NumberFilter, DateFilter
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet, BooleanFilter, CharFilter, NumberFilter, DateFilter
+from django.db import transaction
 from django.db.models import Q, F
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+import hashlib
 import os
 import uuid
 from datetime import datetime
 from apps.common.views import BaseViewSet
-from .models import Lead, LeadList, SalesOneLead, Industry, LeadImportTask
+from .models import (
+    Lead, LeadList, SalesOneLead, Industry, LeadImportTask, LeadExportTask, LeadDedupTask, LeadDuplicate
+)
 from .serializers import (
     LeadSerializer, 
     LeadListSerializer, 
     LeadListDetailSerializer,
-    SalesOneLeadSerializer,
+    SalesOneLeadListSerializer,
     IndustrySerializer,
     FileUploadSerializer,
-    LeadImportTaskSerializer
+    LeadImportTaskSerializer,
+    LeadExportTaskSerializer,
+    LeadDedupTaskSerializer,
+    LeadDuplicateSerializer
+)
+from .pagination import (
+    LeadPagination,
+    LeadListMemberPagination,
+    SalesOneLeadPagination,
+    SalesOneLeadCursorPagination,
+    get_count
+)
+from .search import filter_full_text, filter_lead_members, filter_salesone_leads, order_salesone_leads
+from .columnar import salesone_columnar_index
+from .exports import EXPORT_FILE_TYPES, LeadExport, lead_list_queryset, salesone_search_queryset
+from .facets import SalesOneFacets
+from .importers import copy_salesone_leads
+from .membership import (
+    SET_OPERATIONS,
+    add_combination_to_lead_list,
+    add_to_lead_list,
+    preview_combination,
+    remove_from_lead_list
+)
+from .progress import PROGRESS_FIELDS, get_import_progress
+from .rollups import ROLLUPS_CACHE_TIMEOUT, get_region_counts, get_rollups_version
+from .tasks import (
+    export_leads,
+    find_lead_duplicates,
+    import_salesone_search,
+    process_lead_file_import,
+    run_import_shards
 )
-from .tasks import process_lead_file_import
+from django.http import FileResponse
 from django.shortcuts import get_object_or_404
 
+# Query parameters of the export endpoints that are not search filters
+EXPORT_PARAMS = ('file_type', 'background')
+
 
 class LeadFilter(FilterSet):
     """
@@ -45,6 +84,8 @@ class LeadFilter(FilterSet):
     established_after = DateFilter(field_name='established_date', lookup_expr='gte')
     established_before = DateFilter(field_name='established_date', lookup_expr='lte')
     industry = CharFilter(field_name='industry__code')
+    has_email = BooleanFilter(method='filter_has_email')
+    has_phone = BooleanFilter(method='filter_has_phone')
     
     class Meta:
         model = Lead
@@ -52,14 +93,57 @@ class LeadFilter(FilterSet):
             'name', 'corporation_number', 'business_number', 'owner',
             'si_nm', 'sgg_nm', 'min_revenue', 'max_revenue',
             'min_employee', 'max_employee', 'established_after',
-            'established_before', 'industry'
+            'established_before', 'industry', 'has_email', 'has_phone'
         ]
 
+    def filter_has_email(self, queryset, name, value):
+        return queryset.filter(email__gt='') if value else queryset.exclude(email__gt='')
+
+    def filter_has_phone(self, queryset, name, value):
+        return queryset.filter(phone__gt='') if value else queryset.exclude(phone__gt='')
+
+
+def export_leads_response(request, queryset, count, file_name, source, lead_list=None, params=None):
+    """
+    Answer an export request.
+
+    Exports up to LEAD_EXPORT_STREAM_MAX_ROWS rows are streamed directly;
+    larger ones (or any with ``background=true``) are registered as a
+    LeadExportTask and written by a Celery task, to be fetched from
+    export-download once export-status reports them completed.
+    """
+    file_type = request.query_params.get('file_type', 'csv').lower()
+    if file_type not in EXPORT_FILE_TYPES:
+        return Response(
+            {'error': 'Unsupported file format.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    background = request.query_params.get('background', '').lower() in ('true', '1')
+    if not background and count <= settings.LEAD_EXPORT_STREAM_MAX_ROWS:
+        return LeadExport(queryset, file_type=file_type).response(file_name)
 
-class LeadPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 500
+    # Register the task before enqueueing so export-status works immediately
+    task_id = str(uuid.uuid4())
+    LeadExportTask.objects.create(
+        task_id=task_id,
+        file_name=f'{file_name}.{file_type}',
+        file_type=file_type,
+        source=source,
+        params=params,
+        status='pending',
+        total_records=count,
+        user=request.user,
+        lead_list=lead_list
+    )
+    export_leads.apply_async(task_id=task_id)
+
+    return Response({
+        'task_id': task_id,
+        'status': 'pending',
+        'count': count,
+        'message': 'The export is being prepared.'
+    }, status=status.HTTP_202_ACCEPTED)
 
 
 class LeadViewSet(BaseViewSet):
@@ -102,10 +186,7 @@ class LeadViewSet(BaseViewSet):
         # Handle full-text search if search parameter is provided
         search_query = request.query_params.get('search', '').strip()
         if search_query:
-            psql_query = SearchQuery(search_query, config='simple')
-            queryset = queryset.filter(search_vector__isnull=False).annotate(
-                rank=SearchRank('search_vector', psql_query)
-            ).filter(search_vector=psql_query).order_by('-rank')
+            queryset = filter_full_text(queryset, search_query).order_by('-search_rank')
         else:
             queryset = self.filter_queryset(queryset)
         
@@ -124,69 +205,46 @@ class LeadViewSet(BaseViewSet):
     def search_salesone(self, request):
         """
         Search SalesOne leads with advanced filtering.
+
+        ``company_name`` does a trigram name search and ``search`` a full-text
+        search over every indexed text column. Results are ordered by
+        ``sort`` (e.g. ``-finance_revenue``) with id as a tie-breaker. Pass
+        ``pagination=cursor`` for keyset pagination and ``count=estimate``
+        to use the planner's row estimate for large counts.
+
+        When a SalesOneLead snapshot is configured, page number searches
+        without text filters are evaluated by the in-process columnar index
+        and only the page's rows are read from Postgres.
+
+        Rows are read with ``values()`` (displayed columns and the industry
+        join only) and serialized by SalesOneLeadListSerializer.
         """
-        pagination = LeadPagination()
-        queryset = SalesOneLead.objects.all()
-        
-        # Apply filters from query parameters
-        filters = {
-            'industry': ('industry__code', str),
-            'employee_min': ('employee__gte', int),
-            'employee_max': ('employee__lte', int),
-            'established_after': ('established_date__gte', str),
-            'established_before': ('established_date__lte', str),
-        }
-        
-        for param, (field, type_cast) in filters.items():
-            value = request.query_params.get(param)
-            if value:
-                try:
-                    queryset = queryset.filter(**{field: type_cast(value)})
-                except (ValueError, TypeError):
-                    pass
-        
-        # Handle company name search
-        company_name = request.query_params.get('company_name')
-        if company_name:
-            queryset = queryset.filter(name__icontains=company_name)
-        
-        # Handle region filters
-        si_nm = request.query_params.get('si_nm')
-        sgg_nm = request.query_params.get('sgg_nm')
-        if si_nm:
-            queryset = queryset.filter(si_nm=si_nm)
-        if sgg_nm:
-            queryset = queryset.filter(sgg_nm=sgg_nm)
+        if request.query_params.get('pagination') == 'cursor':
+            pagination = SalesOneLeadCursorPagination()
+        else:
+            pagination = SalesOneLeadPagination()
+            results = salesone_columnar_index.search(
+                request.query_params,
+                SalesOneLeadListSerializer.select(SalesOneLead.objects.all())
+            )
+            if results is not None:
+                page = pagination.paginate_queryset(results, request)
+                serializer = SalesOneLeadListSerializer(page)
+                return pagination.get_paginated_response(serializer.data)
+
+        queryset = filter_salesone_leads(SalesOneLead.objects.all(), request.query_params)
         
-        # Handle required fields filters
-        if request.query_params.get('has_email') == 'true':
-            queryset = queryset.exclude(email__isnull=True).exclude(email='')
-            
-        if request.query_params.get('has_homepage') == 'true':
-            queryset = queryset.exclude(homepage__isnull=True).filter(homepage__len__gt=0)
-            
-        if request.query_params.get('has_phone') == 'true':
-            queryset = queryset.exclude(phone__isnull=True).exclude(phone='')
-            
-        # Handle revenue range
-        revenue_range = request.query_params.get('revenue_range')
-        if revenue_range:
-            try:
-                min_rev, max_rev = map(int, revenue_range.split(','))
-                if min_rev > 0:
-                    queryset = queryset.filter(finance_revenue__gte=min_rev)
-                if max_rev > 0:
-                    queryset = queryset.filter(finance_revenue__lte=max_rev)
-            except (ValueError, AttributeError):
-                pass
+        # Stable ordering; the cursor paginator applies its own keyset ordering
+        queryset = order_salesone_leads(queryset, request.query_params)
+        queryset = SalesOneLeadListSerializer.select(queryset)
         
         # Apply pagination
         page = pagination.paginate_queryset(queryset, request)
         if page is not None:
-            serializer = SalesOneLeadSerializer(page, many=True)
+            serializer = SalesOneLeadListSerializer(page)
             return pagination.get_paginated_response(serializer.data)
         
-        serializer = SalesOneLeadSerializer(queryset, many=True)
+        serializer = SalesOneLeadListSerializer(queryset)
         return Response({
             'results': serializer.data,
             'count': queryset.count()
@@ -197,28 +255,45 @@ class LeadViewSet(BaseViewSet):
         """
         Get list of regions (si_nm) and their districts (sgg_nm).
         If si_nm is provided, returns only districts for that region.
+
+        Served from the SalesOneRegion rollup with per-region lead counts.
+        Responses carry an ETag tied to the rollup version, so clients can
+        revalidate with If-None-Match and get a 304 without a body.
         """
-        si_nm = request.query_params.get('si_nm')
-        
-        if si_nm:
-            # Get districts for specific region
-            districts = SalesOneLead.objects.filter(
-                si_nm=si_nm,
-                sgg_nm__isnull=False
-            ).values_list('sgg_nm', flat=True).distinct().order_by('sgg_nm')
-            
-            return Response({
-                'sgg_nm': list(districts)
-            })
-        else:
-            # Get all regions
-            regions = SalesOneLead.objects.filter(
-                si_nm__isnull=False
-            ).values_list('si_nm', flat=True).distinct().order_by('si_nm')
-            
-            return Response({
-                'si_nm': list(regions)
-            })
+        si_nm = request.query_params.get('si_nm', '')
+        version = get_rollups_version()
+        digest = hashlib.md5(si_nm.encode()).hexdigest()
+        etag = f'"regions-{version}-{digest}"'
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        cache_key = f'leads:regions:{version}:{digest}'
+        data = cache.get(cache_key)
+        if data is None:
+            counts = get_region_counts(si_nm)
+            key = 'sgg_nm' if si_nm else 'si_nm'
+            data = {key: list(counts), 'counts': counts}
+            # Unknown si_nm values are not cached, so callers cannot fill the cache
+            if not si_nm or counts:
+                cache.set(cache_key, data, ROLLUPS_CACHE_TIMEOUT)
+
+        response = Response(data)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def salesone_facets(self, request):
+        """
+        Get SalesOne lead counts per si_nm, sgg_nm, industry, employee bucket
+        and revenue bucket for the search_salesone filters in the query string.
+
+        Each facet is counted without its own filter, so the other values
+        stay selectable. ``sgg_nm`` is only returned when ``si_nm`` is given.
+        """
+        return Response(SalesOneFacets(request.query_params).get())
     
     @action(detail=False, methods=['post'])
     def import_from_salesone(self, request):
@@ -234,63 +309,30 @@ class LeadViewSet(BaseViewSet):
                 'results': []
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        imported_leads = []
-        existing_leads = []
-        errors = []
-        
-        # Get all SalesOne leads in one query for better performance
-        salesone_leads = SalesOneLead.objects.filter(id__in=lead_ids)
-        if not salesone_leads.exists():
+        try:
+            # Copy the rows inside the database in one statement
+            created_ids, existing_ids = copy_salesone_leads(
+                SalesOneLead.objects.filter(id__in=lead_ids),
+                request.user.id
+            )
+        except (ValueError, TypeError):
+            return Response({
+                'error': 'Invalid lead IDs',
+                'count': 0,
+                'results': []
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if not created_ids and not existing_ids:
             return Response({
                 'error': 'No valid SalesOne leads found with the provided IDs',
                 'count': 0,
                 'results': []
             }, status=status.HTTP_404_NOT_FOUND)
-        
-        # Check for existing leads to avoid duplicates
-        existing_leads_map = {
-            lead.corporation_number: lead 
-            for lead in Lead.objects.filter(
-                user=request.user,
-                corporation_number__in=salesone_leads.values_list('corporation_number', flat=True)
-            )
-        }
-        
-        for salesone_lead in salesone_leads:
-            try:
-                # If lead already exists, add it to existing_leads
-                if salesone_lead.corporation_number in existing_leads_map:
-                    existing_lead = existing_leads_map[salesone_lead.corporation_number]
-                    existing_leads.append(existing_lead)
-                    continue
-                
-                # Create new lead from SalesOne lead
-                lead = Lead.objects.create(
-                    user=request.user,
-                    corporation_number=salesone_lead.corporation_number,
-                    business_number=salesone_lead.business_number,
-                    name=salesone_lead.name,
-                    owner=salesone_lead.owner,
-                    email=salesone_lead.email,
-                    phone=salesone_lead.phone,
-                    homepage=salesone_lead.homepage,
-                    employee=salesone_lead.employee,
-                    revenue=salesone_lead.finance_revenue,
-                    address=salesone_lead.address,
-                    si_nm=salesone_lead.si_nm,
-                    sgg_nm=salesone_lead.sgg_nm,
-                    established_date=salesone_lead.established_date,
-                    industry=salesone_lead.industry
-                )
-                
-                imported_leads.append(lead)
-                
-            except Exception as e:
-                errors.append({
-                    'id': salesone_lead.id,
-                    'error': str(e)
-                })
-                continue
+
+        created_ids = set(created_ids)
+        leads = Lead.objects.filter(id__in=[*created_ids, *existing_ids]).select_related('industry')
+        imported_leads = [lead for lead in leads if lead.id in created_ids]
+        existing_leads = [lead for lead in leads if lead.id not in created_ids]
         
         response_data = {
             'count': len(imported_leads),
@@ -298,12 +340,152 @@ class LeadViewSet(BaseViewSet):
             'existing_leads': LeadSerializer(existing_leads, many=True).data,
             'existing_count': len(existing_leads)
         }
-        
-        if errors:
-            response_data['errors'] = errors
             
         return Response(response_data, status=status.HTTP_201_CREATED)
     
+    @action(detail=False, methods=['post'])
+    def import_salesone_search(self, request):
+        """
+        Import every SalesOne lead matching a search into a lead list.
+
+        Accepts the search_salesone filter parameters plus ``lead_list_id``
+        (an existing list) or ``lead_list_name`` (a new list). Matching rows
+        are copied server-side by a background task; poll import-status with
+        the returned task_id.
+        """
+        if hasattr(request.data, 'lists'):
+            # Form bodies repeat list parameters, as in the search query string
+            items = (
+                (key, values[0] if len(values) == 1 else values)
+                for key, values in request.data.lists()
+            )
+        else:
+            items = request.data.items()
+        params = {
+            key: value for key, value in items
+            if key not in ('lead_list_id', 'lead_list_name')
+        }
+        lead_list_id = request.data.get('lead_list_id')
+        lead_list_name = request.data.get('lead_list_name')
+        if not lead_list_id and not lead_list_name:
+            return Response(
+                {'error': '리드 리스트 ID 또는 이름이 필요합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        lead_list = None
+        if lead_list_id:
+            try:
+                lead_list = LeadList.objects.get(id=lead_list_id, user=request.user)
+            except (LeadList.DoesNotExist, ValidationError):
+                return Response(
+                    {'error': '리드 리스트를 찾을 수 없습니다.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+        # Exact from the snapshot bitmaps when available, no database round trip
+        max_rows = settings.SALESONE_SEARCH_IMPORT_MAX_ROWS
+        count = salesone_columnar_index.count(params)
+        if count is None:
+            # Exact but bounded: counting stops one row past the limit
+            queryset = filter_salesone_leads(SalesOneLead.objects.all(), params)
+            count = queryset[:max_rows + 1].count()
+        if count == 0:
+            return Response(
+                {'error': 'No SalesOne leads match the search', 'count': 0},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if count > max_rows:
+            return Response(
+                {
+                    'error': f'Search matches more than {max_rows} leads. '
+                             'Narrow the filters and try again.',
+                    'max_rows': max_rows
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if lead_list is None:
+            lead_list = LeadList.objects.create(name=lead_list_name, user=request.user)
+
+        # Register the task before enqueueing so import-status works immediately
+        task_id = str(uuid.uuid4())
+        LeadImportTask.objects.create(
+            task_id=task_id,
+            file_name='SalesOne search',
+            file_type='salesone',
+            status='pending',
+            user=request.user,
+            lead_list=lead_list
+        )
+        import_salesone_search.apply_async(
+            args=[str(request.user.id), params, str(lead_list.id)],
+            task_id=task_id
+        )
+
+        return Response({
+            'task_id': task_id,
+            'status': 'pending',
+            'lead_list_id': lead_list.id,
+            'count': count,
+            'message': 'The matching leads are being imported.'
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'])
+    def export_salesone_search(self, request):
+        """
+        Export the SalesOne leads matching a search as CSV or xlsx.
+
+        Accepts the search_salesone filter and ``sort`` parameters, plus
+        ``file_type`` (``csv`` or ``xlsx``) and ``background``. Rows are
+        written in search_salesone order, up to SALESONE_EXPORT_MAX_ROWS.
+        """
+        params = {
+            key: values[0] if len(values) == 1 else values
+            for key, values in request.query_params.lists()
+            if key not in EXPORT_PARAMS
+        }
+        count = salesone_columnar_index.count(params)
+        if count is None:
+            queryset = filter_salesone_leads(SalesOneLead.objects.all(), params)
+            count, _ = get_count(queryset, estimate=True)
+        count = min(count, settings.SALESONE_EXPORT_MAX_ROWS)
+
+        return export_leads_response(
+            request,
+            salesone_search_queryset(params),
+            count,
+            file_name=f"salesone_search_{datetime.now().strftime('%Y%m%d')}",
+            source='salesone',
+            params=params
+        )
+
+    @action(detail=False, methods=['get'], url_path='export-status/(?P<task_id>[^/.]+)')
+    def export_status(self, request, task_id=None):
+        """
+        Check the status of a background lead export.
+        """
+        export_task = get_object_or_404(LeadExportTask, task_id=task_id, user=request.user)
+        serializer = LeadExportTaskSerializer(export_task, context={'request': request})
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path='export-download/(?P<task_id>[^/.]+)')
+    def export_download(self, request, task_id=None):
+        """
+        Download the file of a completed background lead export.
+        """
+        export_task = get_object_or_404(LeadExportTask, task_id=task_id, user=request.user)
+        if export_task.status != 'completed' or not export_task.file:
+            return Response(
+                {'error': 'The export is not ready.', 'status': export_task.status},
+                status=status.HTTP_409_CONFLICT
+            )
+        return FileResponse(
+            export_task.file.open('rb'),
+            as_attachment=True,
+            filename=export_task.file_name
+        )
+
     @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def import_file(self, request):
         """
@@ -375,45 +557,78 @@ class LeadViewSet(BaseViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        try:
-            # Look up the import task in the database
-            import_task = LeadImportTask.objects.get(
-                task_id=task_id,
-                user=request.user
-            )
-            
-            response_data = {
-                'task_id': task_id,
-                'status': import_task.status,
-                'file_name': import_task.file_name,
-                'total_records': import_task.total_records,
-                'imported_records': import_task.imported_records,
-                'error_records': import_task.error_records,
-                'errors': import_task.errors,
-                'created_at': import_task.created_at,
-                'completed_at': import_task.completed_at,
-            }
-            
-            # Add progress information
-            if import_task.total_records > 0:
-                response_data['progress'] = round(
-                    (import_task.imported_records / import_task.total_records) * 100
+        # Running imports publish live progress to the cache
+        progress = get_import_progress(task_id)
+        if progress and progress['user_id'] == str(request.user.id):
+            response_data = {'task_id': task_id}
+            response_data.update({field: progress[field] for field in PROGRESS_FIELDS})
+        else:
+            try:
+                # Look up the import task in the database
+                import_task = LeadImportTask.objects.get(
+                    task_id=task_id,
+                    user=request.user
                 )
-            else:
-                response_data['progress'] = 0
-                
-            return Response(response_data)
-            
-        except LeadImportTask.DoesNotExist:
+            except LeadImportTask.DoesNotExist:
+                return Response(
+                    {
+                        'task_id': task_id,
+                        'status': 'unknown',
+                        'message': 'Import task not found or not associated with your account.'
+                    },
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            response_data = {'task_id': task_id}
+            response_data.update({field: getattr(import_task, field) for field in PROGRESS_FIELDS})
+            shards = import_task.shards.values(
+                'index', 'status', 'total_records', 'processed_records', 'imported_records', 'error_records'
+            )
+            if shards:
+                response_data['shards'] = list(shards)
+
+        # Add progress information
+        if response_data['total_records'] > 0:
+            response_data['progress'] = round(
+                (
+                    (response_data['imported_records'] + response_data['existing_records']) /
+                    response_data['total_records']
+                ) * 100
+            )
+        else:
+            response_data['progress'] = 0
+
+        return Response(response_data)
+
+    @action(detail=False, methods=['post'], url_path='import-retry/(?P<task_id>[^/.]+)')
+    def import_retry(self, request, task_id=None):
+        """
+        Retry a failed sharded file import.
+
+        Only the shards that did not complete are imported again; the import
+        is reconciled as usual once they finish.
+        """
+        import_task = get_object_or_404(LeadImportTask, task_id=task_id, user=request.user)
+        if import_task.status != 'failed' or not import_task.shards.exists():
             return Response(
-                {
-                    'task_id': task_id,
-                    'status': 'unknown',
-                    'message': 'Import task not found or not associated with your account.'
-                },
-                status=status.HTTP_404_NOT_FOUND
+                {'error': 'Only failed sharded imports can be retried.', 'status': import_task.status},
+                status=status.HTTP_409_CONFLICT
             )
 
+        retried = import_task.shards.exclude(status='completed').update(status='pending')
+        import_task.status = 'processing'
+        import_task.errors = None
+        import_task.completed_at = None
+        import_task.save(update_fields=['status', 'errors', 'completed_at', 'updated_at'])
+        run_import_shards(import_task)
+
+        return Response({
+            'task_id': task_id,
+            'status': 'processing',
+            'shards': retried,
+            'message': 'The failed shards are being imported again.'
+        }, status=status.HTTP_202_ACCEPTED)
+
     @action(detail=False, methods=['get'], url_path='import-tasks')
     def import_tasks(self, request):
         """
@@ -427,6 +642,71 @@ class LeadViewSet(BaseViewSet):
             'count': import_tasks.count()
         })
 
+    @action(detail=False, methods=['post'])
+    def find_duplicates(self, request):
+        """
+        Scan the user's leads for duplicates in the background.
+
+        The scan replaces the pending merge proposals listed by
+        ``duplicates``; poll dedup-status with the returned task_id.
+        """
+        # Register the task before enqueueing so dedup-status works immediately
+        task_id = str(uuid.uuid4())
+        LeadDedupTask.objects.create(task_id=task_id, status='pending', user=request.user)
+        find_lead_duplicates.apply_async(task_id=task_id)
+
+        return Response({
+            'task_id': task_id,
+            'status': 'pending',
+            'message': 'Duplicate leads are being searched.'
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'], url_path='dedup-status/(?P<task_id>[^/.]+)')
+    def dedup_status(self, request, task_id=None):
+        """
+        Check the status of a duplicate lead scan.
+        """
+        dedup_task = get_object_or_404(LeadDedupTask, task_id=task_id, user=request.user)
+        return Response(LeadDedupTaskSerializer(dedup_task).data)
+
+    @action(detail=False, methods=['get'])
+    def duplicates(self, request):
+        """
+        List merge proposals, most similar names first.
+
+        ``status`` selects ``pending`` (default) or ``dismissed`` proposals.
+        """
+        proposal_status = request.query_params.get('status', 'pending')
+        if proposal_status not in dict(LeadDuplicate.STATUS_CHOICES):
+            return Response(
+                {'error': f'Invalid status: {proposal_status}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = LeadDuplicate.objects.filter(
+            user=request.user, status=proposal_status
+        ).select_related('lead', 'duplicate')
+
+        paginator = LeadPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = LeadDuplicateSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='duplicates/(?P<proposal_id>[^/.]+)/dismiss')
+    def dismiss_duplicate(self, request, proposal_id=None):
+        """
+        Dismiss a merge proposal; later scans do not propose the pair again.
+        """
+        try:
+            proposal = LeadDuplicate.objects.get(id=proposal_id, user=request.user)
+        except (LeadDuplicate.DoesNotExist, ValidationError):
+            return Response(
+                {'error': 'Merge proposal not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        proposal.status = 'dismissed'
+        proposal.save(update_fields=['status', 'updated_at'])
+        return Response(LeadDuplicateSerializer(proposal).data)
+
     @action(detail=False, methods=['post'])
     def create_and_add_to_list(self, request):
         """
@@ -479,7 +759,7 @@ class LeadListViewSet(BaseViewSet):
     serializer_class = LeadListSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'description']
-    ordering_fields = ['name', 'created_at']
+    ordering_fields = ['name', 'created_at', 'leads_count']
     ordering = ['name']
     pagination_class = LeadPagination
     lookup_field = 'id'
@@ -532,25 +812,22 @@ class LeadListViewSet(BaseViewSet):
         # Get search query from request and decode it
         search_query = request.query_params.get('search', '').strip()
         
-        # Get leads queryset with search if provided
-        leads_queryset = instance.leads.all()
+        # Members are joined through the membership table, one row per lead
+        leads_queryset = instance.leads.select_related('industry')
+        count = None
         if search_query:
-            # Use Q objects with icontains for case-insensitive search
-            leads_queryset = leads_queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(owner__icontains=search_query) |
-                Q(email__icontains=search_query) |
-                Q(phone__icontains=search_query) |
-                Q(address__icontains=search_query) |
-                Q(si_nm__icontains=search_query) |
-                Q(sgg_nm__icontains=search_query) |
-                Q(industry__name__icontains=search_query)
-            ).distinct()
+            leads_queryset = filter_lead_members(leads_queryset, search_query)
+        if 'search_rank' in leads_queryset.query.annotations:
+            leads_queryset = leads_queryset.order_by('-search_rank', 'name', 'id')
+        else:
+            # Unfiltered: the denormalized count replaces COUNT(*)
+            leads_queryset = leads_queryset.order_by('name', 'id')
+            count = instance.leads_count
         
         # Apply pagination to leads
-        paginator = self.pagination_class()
+        paginator = LeadListMemberPagination()
         try:
-            paginated_leads = paginator.paginate_queryset(leads_queryset, request)
+            paginated_leads = paginator.paginate_queryset(leads_queryset, request, count=count)
         except Exception as e:
             return Response(
                 {"error": "페이지네이션 처리 중 오류가 발생했습니다."},
@@ -590,32 +867,140 @@ class LeadListViewSet(BaseViewSet):
             'created_at': instance.created_at,
             'updated_at': instance.updated_at,
             'leads': lead_serializer.data,
-            'count': leads_queryset.count()
+            'count': leads_queryset.count() if count is None else count
         })
     
+    @action(detail=True, methods=['get'])
+    def export(self, request, id=None):
+        """Export the leads of a list as CSV or xlsx."""
+        lead_list = self.get_object()
+        return export_leads_response(
+            request,
+            lead_list_queryset(lead_list),
+            lead_list.leads_count,
+            file_name=lead_list.name,
+            source='lead_list',
+            lead_list=lead_list
+        )
+
+    @action(detail=False, methods=['post'])
+    def combine(self, request):
+        """
+        Create a lead list from the union, intersection or difference of lists.
+
+        Takes ``operation``, ``lead_list_ids`` (at least two; for
+        ``difference`` the first list minus the others) and the new list's
+        ``name`` and ``description``. With ``preview`` set, nothing is
+        created and the sizes of every operation, with the number of
+        duplicate memberships, are returned instead.
+        """
+        operation = request.data.get('operation')
+        lead_list_ids = request.data.get('lead_list_ids')
+        preview = str(request.data.get('preview', '')).lower() in ('true', '1')
+
+        if operation not in SET_OPERATIONS:
+            return Response(
+                {'error': f"operation must be one of: {', '.join(SET_OPERATIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not isinstance(lead_list_ids, list):
+            lead_list_ids = []
+        try:
+            # Deduplicated, in order: the first list is the base of a difference
+            lead_list_ids = list(dict.fromkeys(uuid.UUID(str(value)) for value in lead_list_ids))
+        except ValueError:
+            return Response({'error': 'Invalid lead list IDs'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(lead_list_ids) < 2:
+            return Response(
+                {'error': '두 개 이상의 리드 리스트가 필요합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if self.get_queryset().filter(id__in=lead_list_ids).count() != len(lead_list_ids):
+            return Response(
+                {'error': '리드 리스트를 찾을 수 없습니다.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        if preview:
+            counts = preview_combination(lead_list_ids)
+            return Response({'operation': operation, 'count': counts[operation], **counts})
+
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            lead_list = serializer.save(user=request.user)
+            added = add_combination_to_lead_list(lead_list, operation, lead_list_ids)
+        lead_list.refresh_from_db()
+        return Response(
+            {**self.get_serializer(lead_list).data, 'operation': operation, 'added': added},
+            status=status.HTTP_201_CREATED
+        )
+
+    def get_selected_leads(self, request):
+        """
+        Return the user's leads selected by an add/remove request.
+
+        The body carries either ``lead_ids`` (a list of ids) or ``filter``
+        (LeadFilter parameters plus ``search``, e.g. ``{"si_nm": "서울",
+        "has_email": true}``), so large selections never cross the wire.
+
+        Returns:
+            tuple: (Lead queryset, None) or (None, error Response)
+        """
+        lead_ids = request.data.get('lead_ids')
+        filters = request.data.get('filter')
+        leads = Lead.objects.filter(user=request.user)
+
+        if lead_ids:
+            if not isinstance(lead_ids, list):
+                lead_ids = [lead_ids]
+            try:
+                return leads.filter(id__any=lead_ids), None
+            except ValidationError:
+                return None, Response({"error": "Invalid lead IDs"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if isinstance(filters, dict):
+            unknown = set(filters) - set(LeadFilter.base_filters) - {'search'}
+            if unknown:
+                return None, Response(
+                    {"error": f"Unknown filter: {', '.join(sorted(unknown))}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            filterset = LeadFilter(
+                {key: value for key, value in filters.items() if key != 'search'},
+                queryset=leads
+            )
+            if not filterset.is_valid():
+                return None, Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+            leads = filterset.qs
+            if filters.get('search'):
+                leads = filter_full_text(leads, str(filters['search']))
+            return leads, None
+
+        return None, Response({"error": "No lead IDs provided"}, status=status.HTTP_400_BAD_REQUEST)
+
     @action(detail=True, methods=['post'])
     def add_leads(self, request, id=None):
-        """Add leads to a list."""
+        """Add leads to a list, by ``lead_ids`` or by ``filter``."""
         lead_list = self.get_object()
-        lead_ids = request.data.get('lead_ids', [])
-        
-        if not lead_ids:
-            return Response({"error": "No lead IDs provided"}, status=status.HTTP_400_BAD_REQUEST)
+        leads, error = self.get_selected_leads(request)
+        if error:
+            return error
             
-        lead_list.leads.add(*lead_ids)
-        return Response({"message": "Leads added successfully"})
+        added = add_to_lead_list(lead_list, leads)
+        return Response({"message": "Leads added successfully", "added": added})
     
     @action(detail=True, methods=['post'])
     def remove_leads(self, request, id=None):
-        """Remove leads from a list."""
+        """Remove leads from a list, by ``lead_ids`` or by ``filter``."""
         lead_list = self.get_object()
-        lead_ids = request.data.get('lead_ids', [])
-        
-        if not lead_ids:
-            return Response({"error": "No lead IDs provided"}, status=status.HTTP_400_BAD_REQUEST)
+        leads, error = self.get_selected_leads(request)
+        if error:
+            return error
             
-        lead_list.leads.remove(*lead_ids)
-        return Response({"message": "Leads removed successfully"})
+        removed = remove_from_lead_list(lead_list, leads)
+        return Response({"message": "Leads removed successfully", "removed": removed})
 
 
 class IndustryViewSet(BaseViewSet):
@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'salesone.settings')
 django.setup()
 
+from apps.leads.industries import invalidate_industry_map
 from apps.leads.models import Industry
 from os import path
 
@@ -39,6 +40,8 @@ def import_industries():
         batch_size=batch_size,
         ignore_conflicts=True  # Skip if record already exists
     )
+    # bulk_create sends no post_save, so tell running processes to reload
+    invalidate_industry_map()
     
     end_time = datetime.now()
     duration = end_time - start_time
@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party apps
     'rest_framework',
@@ -110,8 +111,36 @@ DATABASES = {
     )
 }
 
+# Minimum pg_trgm word similarity for fuzzy company-name matches in
+# search_salesone. Set per connection so the GIN trigram index applies it;
+# appended to any options already given in DATABASE_URL.
+SALESONE_NAME_SIMILARITY_THRESHOLD = config('SALESONE_NAME_SIMILARITY_THRESHOLD', default=0.4, cast=float)
+db_options = DATABASES['default'].setdefault('OPTIONS', {})
+db_options['options'] = ' '.join(filter(None, [
+    db_options.get('options'),
+    f'-c pg_trgm.word_similarity_threshold={SALESONE_NAME_SIMILARITY_THRESHOLD}',
+]))
+
 # Redis
 REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+
+# Shared by web and Celery processes (count caching, live import progress).
+# Without a Redis URL in the environment every process gets its own
+# local-memory cache, which is enough for tests and single-process runs.
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default=config('REDIS_URL', default=''))
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
 TIME_ZONE = 'Asia/Seoul'
 
 # Celery settings
@@ -126,6 +155,33 @@ CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 CELERY_WORKER_HIJACK_ROOT_LOGGER = False  # Don't hijack the root logger
 CELERY_WORKER_CONCURRENCY = config('CELERY_WORKER_CONCURRENCY', default=2, cast=int)
 
+# Rows validated and inserted per transaction by lead file imports
+LEAD_IMPORT_CHUNK_SIZE = config('LEAD_IMPORT_CHUNK_SIZE', default=2000, cast=int)
+# LeadImportTask counters are written at most every N rows or S seconds
+LEAD_IMPORT_PROGRESS_ROWS = config('LEAD_IMPORT_PROGRESS_ROWS', default=5000, cast=int)
+LEAD_IMPORT_PROGRESS_INTERVAL = config('LEAD_IMPORT_PROGRESS_INTERVAL', default=5.0, cast=float)
+# CSV imports larger than this are split into shards of about this many
+# bytes, imported in parallel by a Celery chord
+LEAD_IMPORT_SHARD_BYTES = config('LEAD_IMPORT_SHARD_BYTES', default=8 * 1024 * 1024, cast=int)
+# Largest search result a single "import entire search result" job copies
+SALESONE_SEARCH_IMPORT_MAX_ROWS = config('SALESONE_SEARCH_IMPORT_MAX_ROWS', default=100000, cast=int)
+# Rows fetched per server-side cursor round trip by lead exports
+LEAD_EXPORT_CHUNK_SIZE = config('LEAD_EXPORT_CHUNK_SIZE', default=2000, cast=int)
+# Larger exports are written by a Celery task into a downloadable file
+# instead of being streamed by the web worker
+LEAD_EXPORT_STREAM_MAX_ROWS = config('LEAD_EXPORT_STREAM_MAX_ROWS', default=200000, cast=int)
+# Largest SalesOne search result a single export writes
+SALESONE_EXPORT_MAX_ROWS = config('SALESONE_EXPORT_MAX_ROWS', default=1000000, cast=int)
+# Minimum pg_trgm name similarity for leads sharing a phone or email domain to
+# be proposed as duplicates (a shared business number is proposed regardless)
+LEAD_DEDUP_NAME_SIMILARITY = config('LEAD_DEDUP_NAME_SIMILARITY', default=0.5, cast=float)
+# Blocking keys shared by more leads than this (a switchboard number, a
+# reseller's domain) are too common to tell companies apart and are skipped
+LEAD_DEDUP_MAX_BLOCK_SIZE = config('LEAD_DEDUP_MAX_BLOCK_SIZE', default=50, cast=int)
+# Directory of the memory-mapped SalesOneLead snapshot used by search_salesone
+# (apps/leads/columnar.py); empty disables the in-process filter engine
+SALESONE_COLUMNAR_DIR = config('SALESONE_COLUMNAR_DIR', default='')
+
 # Celery Beat settings
 CELERY_BEAT_SCHEDULE = {
     'execute-scheduled-workflows': {